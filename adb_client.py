@@ -0,0 +1,207 @@
+"""
+Cliente nativo do protocolo ADB
+Fala diretamente com o servidor adb (porta 5037) via TCP, sem executar o binário adb
+"""
+import os
+import socket
+import threading
+
+from adb_session import AdbShellSession
+
+DEFAULT_ADB_HOST = "127.0.0.1"
+DEFAULT_ADB_PORT = int(os.environ.get("ANDROID_ADB_SERVER_PORT", "5037"))
+
+
+class AdbProtocolError(Exception):
+    """Erro retornado pelo servidor adb (resposta FAIL) ou resposta inesperada"""
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    """Lê exatamente `size` bytes do socket"""
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise AdbProtocolError("conexão encerrada pelo servidor adb")
+        data += chunk
+    return bytes(data)
+
+
+def _send_request(sock: socket.socket, request: str):
+    """Envia uma requisição no formato <tamanho em 4 dígitos hex><payload> e valida OKAY/FAIL"""
+    payload = request.encode("utf-8")
+    sock.sendall(b"%04x" % len(payload) + payload)
+    status = _recv_exact(sock, 4)
+    if status == b"OKAY":
+        return
+    if status == b"FAIL":
+        raise AdbProtocolError(_read_block(sock).decode("utf-8", "replace"))
+    raise AdbProtocolError(f"resposta inesperada do servidor adb: {status!r}")
+
+
+def _read_block(sock: socket.socket) -> bytes:
+    """Lê um bloco de resposta prefixado por tamanho em 4 dígitos hex"""
+    size = int(_recv_exact(sock, 4), 16)
+    return _recv_exact(sock, size)
+
+
+class AdbClient:
+    """Cliente do servidor adb com as requisições host:* e sessões shell reaproveitadas por dispositivo"""
+
+    def __init__(self, host: str = DEFAULT_ADB_HOST, port: int = DEFAULT_ADB_PORT, timeout: float = 5.0):
+        """
+        Inicializa o cliente (nenhuma conexão é aberta aqui)
+
+        Args:
+            host: Endereço do servidor adb (padrão: 127.0.0.1)
+            port: Porta do servidor adb (padrão: 5037 ou ANDROID_ADB_SERVER_PORT)
+            timeout: Timeout das operações de socket em segundos
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _open(self) -> socket.socket:
+        """Abre uma conexão TCP com o servidor adb"""
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    def _host_request(self, request: str) -> str:
+        """Executa uma requisição host:* e retorna o bloco de resposta"""
+        with self._open() as sock:
+            _send_request(sock, request)
+            return _read_block(sock).decode("utf-8", "replace")
+
+    def version(self) -> int:
+        """Retorna a versão do protocolo do servidor adb"""
+        return int(self._host_request("host:version"), 16)
+
+    def devices(self) -> list:
+        """
+        Lista os dispositivos conhecidos pelo servidor
+
+        Returns:
+            Lista de tuplas (serial, estado), ex: [("192.168.0.10:5555", "device")]
+        """
+        devices = []
+        for line in self._host_request("host:devices").splitlines():
+            if "\t" in line:
+                serial, state = line.split("\t", 1)
+                devices.append((serial, state.strip()))
+        return devices
+
+    def connect(self, address: str) -> str:
+        """Conecta a um dispositivo via rede (equivalente a `adb connect`) e retorna a mensagem do servidor"""
+        return self._host_request(f"host:connect:{address}")
+
+    def disconnect(self, address: str) -> str:
+        """Desconecta um dispositivo de rede (equivalente a `adb disconnect`)"""
+        return self._host_request(f"host:disconnect:{address}")
+
+    def open_service(self, serial: str, service: str, timeout: float = None) -> socket.socket:
+        """
+        Abre um serviço no dispositivo (ex: "shell:ls", "exec:sh")
+
+        Args:
+            serial: Serial/endereço do dispositivo
+            service: Nome do serviço
+            timeout: Timeout do socket retornado (None = bloqueante)
+
+        Returns:
+            Socket conectado ao serviço, já após o OKAY
+        """
+        sock = self._open()
+        try:
+            _send_request(sock, f"host:transport:{serial}")
+            _send_request(sock, service)
+        except Exception:
+            sock.close()
+            raise
+        sock.settimeout(timeout)
+        return sock
+
+    def shell(self, serial: str, command: str) -> str:
+        """Executa um comando avulso via serviço shell: e retorna a saída"""
+        with self.open_service(serial, f"shell:{command}", timeout=self.timeout) as sock:
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        return b"".join(chunks).decode("utf-8", "replace")
+
+    def session(self, serial: str) -> "AdbSocketShellSession":
+        """Retorna a sessão shell persistente do dispositivo, criando-a no primeiro uso"""
+        with self._lock:
+            session = self._sessions.get(serial)
+            if session is None:
+                session = AdbSocketShellSession(serial, client=self)
+                self._sessions[serial] = session
+            return session
+
+    def close(self):
+        """Fecha todas as sessões abertas"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+class AdbSocketShellSession(AdbShellSession):
+    """Sessão shell persistente sobre um socket do servidor adb (serviço exec:sh, sem PTY)"""
+
+    def __init__(self, device_address: str, client: AdbClient = None):
+        """
+        Args:
+            device_address: Serial/endereço do dispositivo
+            client: Cliente adb a usar (padrão: servidor local em 127.0.0.1:5037)
+        """
+        super().__init__(device_address)
+        self.client = client or AdbClient()
+        self.sock = None
+        self._eof = threading.Event()
+
+    @property
+    def alive(self) -> bool:
+        """True se o socket da sessão está aberto"""
+        return self.sock is not None and not self._eof.is_set()
+
+    def start(self) -> bool:
+        """Abre o serviço exec:sh no dispositivo (fecha o socket anterior, se existir)"""
+        self._stop_process()
+        try:
+            self.sock = self.client.open_service(self.device_address, "exec:sh")
+        except (OSError, AdbProtocolError) as e:
+            print(f"✗ Erro ao iniciar sessão ADB via socket: {e}")
+            self.sock = None
+            return False
+
+        # Cada leitora recebe o seu próprio evento: uma leitora antiga que chega ao fim do
+        # stream depois do reinício não marca a sessão nova como encerrada
+        self._eof = threading.Event()
+        self._writer = self.sock.makefile("w", encoding="utf-8", newline="\n")
+        self._start_reader(self.sock.makefile("r", encoding="utf-8", errors="replace", newline="\n"), self._eof)
+        return True
+
+    @staticmethod
+    def _read_output(stream, lines, eof: threading.Event):
+        """Lê o socket e marca o fim do stream no evento desta leitora"""
+        AdbShellSession._read_output(stream, lines)
+        eof.set()
+
+    def _stop_process(self):
+        """Fecha o socket atual sem levantar exceções"""
+        sock = self.sock
+        if sock is None:
+            return
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
+        self._eof.set()
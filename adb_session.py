@@ -0,0 +1,179 @@
+"""
+Sessão persistente de ADB shell
+Mantém um único processo `adb shell` por dispositivo e envia os comandos pelo stdin,
+evitando um fork/exec do cliente adb e uma nova sessão no dispositivo a cada ação
+"""
+import itertools
+import queue
+import subprocess
+import threading
+import time
+
+
+class AdbShellSession:
+    """Sessão `adb shell` de longa duração com detecção de fim de comando e reinício automático"""
+
+    MARKER = "__BOT_FIM__"
+
+    def __init__(self, device_address: str, adb_path: str = "adb"):
+        """
+        Inicializa a sessão (o processo só é criado no primeiro comando ou em start())
+
+        Args:
+            device_address: Endereço IP:porta ou serial do dispositivo
+            adb_path: Caminho do executável adb (padrão: "adb" no PATH)
+        """
+        self.device_address = device_address
+        self.adb_path = adb_path
+        self.process = None
+        self.restarts = 0
+        self._writer = None
+        self._lines = None
+        self._reader = None
+        self._lock = threading.Lock()
+        self._counter = itertools.count(1)
+
+    @property
+    def alive(self) -> bool:
+        """True se o processo da sessão está rodando"""
+        return self.process is not None and self.process.poll() is None
+
+    def start(self) -> bool:
+        """
+        Inicia o processo `adb shell` (fecha o anterior, se existir)
+
+        Returns:
+            True se a sessão foi iniciada
+        """
+        self._stop_process()
+        try:
+            self.process = subprocess.Popen(
+                [self.adb_path, "-s", self.device_address, "shell"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1
+            )
+        except (OSError, ValueError) as e:
+            print(f"✗ Erro ao iniciar sessão ADB: {e}")
+            self.process = None
+            return False
+
+        self._writer = self.process.stdin
+        self._start_reader(self.process.stdout)
+        return True
+
+    def _start_reader(self, stream, *extra):
+        """
+        Thread leitora: a saída é consumida continuamente para permitir timeout por comando
+
+        `extra` são argumentos adicionais de _read_output, fixos para esta leitora
+        """
+        self._lines = queue.Queue()
+        self._reader = threading.Thread(
+            target=self._read_output,
+            args=(stream, self._lines, *extra),
+            daemon=True
+        )
+        self._reader.start()
+
+    @staticmethod
+    def _read_output(stream, lines: queue.Queue):
+        """Copia as linhas do stdout do processo para a fila (None sinaliza fim do stream)"""
+        try:
+            for line in stream:
+                lines.put(line)
+        except (OSError, ValueError):
+            pass
+        lines.put(None)
+
+    def run(self, command: str, timeout: float = 5.0) -> subprocess.CompletedProcess:
+        """
+        Executa um comando na sessão e aguarda o seu término
+
+        Se a sessão morreu, ela é reiniciada e o comando é reenviado uma vez.
+
+        Args:
+            command: Linha de comando shell a executar no dispositivo
+            timeout: Tempo máximo de espera em segundos
+
+        Returns:
+            CompletedProcess com returncode, stdout e stderr do comando
+
+        Raises:
+            subprocess.TimeoutExpired: Se o comando não terminar dentro do timeout
+            OSError: Se não for possível (re)iniciar a sessão
+        """
+        with self._lock:
+            for attempt in range(2):
+                if not self.alive:
+                    if self._writer is not None:
+                        self.restarts += 1
+                        print(f"⚠ Sessão ADB encerrada - reiniciando (#{self.restarts})")
+                    if not self.start():
+                        raise OSError("não foi possível iniciar a sessão adb shell")
+                try:
+                    return self._execute(command, timeout)
+                except (BrokenPipeError, EOFError):
+                    # Processo morreu no meio do comando: reinicia e reenvia uma vez
+                    self._stop_process()
+                    if attempt:
+                        raise OSError("sessão adb shell encerrada durante o comando")
+            raise OSError("sessão adb shell indisponível")
+
+    def _execute(self, command: str, timeout: float) -> subprocess.CompletedProcess:
+        """Envia o comando seguido de um marcador com o código de saída e lê até o marcador"""
+        marker = f"{self.MARKER}{next(self._counter)}"
+        self._writer.write(f"{command} 2>&1; echo \"{marker} $?\"\n")
+        self._writer.flush()
+
+        deadline = time.monotonic() + timeout
+        output = []
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # Estado da sessão desconhecido: descarta para reiniciar no próximo comando
+                self._stop_process()
+                raise subprocess.TimeoutExpired(command, timeout)
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line is None:
+                raise EOFError("sessão adb shell encerrada")
+
+            pos = line.find(marker)
+            if pos < 0:
+                output.append(line)
+                continue
+
+            # Saída sem quebra de linha final fica na mesma linha do marcador
+            output.append(line[:pos])
+            try:
+                returncode = int(line[pos + len(marker):].strip())
+            except ValueError:
+                returncode = 1
+            text = "".join(output)
+            return subprocess.CompletedProcess(
+                command, returncode, stdout=text, stderr="" if returncode == 0 else text
+            )
+
+    def _stop_process(self):
+        """Encerra o processo atual sem levantar exceções"""
+        process = self.process
+        if process is None:
+            return
+        try:
+            if process.poll() is None:
+                process.stdin.close()
+                process.terminate()
+                process.wait(timeout=2)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            process.kill()
+
+    def close(self):
+        """Fecha a sessão"""
+        with self._lock:
+            self._stop_process()
+            self.process = None
@@ -0,0 +1,440 @@
+"""
+Bot ADB assíncrono (asyncio)
+Mesma interface do SimpleBotADB, mas com comandos não bloqueantes: um único event loop
+pode mover o joystick, usar skills e resetar a câmera ao mesmo tempo, sem uma thread por tarefa.
+Os backends "session" e "socket" usam um pool das mesmas sessões do SimpleBotADB
+(AdbShellSession/AdbSocketShellSession), cada comando em uma thread do executor
+"""
+import asyncio
+import shlex
+import sys
+
+from adb_client import AdbClient, AdbProtocolError, AdbSocketShellSession
+from adb_session import AdbShellSession
+from compiled_config import Joystick, as_joystick, compile_config
+from joystick_routes import lure_directions
+from simple_bot import DEFAULT_DEVICE_ADDRESS, load_config
+
+BACKENDS = ("subprocess", "session", "socket")
+
+
+class AsyncSimpleBotADB:
+    """Versão asyncio do SimpleBotADB com comandos concorrentes no mesmo dispositivo"""
+
+    def __init__(self, device_address: str = DEFAULT_DEVICE_ADDRESS, backend: str = "subprocess",
+                 max_sessions: int = 3, client: AdbClient = None):
+        """
+        Inicializa o bot assíncrono
+
+        Args:
+            device_address: Endereço IP:porta do dispositivo (padrão: DEFAULT_DEVICE_ADDRESS)
+            backend: "subprocess" (um processo adb por comando),
+                "session" (pool de sessões adb shell persistentes) ou
+                "socket" (pool de sessões pelo protocolo ADB direto, sem o binário adb)
+            max_sessions: Sessões simultâneas nos backends "session" e "socket"; um swipe longo
+                ocupa uma sessão enquanto taps seguem pelas outras
+            client: Cliente adb compartilhado para o backend "socket"
+
+        Raises:
+            ValueError: Backend desconhecido
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"backend desconhecido: {backend!r} (use {', '.join(BACKENDS)})")
+        self.device_address = device_address
+        self.backend = backend
+        self.max_sessions = max_sessions
+        self.client = (client or AdbClient()) if backend == "socket" else None
+        self.connected = False
+        self._sessions = []
+        self._idle = None
+
+    async def _adb(self, *args: str, timeout: float = 5) -> tuple:
+        """Executa o binário adb e retorna (returncode, stdout, stderr)"""
+        process = await asyncio.create_subprocess_exec(
+            "adb", *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            raise
+        return process.returncode, stdout.decode("utf-8", "replace"), stderr.decode("utf-8", "replace")
+
+    async def _shell(self, *args: str, timeout: float = 5) -> tuple:
+        """
+        Executa um comando shell no dispositivo
+
+        Returns:
+            Tupla (returncode, saída de erro/saída)
+        """
+        if self._idle is None:
+            returncode, stdout, stderr = await self._adb(
+                "-s", self.device_address, "shell", *args, timeout=timeout
+            )
+            return returncode, stderr or stdout
+
+        session = await self._idle.get()
+        try:
+            # A sessão bloqueia até o marcador de fim do comando: roda em uma thread do executor
+            result = await asyncio.to_thread(session.run, shlex.join(args), timeout)
+            return result.returncode, result.stdout
+        finally:
+            self._idle.put_nowait(session)
+
+    def _new_session(self) -> AdbShellSession:
+        # Uma sessão própria por slot: client.session() devolve a mesma sessão em cache por serial
+        if self.client is not None:
+            return AdbSocketShellSession(self.device_address, client=self.client)
+        return AdbShellSession(self.device_address)
+
+    async def check_adb(self) -> bool:
+        """Verifica se ADB está instalado"""
+        if self.client is not None:
+            try:
+                await asyncio.to_thread(self.client.version)
+                print(f"✓ Servidor ADB encontrado em {self.client.host}:{self.client.port}")
+                return True
+            except (OSError, AdbProtocolError, ValueError):
+                print(f"✗ Servidor ADB não encontrado em {self.client.host}:{self.client.port}")
+                print("   Inicie com: adb start-server")
+                return False
+        try:
+            returncode, _, _ = await self._adb("version", timeout=5)
+            if returncode == 0:
+                print("✓ ADB encontrado")
+                return True
+            return False
+        except (asyncio.TimeoutError, FileNotFoundError):
+            print("✗ ADB não encontrado. Instale com: sudo apt install adb")
+            return False
+
+    async def get_connected_devices(self) -> list:
+        """Retorna lista de dispositivos conectados via ADB"""
+        try:
+            if self.client is not None:
+                devices = await asyncio.to_thread(self.client.devices)
+                return [serial for serial, state in devices if state == "device"]
+            _, stdout, _ = await self._adb("devices", timeout=5)
+            return [
+                line.split('\t')[0]
+                for line in stdout.strip().split('\n')[1:]
+                if '\tdevice' in line
+            ]
+        except Exception as e:
+            print(f"✗ Erro ao listar dispositivos: {e}")
+            return []
+
+    async def connect(self) -> bool:
+        """Conecta ao dispositivo via ADB (WiFi ou USB) e abre as sessões persistentes"""
+        try:
+            connected_devices = await self.get_connected_devices()
+
+            if self.device_address in connected_devices:
+                print(f"✓ Dispositivo {self.device_address} já conectado via USB")
+            elif ":" in self.device_address:
+                if self.client is not None:
+                    stdout = await asyncio.to_thread(self.client.connect, self.device_address)
+                else:
+                    _, stdout, _ = await self._adb("connect", self.device_address, timeout=10)
+                if "connected" not in stdout.lower():
+                    print(f"✗ Falha ao conectar via WiFi: {stdout}")
+                    return False
+                print(f"✓ Conectado a {self.device_address} via WiFi")
+            else:
+                print(f"✗ Dispositivo {self.device_address} não encontrado")
+                print(f"   Dispositivos disponíveis: {connected_devices}")
+                return False
+
+            self.connected = True
+            if self.backend in ("session", "socket"):
+                sessions = [self._new_session() for _ in range(self.max_sessions)]
+                started = await asyncio.gather(*(asyncio.to_thread(session.start) for session in sessions))
+                self._sessions = [session for session, ok in zip(sessions, started) if ok]
+                if self._sessions:
+                    self._idle = asyncio.Queue()
+                    for session in self._sessions:
+                        self._idle.put_nowait(session)
+                    print(f"✓ {len(self._sessions)} sessões ADB persistentes iniciadas")
+                elif self.backend == "socket":
+                    # Sem o binário adb não há para onde cair: falha em vez de mudar de backend
+                    print("✗ Sessões pelo socket do servidor ADB indisponíveis")
+                    self.connected = False
+                    return False
+                else:
+                    print("⚠ Sessão persistente indisponível - usando um processo por comando")
+            return True
+
+        except Exception as e:
+            print(f"✗ Erro na conexão: {e}")
+            return False
+
+    async def disconnect(self) -> bool:
+        """Fecha as sessões e desconecta do dispositivo"""
+        try:
+            for session in self._sessions:
+                await asyncio.to_thread(session.close)
+            self._sessions = []
+            self._idle = None
+
+            if ":" in self.device_address:
+                if self.client is not None:
+                    await asyncio.to_thread(self.client.disconnect, self.device_address)
+                else:
+                    await self._adb("disconnect", self.device_address, timeout=5)
+                print("✓ Desconectado do WiFi")
+            else:
+                print("✓ Sessão encerrada (dispositivo USB permanece conectado)")
+
+            self.connected = False
+            return True
+        except Exception as e:
+            print(f"✗ Erro ao desconectar: {e}")
+            return False
+
+    async def tap(self, x: int, y: int) -> bool:
+        """
+        Realiza um clique em coordenadas específicas
+
+        Returns:
+            True se o clique foi executado com sucesso
+        """
+        if not self.connected:
+            print("✗ Dispositivo não conectado")
+            return False
+
+        try:
+            returncode, output = await self._shell("input", "tap", str(x), str(y), timeout=5)
+            if returncode == 0:
+                return True
+            print(f"✗ Erro ao clicar: {output}")
+            return False
+        except Exception as e:
+            print(f"✗ Erro ao executar clique: {e}")
+            return False
+
+    async def click_sequence(self, positions: list, interval: float = 1.0, repeat: int = 1):
+        """
+        Realiza uma sequência de cliques em múltiplas posições
+
+        Args:
+            positions: Lista de tuplas (x, y) com as coordenadas
+            interval: Intervalo entre cliques em segundos
+            repeat: Quantas vezes repetir a sequência
+        """
+        if not self.connected:
+            print("✗ Dispositivo não conectado")
+            return
+
+        print(f"🤖 Iniciando sequência de {len(positions)} posições")
+        print(f"   Repetições: {repeat} | Intervalo: {interval}s\n")
+
+        for cycle in range(repeat):
+            print(f"--- Ciclo {cycle + 1}/{repeat} ---")
+            for i, (x, y) in enumerate(positions, 1):
+                if await self.tap(x, y):
+                    print(f"  ✓ Clique {i}/{len(positions)} em ({x}, {y})")
+                else:
+                    print(f"  ✗ Falha no clique {i}/{len(positions)}")
+                if i < len(positions):
+                    await asyncio.sleep(interval)
+            if cycle < repeat - 1:
+                await asyncio.sleep(interval)
+
+        print(f"\n✓ Sequência completada!")
+
+    async def move_joystick(self, start_x: int, start_y: int, end_x: int, end_y: int,
+                            duration: int = 4000, direction: str = "") -> bool:
+        """
+        Move o joystick de uma posição para outra sem bloquear o event loop
+
+        Returns:
+            True se o movimento foi executado com sucesso
+        """
+        if not self.connected:
+            print("✗ Dispositivo não conectado")
+            return False
+
+        try:
+            direction_text = f" ({direction})" if direction else ""
+            print(f"🕹️  Movendo joystick{direction_text} por {duration/1000}s...")
+            returncode, output = await self._shell(
+                "input", "swipe", str(start_x), str(start_y), str(end_x), str(end_y), str(duration),
+                timeout=10 + duration / 1000
+            )
+            if returncode == 0:
+                print(f"✓ Joystick movido com sucesso")
+                return True
+            print(f"✗ Erro ao mover joystick: {output}")
+            return False
+        except Exception as e:
+            print(f"✗ Erro ao executar movimento: {e}")
+            return False
+
+    async def lure_with_joystick(self, joystick_config, duration: int = 4000, interval: float = 0.5) -> bool:
+        """
+        Executa sequência de movimentos para Lure: frente -> esquerda -> trás -> direita
+
+        Args:
+            joystick_config: Joystick compilado ou dicionário da seção joystick
+
+        Returns:
+            True se todos os movimentos foram executados com sucesso
+        """
+        if not self.connected:
+            print("✗ Dispositivo não conectado")
+            return False
+
+        if not isinstance(joystick_config, Joystick):
+            # Dicionário: usa a duração do config ou mantém o argumento
+            joystick_config = {"duration": duration, **(joystick_config or {})}
+        joystick = as_joystick(joystick_config)
+        center_x, center_y = joystick.center_x, joystick.center_y
+        duration = joystick.duration
+
+        print("\n🎯 Iniciando sequência Lure com Joystick...")
+        print(f"   Duração de cada movimento: {duration/1000}s\n")
+
+        success = True
+        directions = lure_directions(joystick)
+        for i, (direction_name, end_x, end_y) in enumerate(directions):
+            if not await self.move_joystick(center_x, center_y, end_x, end_y, duration, direction_name):
+                success = False
+            if i < len(directions) - 1:
+                await asyncio.sleep(interval)
+
+        if success:
+            print("\n✓ Sequência Lure completada!")
+        else:
+            print("\n⚠ Sequência Lure completada com alguns erros")
+        return success
+
+    async def lure_with_joystick_steps(self, joystick_config, step_duration: int = 500,
+                                       step_interval: float = 0.3, steps_per_direction: int = 8) -> bool:
+        """
+        Executa sequência de Lure com passos intervalados: frente -> esquerda -> trás -> direita
+
+        Args:
+            joystick_config: Joystick compilado ou dicionário da seção joystick (os valores do
+                joystick têm prioridade sobre os argumentos)
+
+        Returns:
+            True se todos os movimentos foram executados com sucesso
+        """
+        if not self.connected:
+            print("✗ Dispositivo não conectado")
+            return False
+
+        if not isinstance(joystick_config, Joystick):
+            # Dicionário: campos ausentes usam os argumentos
+            joystick_config = {"step_duration": step_duration, "step_interval": step_interval,
+                               "steps_per_direction": steps_per_direction, **(joystick_config or {})}
+        joystick = as_joystick(joystick_config)
+        center_x, center_y = joystick.center_x, joystick.center_y
+        step_duration = joystick.step_duration
+        step_interval = joystick.step_interval
+        steps_per_direction = joystick.steps_per_direction
+
+        print("\n🎯 Iniciando sequência Lure com passos intervalados...")
+        print(f"   Duração do passo: {step_duration}ms | Intervalo: {step_interval}s | Passos/direção: {steps_per_direction}\n")
+
+        success = True
+        for direction_name, end_x, end_y in lure_directions(joystick):
+            print(f"➜ Caminhando para {direction_name}...")
+            for step in range(steps_per_direction):
+                if not await self.move_joystick(center_x, center_y, end_x, end_y, step_duration,
+                                                f"{direction_name} (passo {step+1}/{steps_per_direction})"):
+                    success = False
+                if step < steps_per_direction - 1:
+                    await asyncio.sleep(step_interval)
+            await asyncio.sleep(0.5)
+
+        if success:
+            print("\n✓ Sequência Lure com passos completada!")
+        else:
+            print("\n⚠ Sequência Lure com passos completada com alguns erros")
+        return success
+
+
+async def periodic_tap(bot: AsyncSimpleBotADB, x: int, y: int, interval: float, label: str):
+    """Clica periodicamente com deadlines absolutos (o tempo do comando não acumula atraso)"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time()
+    count = 0
+    while True:
+        if await bot.tap(x, y):
+            count += 1
+            print(f"  {label} #{count}")
+        deadline += interval
+        await asyncio.sleep(max(0.0, deadline - loop.time()))
+
+
+async def click_cycle(bot: AsyncSimpleBotADB, clicks):
+    """
+    Executa a sequência clicks[] em loop, cada clique `interval` segundos após o deadline do anterior
+
+    Args:
+        clicks: Cliques compilados (Click com x, y, interval, description)
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time()
+    count = 0
+    while True:
+        for click in clicks:
+            if await bot.tap(click.x, click.y):
+                count += 1
+                print(f"  ✓ Clique #{count} em ({click.x}, {click.y}) - {click.description}")
+            else:
+                print(f"  ✗ Falha no clique em ({click.x}, {click.y})")
+            deadline += click.interval
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+
+
+async def run_config(config: dict):
+    """
+    Executa movimento (lure com joystick), skills, camera reset e lure em paralelo no mesmo event loop
+
+    Args:
+        config: Configuração carregada do bot_config.json
+    """
+    try:
+        settings = compile_config(config)
+    except ValueError as e:
+        print(f"✗ Configuração inválida: {e}")
+        return
+
+    bot = AsyncSimpleBotADB(settings.device or DEFAULT_DEVICE_ADDRESS, backend=settings.backend)
+    if not await bot.check_adb() or not await bot.connect():
+        return
+
+    tasks = []
+    camera = settings.camera_reset
+    if camera.enabled:
+        tasks.append(periodic_tap(bot, camera.x, camera.y, camera.interval, "📷 Camera Reset"))
+    lure = settings.lure
+    if lure.enabled:
+        tasks.append(periodic_tap(bot, lure.x, lure.y, lure.interval, "🎯 Lure"))
+    if settings.clicks:
+        tasks.append(click_cycle(bot, settings.clicks))
+
+    joystick = settings.joystick
+    if joystick is not None:
+        async def walk():
+            while True:
+                await bot.lure_with_joystick_steps(joystick)
+                await asyncio.sleep(joystick.cycle_interval)
+        tasks.append(walk())
+
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        await bot.disconnect()
+
+
+if __name__ == "__main__":
+    config_file = sys.argv[1] if len(sys.argv) > 1 else "bot_config.json"
+    try:
+        asyncio.run(run_config(load_config(config_file)))
+    except KeyboardInterrupt:
+        print("\n\n⏹ Bot assíncrono parado")
@@ -0,0 +1,297 @@
+"""
+Calibração automática por print da tela
+Captura um único quadro e localiza os elementos da interface por template matching em várias
+escalas, escrevendo as seções camera_reset, lure, joystick, clicks e vision.rois do
+bot_config.json sem digitar coordenadas
+"""
+import json
+import math
+import os
+
+import cv2
+import numpy as np
+
+from coordinates import CoordinateTransform, parse_reference, to_profile
+from joystick_routes import lure_directions
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
+META_FILE = "templates.json"
+
+# Largura da tela em que os templates foram recortados (sobrescrita por templates/templates.json)
+REFERENCE_WIDTH = 1920
+
+# Templates de visão que já acompanham o repositório -> região em vision.rois
+VISION_TEMPLATES = {"hp": "vida.png", "xp": "xp.png", "minimap": "mini_map.png"}
+
+# Curso do joystick (do centro até o limite) como fração da largura do template do joystick
+JOYSTICK_THROW = 0.4
+
+
+def load_gray(path: str) -> np.ndarray:
+    """Carrega uma imagem do disco em tons de cinza"""
+    image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        raise FileNotFoundError(path)
+    return image
+
+
+def to_gray(frame: np.ndarray) -> np.ndarray:
+    """Converte um quadro RGB/RGBA (ScreenCapture) para tons de cinza"""
+    code = cv2.COLOR_RGBA2GRAY if frame.shape[2] == 4 else cv2.COLOR_RGB2GRAY
+    return cv2.cvtColor(frame, code)
+
+
+def match_multiscale(screen: np.ndarray, template: np.ndarray, scales) -> tuple:
+    """
+    Procura o template em várias escalas
+
+    Returns:
+        Tupla (score, x, y, largura, altura) da melhor posição
+    """
+    best = (-1.0, 0, 0, 0, 0)
+    for scale in scales:
+        w = max(1, round(template.shape[1] * scale))
+        h = max(1, round(template.shape[0] * scale))
+        if w > screen.shape[1] or h > screen.shape[0]:
+            continue
+        interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+        resized = cv2.resize(template, (w, h), interpolation=interpolation)
+        result = cv2.matchTemplate(screen, resized, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (x, y) = cv2.minMaxLoc(result)
+        if score > best[0]:
+            best = (float(score), x, y, w, h)
+    return best
+
+
+class AutoCalibrator:
+    """Localiza os templates da interface em um print e gera as seções de configuração"""
+
+    def __init__(self, templates_dir: str = TEMPLATES_DIR, min_score: float = 0.75,
+                 scale_range: tuple = (0.8, 1.25), scale_steps: int = 10):
+        """
+        Args:
+            templates_dir: Pasta com camera_reset.png, lure.png, joystick.png e skill_<n>.png
+            min_score: Score mínimo para aceitar um elemento
+            scale_range: Faixa de escala procurada em volta da proporção entre as larguras de tela
+            scale_steps: Quantidade de escalas testadas
+        """
+        self.templates_dir = templates_dir
+        self.min_score = min_score
+        self.scale_range = scale_range
+        self.scale_steps = scale_steps
+        self.reference_width = REFERENCE_WIDTH
+        meta_path = os.path.join(templates_dir, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                self.reference_width = json.load(f).get("reference_width", REFERENCE_WIDTH)
+
+    def templates(self) -> dict:
+        """Templates disponíveis {nome: caminho}: os de ação da pasta e os de visão do repositório"""
+        found = {name: os.path.join(BASE_DIR, filename) for name, filename in VISION_TEMPLATES.items()}
+        if os.path.isdir(self.templates_dir):
+            for filename in sorted(os.listdir(self.templates_dir)):
+                if filename.endswith(".png"):
+                    found[filename[:-4]] = os.path.join(self.templates_dir, filename)
+        return found
+
+    def locate(self, frame: np.ndarray) -> dict:
+        """
+        Procura todos os templates no quadro
+
+        Returns:
+            {nome: (score, x, y, largura, altura)} só com os elementos acima do score mínimo
+        """
+        screen = to_gray(frame)
+        base = screen.shape[1] / self.reference_width
+        scales = np.linspace(base * self.scale_range[0], base * self.scale_range[1], self.scale_steps)
+        found = {}
+        for name, path in self.templates().items():
+            score, x, y, w, h = match_multiscale(screen, load_gray(path), scales)
+            status = "✓" if score >= self.min_score else "✗"
+            print(f"  {status} {name}: score {score:.2f} em ({x}, {y}, {w}, {h})")
+            if score >= self.min_score:
+                found[name] = (score, x, y, w, h)
+        return found
+
+    def apply(self, config: dict, found: dict, frame_width: int, frame_height: int = None) -> list:
+        """
+        Escreve as posições encontradas no config, preservando intervalos e flags existentes
+
+        Com o perfil "screen" do config, as posições de toque são convertidas dos pixels do print
+        para as unidades do perfil (o bot converte de volta em cada tap); vision.rois continua
+        em pixels do print
+
+        Args:
+            frame_width, frame_height: Tamanho do print (a altura é obrigatória com "screen")
+
+        Returns:
+            Nomes das seções atualizadas
+        """
+        reference = parse_reference(config.get("screen"))
+        transform = None
+        if reference is not None:
+            if frame_height is None:
+                raise ValueError("perfil \"screen\" ativo: informe a altura do print")
+            transform = CoordinateTransform.between(reference, (frame_width, frame_height))
+
+        def profile(x, y):
+            return to_profile(transform, reference, x, y)
+
+        def center(name):
+            _, x, y, w, h = found[name]
+            return profile(x + w // 2, y + h // 2)
+
+        updated = []
+        for section, description, interval in (("camera_reset", "Resetar Camera", 8.0), ("lure", "Lure", 3.0)):
+            if section in found:
+                x, y = center(section)
+                current = config.get(section, {})
+                config[section] = {
+                    "enabled": current.get("enabled", section == "camera_reset"),
+                    "x": x,
+                    "y": y,
+                    "interval": current.get("interval", interval),
+                    "description": current.get("description", description)
+                }
+                updated.append(section)
+
+        if "joystick" in found:
+            joystick = dict(config.get("joystick", {}))
+            default_center_x, default_center_y = 248, 789
+            _, x, y, w, h = found["joystick"]
+            center_x, center_y = x + w // 2, y + h // 2
+            throw = w * JOYSTICK_THROW
+            # Mantém a convenção de direções dos padrões do bot, só ajusta centro e curso
+            for key, (_, x, y) in zip(("forward", "left", "backward", "right"), lure_directions({})):
+                dx, dy = x - default_center_x, y - default_center_y
+                length = math.hypot(dx, dy)
+                x, y = profile(round(center_x + dx / length * throw), round(center_y + dy / length * throw))
+                joystick[key] = {"x": x, "y": y}
+            joystick["center_x"], joystick["center_y"] = profile(center_x, center_y)
+            joystick.setdefault("description", "Joystick para movimento")
+            config["joystick"] = joystick
+            updated.append("joystick")
+
+        skills = sorted((name for name in found if name.startswith("skill_")),
+                        key=lambda name: int(name[6:]) if name[6:].isdigit() else name)
+        if skills:
+            # Mescla por descrição: cliques sem template (poções, outros botões) e a ordem da
+            # sequência ficam como estão; skills novas entram no fim
+            positions = {f"Skill {name[6:]}": center(name) for name in skills}
+            clicks = []
+            for click in config.get("clicks", []):
+                description = click.get("description")
+                if description in positions:
+                    x, y = positions.pop(description)
+                    click = {**click, "x": x, "y": y}
+                clicks.append(click)
+            for description, (x, y) in positions.items():
+                clicks.append({"x": x, "y": y, "interval": 1.0, "description": description})
+            config["clicks"] = clicks
+            updated.append("clicks")
+
+        rois = {}
+        for name in VISION_TEMPLATES:
+            if name in found:
+                _, x, y, w, h = found[name]
+                # A barra de XP ocupa a largura toda; o template só fixa a altura
+                rois[name] = [0, y, frame_width, h] if name == "xp" else [x, y, w, h]
+        if rois:
+            vision = config.setdefault("vision", {})
+            vision["rois"] = {**vision.get("rois", {}), **rois}
+            updated.append("vision.rois")
+        return updated
+
+
+def save_template(frame: np.ndarray, name: str, region: tuple, templates_dir: str = TEMPLATES_DIR) -> str:
+    """
+    Recorta um elemento da interface de um print e guarda como template
+
+    Args:
+        frame: Quadro RGB/RGBA
+        name: camera_reset, lure, joystick ou skill_<n>
+        region: (x, y, largura, altura) do elemento no quadro
+
+    Returns:
+        Caminho do template salvo
+    """
+    x, y, w, h = region
+    os.makedirs(templates_dir, exist_ok=True)
+    path = os.path.join(templates_dir, f"{name}.png")
+    crop = np.ascontiguousarray(frame[y:y + h, x:x + w, :3])
+    cv2.imwrite(path, cv2.cvtColor(crop, cv2.COLOR_RGB2BGR))
+
+    meta_path = os.path.join(templates_dir, META_FILE)
+    meta = {}
+    if os.path.exists(meta_path):
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+    if meta.get("reference_width", frame.shape[1]) != frame.shape[1]:
+        print(f"⚠ Template recortado em {frame.shape[1]}px, os outros em {meta['reference_width']}px")
+    meta.setdefault("reference_width", frame.shape[1])
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    print(f"✓ Template {name} salvo em {path}")
+    return path
+
+
+def grab_frame(device: str = None, client=None, image: str = None) -> np.ndarray:
+    """Quadro RGB(A) de um print salvo ou capturado do dispositivo"""
+    if image:
+        bgr = cv2.imread(image, cv2.IMREAD_COLOR)
+        if bgr is None:
+            raise FileNotFoundError(image)
+        return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+    from screen_capture import ScreenCapture
+    return ScreenCapture(device, client=client).capture().copy()
+
+
+def auto_calibrate(config: dict, device: str = None, client=None, image: str = None) -> bool:
+    """
+    Calibra o dispositivo a partir de um único print e salva o bot_config.json
+
+    Returns:
+        True se alguma seção foi atualizada
+    """
+    from simple_bot import save_config
+
+    print("\n📸 Capturando a tela para calibração automática...")
+    try:
+        frame = grab_frame(device, client, image)
+    except Exception as e:
+        print(f"✗ Erro ao capturar a tela: {e}")
+        return False
+
+    calibrator = AutoCalibrator()
+    updated = calibrator.apply(config, calibrator.locate(frame), frame.shape[1], frame.shape[0])
+    if not updated:
+        print("✗ Nenhum elemento encontrado - recorte os templates com: python3 auto_calibration.py template")
+        return False
+    save_config(config)
+    print(f"✓ Seções calibradas: {', '.join(updated)}")
+    return True
+
+
+if __name__ == "__main__":
+    import sys
+    from simple_bot import load_config
+
+    args = sys.argv[1:]
+    image = None
+    if "--image" in args:
+        index = args.index("--image")
+        image = args[index + 1]
+        del args[index:index + 2]
+
+    config = load_config()
+    if args and args[0] == "template" and len(args) == 3:
+        region = tuple(int(value) for value in args[2].split(","))
+        save_template(grab_frame(config.get("device"), image=image), args[1], region)
+    elif not args:
+        sys.exit(0 if auto_calibrate(config, config.get("device"), image=image) else 1)
+    else:
+        print("Uso:\n"
+              "  python3 auto_calibration.py [--image print.png]\n"
+              "  python3 auto_calibration.py template <nome> <x,y,l,a> [--image print.png]")
+        sys.exit(1)
@@ -0,0 +1,221 @@
+"""
+Benchmark do bot com um dispositivo falso
+Roda click_loop, click_sequence, lure_with_joystick_steps e o loop da opção 1 (camera reset,
+lure e cliques no agendador) em cada backend contra o adb falso (executável no PATH para
+subprocess/session e servidor de socket para socket), com latência e falhas injetadas, e
+grava ações/s e latências de cauda em JSON para comparar backends e achar regressões
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import threading
+import time
+
+from adb_client import AdbClient
+from compiled_config import compile_config
+from fake_adb_server import FakeAdbServer, fake_device_env, install_fake_device
+from metrics import Histogram, MetricsRegistry
+from scheduler import Scheduler
+from simple_bot import SimpleBotADB, schedule_bot_actions
+
+SERIAL = "emulator-5554"
+BACKENDS = ("subprocess", "session", "socket")
+SCENARIOS = ("click_loop", "click_sequence", "lure_steps", "option1")
+
+BENCH_CLICKS = [
+    {"x": 1833, "y": 540, "interval": 0.1, "description": "Skill 1"},
+    {"x": 1700, "y": 620, "interval": 0.1, "description": "Skill 2"},
+    {"x": 1600, "y": 700, "interval": 0.1, "description": "Skill 3"},
+    {"x": 1500, "y": 780, "interval": 0.1, "description": "Skill 4"}
+]
+BENCH_CAMERA_RESET = {"enabled": True, "x": 67, "y": 146, "interval": 0.5}
+BENCH_LURE = {"enabled": True, "x": 1728, "y": 803, "interval": 0.3}
+BENCH_JOYSTICK = {"center_x": 248, "center_y": 789, "step_duration": 20, "step_interval": 0.0}
+
+
+def run_scenario(bot: SimpleBotADB, scenario: str, actions: int, duration: float) -> dict:
+    """
+    Executa um cenário no bot já conectado
+
+    Returns:
+        Dicionário extra do cenário (ex.: atrasos do agendador na opção 1)
+    """
+    if scenario == "click_loop":
+        bot.click_loop(100, 200, interval=0, max_clicks=actions)
+    elif scenario == "click_sequence":
+        positions = [(click["x"], click["y"]) for click in BENCH_CLICKS]
+        bot.click_sequence(positions, interval=0, repeat=max(1, actions // len(positions)))
+    elif scenario == "lure_steps":
+        joystick = dict(BENCH_JOYSTICK, steps_per_direction=max(1, actions // 4))
+        bot.lure_with_joystick_steps(joystick)
+    elif scenario == "option1":
+        scheduler = Scheduler()
+        settings = compile_config({"clicks": BENCH_CLICKS, "camera_reset": BENCH_CAMERA_RESET, "lure": BENCH_LURE})
+        schedule_bot_actions(bot, scheduler, settings, {"clicks": 0, "camera": 0, "lure": 0})
+        stop_event = threading.Event()
+        timer = threading.Timer(duration, stop_event.set)
+        timer.start()
+        scheduler.run(stop_event)
+        timer.cancel()
+        return {"scheduler": scheduler.stats()}
+    else:
+        raise ValueError(f"cenário desconhecido: {scenario}")
+    return {}
+
+
+def summarize(registry: MetricsRegistry, elapsed: float) -> dict:
+    """Junta as séries de tap/joystick em ações/s, resultados e percentis"""
+    histogram = Histogram()
+    ok = failed = timeout = 0
+    for series in registry.series.values():
+        if series.action in ("tap", "move_joystick"):
+            histogram.merge(series.histogram)
+            ok += series.ok
+            failed += series.failed
+            timeout += series.timeout
+    return {
+        "actions": histogram.count,
+        "elapsed": elapsed,
+        "actions_per_sec": histogram.count / elapsed if elapsed > 0 else 0.0,
+        "ok": ok,
+        "failed": failed,
+        "timeout": timeout,
+        "p50_ms": histogram.quantile(0.50) * 1000,
+        "p95_ms": histogram.quantile(0.95) * 1000,
+        "p99_ms": histogram.quantile(0.99) * 1000,
+        "max_ms": histogram.max * 1000
+    }
+
+
+def run_benchmark(backends=BACKENDS, scenarios=SCENARIOS, actions: int = 100, duration: float = 5.0,
+                  latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0,
+                  batch_window: float = None, verbose: bool = False) -> dict:
+    """
+    Roda todos os cenários em todos os backends contra o dispositivo falso
+
+    Args:
+        backends: Backends do SimpleBotADB ("subprocess", "session", "socket")
+        scenarios: Cenários (ver SCENARIOS)
+        actions: Ações por cenário (cliques ou passos do joystick)
+        duration: Duração em segundos do loop da opção 1
+        latency, jitter, failure_rate: Comportamento do `input` falso (ver fake_device_env)
+        batch_window: Janela de agrupamento do bot (None = sem agrupamento)
+        verbose: Mostra a saída do bot durante os cenários
+
+    Returns:
+        {"config": parâmetros, "results": [um dicionário por backend/cenário]}
+    """
+    bin_dir = install_fake_device()
+    env = fake_device_env(bin_dir, latency, jitter, failure_rate, SERIAL)
+    results = []
+    previous_env = dict(os.environ)
+    os.environ.update(env)
+    try:
+        for backend in backends:
+            server = client = None
+            if backend == "socket":
+                server = FakeAdbServer(devices=[SERIAL], latency=latency, jitter=jitter,
+                                       failure_rate=failure_rate, bin_dir=bin_dir).start()
+                client = AdbClient(port=server.port)
+            try:
+                for scenario in scenarios:
+                    registry = MetricsRegistry()
+                    bot = SimpleBotADB(SERIAL, backend=backend, batch_window=batch_window, client=client,
+                                       metrics=registry)
+                    with contextlib.ExitStack() as stack:
+                        if not verbose:
+                            devnull = stack.enter_context(open(os.devnull, "w"))
+                            stack.enter_context(contextlib.redirect_stdout(devnull))
+                        connected = bot.connect()
+                        start = time.perf_counter()
+                        extra = run_scenario(bot, scenario, actions, duration) if connected else {}
+                        elapsed = time.perf_counter() - start
+                        batches = bot.batcher.stats()["batches"] if bot.batcher else None
+                        bot.disconnect()
+                    result = {"backend": backend, "scenario": scenario, "connected": connected,
+                              **summarize(registry, elapsed), **extra}
+                    # Envios ao dispositivo: lotes com o batcher, senão um por ação
+                    result["round_trips"] = result["actions"] if batches is None else batches
+                    results.append(result)
+                    print(f"  {backend:<10} {scenario:<15} {result['actions_per_sec']:8.1f} ações/s | "
+                          f"p50 {result['p50_ms']:.1f}ms p95 {result['p95_ms']:.1f}ms "
+                          f"p99 {result['p99_ms']:.1f}ms | {result['round_trips']} envios | "
+                          f"✗ {result['failed']} ⌛ {result['timeout']}")
+            finally:
+                if server is not None:
+                    server.stop()
+    finally:
+        os.environ.clear()
+        os.environ.update(previous_env)
+        shutil.rmtree(bin_dir, ignore_errors=True)
+
+    return {
+        "config": {"actions": actions, "duration": duration, "latency": latency, "jitter": jitter,
+                   "failure_rate": failure_rate, "batch_window": batch_window,
+                   "python": platform.python_version(), "time": time.time()},
+        "results": results
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float = 0.2) -> list:
+    """
+    Compara com um resultado salvo anteriormente
+
+    Args:
+        tolerance: Piora relativa aceita em ações/s e no p95
+
+    Returns:
+        Lista de textos descrevendo as regressões (vazia se nenhuma)
+    """
+    previous = {(item["backend"], item["scenario"]): item for item in baseline.get("results", [])}
+    regressions = []
+    for item in current["results"]:
+        old = previous.get((item["backend"], item["scenario"]))
+        if old is None:
+            continue
+        name = f"{item['backend']}/{item['scenario']}"
+        if item["actions_per_sec"] < old["actions_per_sec"] * (1 - tolerance):
+            regressions.append(f"{name}: {old['actions_per_sec']:.1f} -> {item['actions_per_sec']:.1f} ações/s")
+        if item["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {old['p95_ms']:.1f} -> {item['p95_ms']:.1f}ms")
+    return regressions
+
+
+if __name__ == "__main__":
+    import sys
+
+    parser = argparse.ArgumentParser(description="Benchmark do bot com um dispositivo ADB falso")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="Backends separados por vírgula")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Cenários separados por vírgula")
+    parser.add_argument("--actions", type=int, default=100, help="Ações por cenário")
+    parser.add_argument("--duration", type=float, default=5.0, help="Duração do loop da opção 1 (s)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latência de cada input (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Latência extra aleatória (s)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fração de inputs que falham")
+    parser.add_argument("--batch-window", type=float, default=None, help="Janela de agrupamento (s)")
+    parser.add_argument("--json", help="Arquivo de saída com os resultados")
+    parser.add_argument("--baseline", help="Resultado anterior para detectar regressões")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Piora relativa aceita")
+    parser.add_argument("--verbose", action="store_true", help="Mostra a saída do bot")
+    args = parser.parse_args()
+
+    print("\n⏱️  BENCHMARK (dispositivo falso)")
+    report = run_benchmark(args.backends.split(","), args.scenarios.split(","), args.actions, args.duration,
+                           args.latency, args.jitter, args.failure_rate, args.batch_window, args.verbose)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"✓ Resultados salvos em {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(json.load(f), report, args.tolerance)
+        if regressions:
+            print("✗ Regressões:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print("✓ Nenhuma regressão em relação ao baseline")
@@ -0,0 +1,307 @@
+"""
+Configuração compilada e recarregada a quente
+O bot_config.json é validado uma vez e convertido em objetos imutáveis (NamedTuple): o loop de
+ações só lê atributos, sem .get() em dicionários. Um observador confere o mtime do arquivo em
+segundo plano e troca a configuração compilada inteira por uma nova (uma atribuição, atômica),
+então lure, intervalos e cliques mudam sem reiniciar nem reconectar
+"""
+import json
+import os
+import threading
+from typing import NamedTuple
+
+from coordinates import parse_reference
+from scheduler import PRIORITY_CAMERA_RESET, PRIORITY_LURE
+
+# Tela (paisagem) em que as coordenadas padrão do joystick foram calibradas
+DEFAULT_SCREEN = (2400, 1080)
+
+
+class Periodic(NamedTuple):
+    """Ação periódica (camera_reset, lure)"""
+    enabled: bool
+    x: int
+    y: int
+    interval: float
+    priority: int
+    description: str
+
+
+class Click(NamedTuple):
+    """Um clique da sequência de clicks[]"""
+    x: int
+    y: int
+    interval: float
+    description: str
+
+
+class Point(NamedTuple):
+    """Posição na tela (pixels ou unidades do perfil "screen")"""
+    x: float
+    y: float
+
+
+class Joystick(NamedTuple):
+    """Seção joystick com os padrões já aplicados (coordenadas padrão em pixels de DEFAULT_SCREEN)"""
+    center_x: float = 248
+    center_y: float = 789
+    forward: Point = Point(246, 697)
+    left: Point = Point(334, 787)
+    backward: Point = Point(243, 869)
+    right: Point = Point(162, 787)
+    duration: int = 4000
+    step_duration: int = 500
+    step_interval: float = 0.3
+    steps_per_direction: int = 8
+    cycle_interval: float = 10.0
+    route_script: str = None
+    steering: str = None
+    cast_while_moving: bool = False
+
+
+class CompiledConfig(NamedTuple):
+    """bot_config.json validado; `raw` guarda o dicionário original (somente leitura)"""
+    device: str
+    backend: str
+    batch_window: float
+    injection: str
+    camera_reset: Periodic
+    lure: Periodic
+    clicks: tuple
+    joystick: Joystick
+    screen: tuple
+    raw: dict
+
+
+def _section(config: dict, key: str, kind=dict, name: str = None):
+    # Seção ausente fica vazia; tipo errado (ex.: "clicks": 5) vira ValueError com o nome da seção
+    value = config.get(key)
+    if value is None:
+        return kind()
+    if not isinstance(value, kind):
+        expected = "um objeto" if kind is dict else "uma lista"
+        raise ValueError(f"{name or key}: deve ser {expected} (recebido {value!r})")
+    return value
+
+
+def _number(section: str, data: dict, key: str, default=None, minimum: float = None, kind=float):
+    value = data.get(key, default)
+    if value is None and key not in data:
+        raise ValueError(f"{section}: '{key}' é obrigatório")
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{section}: '{key}' deve ser numérico (recebido {value!r})")
+    if minimum is not None and value <= minimum:
+        raise ValueError(f"{section}: '{key}' deve ser maior que {minimum} (recebido {value!r})")
+    return kind(value)
+
+
+def _non_negative(section: str, data: dict, key: str, default: float) -> float:
+    value = _number(section, data, key, default)
+    if value < 0:
+        raise ValueError(f"{section}: '{key}' não pode ser negativo (recebido {value!r})")
+    return value
+
+
+def _coordinate(section: str, data: dict, key: str, default=None):
+    # Inteiro para pixels, float para coordenadas normalizadas (0-1) ou de perfil
+    value = _number(section, data, key, default)
+    return int(value) if value.is_integer() else value
+
+
+def _periodic(section: str, data: dict, interval: float, priority: int, description: str) -> Periodic:
+    enabled = bool(data.get("enabled", False))
+    if not enabled:
+        # Desabilitada: coordenadas presentes ainda são validadas (o arquivo pode habilitá-la depois)
+        for key in ("x", "y"):
+            if key in data:
+                _coordinate(section, data, key)
+        return Periodic(False, 0, 0, interval, priority, data.get("description", description))
+    return Periodic(
+        True,
+        _coordinate(section, data, "x"),
+        _coordinate(section, data, "y"),
+        _number(section, data, "interval", interval, minimum=0),
+        _number(section, data, "priority", priority, kind=int),
+        str(data.get("description", description))
+    )
+
+
+def default_joystick(reference: tuple = None) -> Joystick:
+    """
+    Joystick padrão nas unidades do perfil de coordenadas
+
+    Args:
+        reference: (largura, altura) do perfil "screen" (parse_reference); None = pixels, como antes
+
+    Returns:
+        Joystick com centro e direções convertidos de DEFAULT_SCREEN para a referência
+    """
+    joystick = Joystick()
+    if reference is None or tuple(reference) == DEFAULT_SCREEN:
+        return joystick
+    sx, sy = reference[0] / DEFAULT_SCREEN[0], reference[1] / DEFAULT_SCREEN[1]
+
+    def scale(x, y):
+        x, y = x * sx, y * sy
+        # Perfis em pixels continuam inteiros; normalizados ficam com 4 casas
+        return (round(x), round(y)) if reference[0] > 1 else (round(x, 4), round(y, 4))
+
+    directions = {key: Point(*scale(*getattr(joystick, key))) for key in ("forward", "left", "backward", "right")}
+    center_x, center_y = scale(joystick.center_x, joystick.center_y)
+    return joystick._replace(center_x=center_x, center_y=center_y, **directions)
+
+
+def compile_joystick(data: dict, reference: tuple = None) -> Joystick:
+    """
+    Valida a seção joystick e converte em Joystick (campos ausentes usam os padrões)
+
+    Args:
+        data: Seção joystick do bot_config.json
+        reference: Perfil "screen" (parse_reference) em que as coordenadas padrão são expressas
+
+    Raises:
+        ValueError: Valor não numérico ou duração/intervalo inválido
+    """
+    defaults = default_joystick(reference)
+    directions = {}
+    for key in ("forward", "left", "backward", "right"):
+        default = getattr(defaults, key)
+        point = _section(data, key, name=f"joystick.{key}")
+        directions[key] = Point(_coordinate(f"joystick.{key}", point, "x", default.x),
+                                _coordinate(f"joystick.{key}", point, "y", default.y))
+    steering = data.get("steering")
+    if steering not in (None, "densest", "nearest"):
+        raise ValueError(f"joystick: 'steering' deve ser \"densest\" ou \"nearest\" (recebido {steering!r})")
+    route_script = data.get("route_script")
+    if route_script not in (None, "motionevent", "swipe"):
+        raise ValueError(f"joystick: 'route_script' deve ser \"motionevent\" ou \"swipe\" (recebido {route_script!r})")
+    return Joystick(
+        center_x=_coordinate("joystick", data, "center_x", defaults.center_x),
+        center_y=_coordinate("joystick", data, "center_y", defaults.center_y),
+        duration=_number("joystick", data, "duration", defaults.duration, minimum=0, kind=int),
+        step_duration=_number("joystick", data, "step_duration", defaults.step_duration, minimum=0, kind=int),
+        step_interval=_non_negative("joystick", data, "step_interval", defaults.step_interval),
+        steps_per_direction=_number("joystick", data, "steps_per_direction", defaults.steps_per_direction,
+                                    minimum=0, kind=int),
+        cycle_interval=_non_negative("joystick", data, "cycle_interval", defaults.cycle_interval),
+        route_script=route_script,
+        steering=steering,
+        cast_while_moving=bool(data.get("cast_while_moving", False)),
+        **directions
+    )
+
+
+def as_joystick(joystick) -> Joystick:
+    """Aceita um Joystick já compilado ou o dicionário da seção joystick"""
+    return joystick if isinstance(joystick, Joystick) else compile_joystick(joystick or {})
+
+
+def compile_config(config: dict) -> CompiledConfig:
+    """
+    Valida o dicionário do bot_config.json e converte nos objetos usados pelo bot
+
+    Raises:
+        ValueError: Seção com tipo errado, coordenada ausente, valor não numérico ou intervalo <= 0
+
+    `joystick` é None quando a seção não existe no arquivo (a opção 5 usa default_joystick(screen))
+    """
+    if not isinstance(config, dict):
+        raise ValueError(f"a configuração deve ser um objeto JSON (recebido {type(config).__name__})")
+    try:
+        reference = parse_reference(config.get("screen"))
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"screen: use {{\"width\": ..., \"height\": ...}} ou \"normalized\" "
+                         f"(recebido {config.get('screen')!r})") from None
+    clicks = []
+    for index, click in enumerate(_section(config, "clicks", list), 1):
+        section = f"clicks[{index}]"
+        if not isinstance(click, dict):
+            raise ValueError(f"{section}: deve ser um objeto (recebido {click!r})")
+        clicks.append(Click(
+            _coordinate(section, click, "x"),
+            _coordinate(section, click, "y"),
+            _number(section, click, "interval", 1.0, minimum=0),
+            str(click.get("description", ""))
+        ))
+    batch_window = config.get("batch_window")
+    return CompiledConfig(
+        device=config.get("device"),
+        backend=config.get("backend", "subprocess"),
+        batch_window=_number("batch_window", config, "batch_window", minimum=0) if batch_window else None,
+        injection=config.get("injection", "input"),
+        camera_reset=_periodic("camera_reset", _section(config, "camera_reset"), 8.0, PRIORITY_CAMERA_RESET,
+                               "Camera Reset"),
+        lure=_periodic("lure", _section(config, "lure"), 3.0, PRIORITY_LURE, "Lure"),
+        clicks=tuple(clicks),
+        joystick=compile_joystick(_section(config, "joystick"), reference) if config.get("joystick") else None,
+        screen=reference,
+        raw=config
+    )
+
+
+class ConfigWatcher:
+    """Observa o bot_config.json e troca a configuração compilada quando o arquivo muda"""
+
+    def __init__(self, path: str, current: CompiledConfig, interval: float = 1.0):
+        """
+        Args:
+            path: Arquivo observado
+            current: Configuração já compilada do arquivo
+            interval: Intervalo em segundos entre as verificações do mtime
+        """
+        self.path = path
+        self.current = current
+        self.interval = interval
+        # Incrementado a cada troca: o loop compara com a versão que já aplicou
+        self.version = 0
+        self._stamp = self._read_stamp()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _read_stamp(self) -> tuple:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def check(self) -> bool:
+        """
+        Recompila se o arquivo mudou desde a última verificação
+
+        Returns:
+            True se uma configuração nova foi aplicada
+        """
+        stamp = self._read_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                compiled = compile_config(json.load(f))
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            # Arquivo no meio de uma gravação ou inválido: mantém a configuração atual (e a thread viva)
+            print(f"⚠ {self.path} ignorado: {e}")
+            return False
+        self.current = compiled
+        self.version += 1
+        print(f"🔄 Configuração recarregada de {self.path}")
+        return True
+
+    def start(self) -> "ConfigWatcher":
+        """Verifica o arquivo em uma thread em segundo plano"""
+        if self._thread is None:
+            def loop():
+                while not self._stop.wait(self.interval):
+                    self.check()
+
+            self._stop.clear()
+            self._thread = threading.Thread(target=loop, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=2)
+            self._thread = None
@@ -0,0 +1,133 @@
+"""
+Perfis de coordenadas independentes de resolução
+As coordenadas do bot_config.json valem para uma tela de referência ("screen") ou são
+normalizadas (0-1). Na conexão, `wm size`/`wm density` do dispositivo definem uma transformação
+afim calculada uma vez e guardada; cada tap/swipe só faz uma multiplicação e uma soma por eixo
+"""
+import re
+
+# Transformações já calculadas por (dispositivo, referência): reconexões não repetem o `wm`
+_CACHE = {}
+
+
+def parse_wm_size(output: str) -> tuple:
+    """Lê (largura, altura) da saída do `wm size` (o override tem prioridade sobre o físico)"""
+    sizes = dict(re.findall(r"(Physical|Override) size:\s*(\d+x\d+)", output))
+    size = sizes.get("Override") or sizes.get("Physical")
+    if size is None:
+        raise ValueError(f"saída inesperada do wm size: {output.strip()!r}")
+    width, height = size.split("x")
+    return int(width), int(height)
+
+
+def parse_wm_density(output: str) -> int:
+    """Lê a densidade (dpi) da saída do `wm density` (None se indisponível)"""
+    densities = dict(re.findall(r"(Physical|Override) density:\s*(\d+)", output))
+    density = densities.get("Override") or densities.get("Physical")
+    return int(density) if density else None
+
+
+def parse_reference(screen) -> tuple:
+    """
+    Converte a chave "screen" do bot_config.json em (largura, altura) de referência
+
+    Aceita {"width": 2400, "height": 1080} (coordenadas absolutas dessa tela) ou
+    "normalized" (coordenadas de 0 a 1). None = sem transformação.
+    """
+    if not screen:
+        return None
+    if screen == "normalized":
+        return 1.0, 1.0
+    return float(screen["width"]), float(screen["height"])
+
+
+class CoordinateTransform:
+    """Transformação afim por eixo: x' = x * sx + ox, y' = y * sy + oy"""
+
+    __slots__ = ("sx", "sy", "ox", "oy", "width", "height", "density")
+
+    def __init__(self, sx: float, sy: float, ox: float = 0.0, oy: float = 0.0,
+                 width: int = None, height: int = None, density: int = None):
+        self.sx = sx
+        self.sy = sy
+        self.ox = ox
+        self.oy = oy
+        self.width = width
+        self.height = height
+        self.density = density
+
+    @classmethod
+    def between(cls, reference: tuple, size: tuple, density: int = None) -> "CoordinateTransform":
+        """
+        Transformação da tela de referência para a tela do dispositivo
+
+        O `wm size` informa a tela em retrato; quando a referência é paisagem (jogo na
+        horizontal) largura e altura do dispositivo são trocadas. Referências normalizadas
+        são sempre paisagem.
+        """
+        ref_width, ref_height = reference
+        width, height = size
+        if (ref_width >= ref_height) != (width >= height):
+            width, height = height, width
+        return cls(width / ref_width, height / ref_height, width=width, height=height, density=density)
+
+    @property
+    def identity(self) -> bool:
+        return self.sx == 1 and self.sy == 1 and self.ox == 0 and self.oy == 0
+
+    def map(self, x: float, y: float) -> tuple:
+        """Converte um ponto do perfil para pixels do dispositivo"""
+        return round(x * self.sx + self.ox), round(y * self.sy + self.oy)
+
+    def unmap(self, x: float, y: float) -> tuple:
+        """Inverso de map: pixels do dispositivo para o perfil (sem arredondar)"""
+        return (x - self.ox) / self.sx, (y - self.oy) / self.sy
+
+    def map_joystick(self, joystick):
+        """Cópia do Joystick compilado com centro e direções já convertidos"""
+        center_x, center_y = self.map(joystick.center_x, joystick.center_y)
+        directions = {}
+        for key in ("forward", "left", "backward", "right"):
+            point = getattr(joystick, key)
+            x, y = self.map(point.x, point.y)
+            directions[key] = point._replace(x=x, y=y)
+        return joystick._replace(center_x=center_x, center_y=center_y, **directions)
+
+    def map_clicks(self, clicks) -> tuple:
+        """Cópia dos cliques compilados (Click) com x/y convertidos"""
+        return tuple(click._replace(x=x, y=y) for click in clicks for x, y in (self.map(click.x, click.y),))
+
+    def __repr__(self):
+        return (f"CoordinateTransform({self.width}x{self.height}, sx={self.sx:.4f}, sy={self.sy:.4f}, "
+                f"density={self.density})")
+
+
+def to_profile(transform: CoordinateTransform, reference: tuple, x: float, y: float) -> tuple:
+    """
+    Converte pixels do dispositivo (Pointer Location, print da tela) para as unidades do perfil
+
+    Perfis em pixels continuam inteiros; normalizados ficam com 4 casas. Sem perfil
+    (reference None) as coordenadas já são as do dispositivo.
+    """
+    if reference is None:
+        return x, y
+    x, y = transform.unmap(x, y)
+    return (round(x), round(y)) if reference[0] > 1 else (round(x, 4), round(y, 4))
+
+
+def detect_transform(run_script, device_address: str, reference: tuple) -> CoordinateTransform:
+    """
+    Consulta `wm size`/`wm density` e calcula a transformação do dispositivo (com cache)
+
+    Args:
+        run_script: Função que executa uma linha de shell no dispositivo (CompletedProcess)
+        device_address: Serial/endereço do dispositivo (chave do cache)
+        reference: (largura, altura) de referência (parse_reference)
+    """
+    key = (device_address, reference)
+    transform = _CACHE.get(key)
+    if transform is None:
+        size = parse_wm_size(run_script("wm size", 5).stdout)
+        density = parse_wm_density(run_script("wm density", 5).stdout)
+        transform = _CACHE[key] = CoordinateTransform.between(reference, size, density)
+    return transform
@@ -0,0 +1,314 @@
+"""
+OCR de dígitos por templates de glifos
+Reconhece números da fonte fixa do jogo (HP/MP, gold, coordenadas) sem Tesseract: binariza o
+recorte, separa os caracteres pela projeção das colunas e compara todos de uma vez com o cache
+de glifos por correlação normalizada (um produto de matrizes)
+"""
+import os
+import time
+
+import cv2
+import numpy as np
+
+GLYPHS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "glyphs")
+
+# Tamanho normalizado dos glifos (largura, altura)
+GLYPH_SIZE = (10, 14)
+
+# Nome de arquivo dos caracteres que não podem aparecer em nomes de arquivo
+CHAR_NAMES = {"/": "slash", ",": "comma", ".": "dot", "%": "percent", "(": "lparen",
+              ")": "rparen", ":": "colon", "-": "minus"}
+NAME_CHARS = {name: char for char, name in CHAR_NAMES.items()}
+
+
+def binarize(crop: np.ndarray, max_saturation: int = 60, min_value: int = 120) -> np.ndarray:
+    """
+    Máscara do texto (pixels claros e pouco saturados) de um recorte RGB(A)
+
+    Returns:
+        Matriz uint8 com 1 no texto e 0 no fundo
+    """
+    pixels = crop[..., :3]
+    high = pixels.max(axis=2)
+    low = pixels.min(axis=2)
+    return ((high > min_value) & (high - low < max_saturation)).astype(np.uint8)
+
+
+def _split_wide(piece: np.ndarray, height: int, max_aspect: float, out: list):
+    """Divide blocos largos demais (caracteres encostados) na coluna com menos pixels"""
+    width = piece.shape[1]
+    if width <= max_aspect * height or width < 4:
+        out.append(piece)
+        return
+    margin = max(2, width // 4)
+    cut = margin + int(piece[:, margin:width - margin].sum(axis=0).argmin())
+    _split_wide(piece[:, :cut], height, max_aspect, out)
+    _split_wide(piece[:, cut:], height, max_aspect, out)
+
+
+def segment(mask: np.ndarray, min_pixels: int = 4, max_aspect: float = 0.8) -> list:
+    """
+    Separa os caracteres pela projeção das colunas
+
+    Args:
+        mask: Máscara do texto (binarize)
+        min_pixels: Blocos com menos pixels são ruído
+        max_aspect: Blocos mais largos que max_aspect x altura do texto são divididos
+
+    Returns:
+        Lista de recortes da máscara (um por caractere, aparados nas bordas vazias), da esquerda
+        para a direita
+    """
+    rows = np.flatnonzero(mask.any(axis=1))
+    if rows.size == 0:
+        return []
+    height = rows[-1] - rows[0] + 1
+    columns = mask.any(axis=0)
+    # Bordas das sequências de colunas com texto
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], columns.view(np.int8), [0]))))
+    pieces = []
+    for start, end in zip(edges[::2], edges[1::2]):
+        _split_wide(mask[:, start:end], height, max_aspect, pieces)
+
+    glyphs = []
+    for piece in pieces:
+        rows = np.flatnonzero(piece.any(axis=1))
+        cols = np.flatnonzero(piece.any(axis=0))
+        if rows.size and piece.sum() >= min_pixels:
+            glyphs.append(piece[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1])
+    return glyphs
+
+
+def normalize(glyph: np.ndarray) -> tuple:
+    """
+    Vetor de correlação do glifo (média zero, norma 1) e proporção largura/altura
+
+    Returns:
+        Tupla (vetor float32, proporção)
+    """
+    resized = cv2.resize(glyph.astype(np.float32), GLYPH_SIZE, interpolation=cv2.INTER_AREA).ravel()
+    resized -= resized.mean()
+    norm = np.linalg.norm(resized)
+    return (resized / norm if norm > 0 else resized), glyph.shape[1] / glyph.shape[0]
+
+
+class DigitOCR:
+    """Reconhece texto numérico de uma fonte fixa usando o cache de glifos"""
+
+    def __init__(self, glyphs_dir: str = GLYPHS_DIR, min_score: float = 0.5, aspect_weight: float = 0.5,
+                 max_saturation: int = 60, min_value: int = 120):
+        """
+        Args:
+            glyphs_dir: Pasta com os glifos (<caractere>_<n>.png), gerados por harvest()
+            min_score: Correlação mínima para aceitar um caractere (abaixo vira "?")
+            aspect_weight: Peso da diferença de proporção (separa "1" de "/" e "," de ".")
+            max_saturation, min_value: Limiares da binarização do texto
+        """
+        self.glyphs_dir = glyphs_dir
+        self.min_score = min_score
+        self.aspect_weight = aspect_weight
+        self.max_saturation = max_saturation
+        self.min_value = min_value
+        self.chars = []
+        self._templates = None
+        self._aspects = None
+        self.load()
+
+    def load(self) -> int:
+        """(Re)carrega os glifos da pasta; retorna a quantidade carregada"""
+        vectors, aspects, chars = [], [], []
+        if os.path.isdir(self.glyphs_dir):
+            for filename in sorted(os.listdir(self.glyphs_dir)):
+                if not filename.endswith(".png"):
+                    continue
+                image = cv2.imread(os.path.join(self.glyphs_dir, filename), cv2.IMREAD_GRAYSCALE)
+                if image is None:
+                    continue
+                name = filename.rsplit(".", 1)[0].rsplit("_", 1)[0]
+                vector, aspect = normalize((image > 127).astype(np.uint8))
+                vectors.append(vector)
+                aspects.append(aspect)
+                chars.append(NAME_CHARS.get(name, name))
+        self.chars = chars
+        self._templates = np.array(vectors, dtype=np.float32).reshape(len(vectors), GLYPH_SIZE[0] * GLYPH_SIZE[1])
+        self._aspects = np.log(np.array(aspects, dtype=np.float32))
+        return len(chars)
+
+    def scores(self, glyphs: list) -> np.ndarray:
+        """Matriz (caracteres x glifos do cache) de correlação com penalidade de proporção"""
+        vectors, aspects = zip(*(normalize(glyph) for glyph in glyphs))
+        # Correlação de todos os caracteres contra todos os glifos em uma multiplicação
+        scores = np.asarray(vectors) @ self._templates.T
+        scores -= self.aspect_weight * np.abs(np.log(np.asarray(aspects, dtype=np.float32))[:, None] - self._aspects)
+        return scores
+
+    def read(self, crop: np.ndarray) -> str:
+        """
+        Reconhece o texto de um recorte RGB(A)
+
+        Returns:
+            Texto reconhecido ("?" para caracteres sem glifo parecido)
+        """
+        if not self.chars:
+            raise RuntimeError(f"nenhum glifo em {self.glyphs_dir} - gere com: python3 digit_ocr.py harvest")
+        glyphs = segment(binarize(crop, self.max_saturation, self.min_value))
+        if not glyphs:
+            return ""
+        scores = self.scores(glyphs)
+        best = scores.argmax(axis=1)
+        return "".join(self.chars[index] if scores[i, index] >= self.min_score else "?"
+                       for i, index in enumerate(best))
+
+    def read_number(self, crop: np.ndarray) -> int:
+        """
+        Lê os dígitos do recorte como inteiro (separadores como "," e "." são ignorados)
+
+        Returns:
+            Inteiro lido, ou None se não houver dígitos ou algum caractere não foi reconhecido
+            ("1?870" não vira 1870)
+        """
+        text = self.read(crop)
+        if "?" in text:
+            return None
+        digits = "".join(char for char in text if char.isdigit())
+        return int(digits) if digits else None
+
+
+def harvest(image: np.ndarray, text: str, glyphs_dir: str = GLYPHS_DIR, max_variants: int = 8,
+            duplicate_score: float = 0.8, max_saturation: int = 60, min_value: int = 120) -> int:
+    """
+    Extrai glifos de um recorte cujo texto é conhecido
+
+    Args:
+        image: Recorte RGB(A) contendo só o texto
+        text: Texto exibido no recorte (espaços são ignorados)
+        glyphs_dir: Pasta de destino
+        max_variants: Variações guardadas por caractere
+        duplicate_score: Glifos já reconhecidos com esse score não são salvos de novo
+
+    Returns:
+        Quantidade de glifos salvos (0 se a segmentação não bate com o texto)
+    """
+    text = text.replace(" ", "")
+    glyphs = segment(binarize(image, max_saturation, min_value))
+    if len(glyphs) != len(text):
+        print(f"✗ {len(glyphs)} caracteres segmentados para o texto '{text}' ({len(text)})")
+        return 0
+
+    ocr = DigitOCR(glyphs_dir, max_saturation=max_saturation, min_value=min_value)
+    os.makedirs(glyphs_dir, exist_ok=True)
+    saved = 0
+    for char, glyph in zip(text, glyphs):
+        if ocr.chars:
+            known = ocr.scores([glyph])[0]
+            if any(known[j] >= duplicate_score for j, existing in enumerate(ocr.chars) if existing == char):
+                continue
+        name = CHAR_NAMES.get(char, char)
+        for variant in range(max_variants):
+            path = os.path.join(glyphs_dir, f"{name}_{variant}.png")
+            if not os.path.exists(path):
+                cv2.imwrite(path, glyph * 255)
+                ocr.load()
+                saved += 1
+                break
+    print(f"✓ {saved} glifos novos salvos em {glyphs_dir}")
+    return saved
+
+
+def evaluate(samples: list, ocr: "DigitOCR" = None) -> dict:
+    """
+    Mede a precisão em recortes de texto conhecido (use prints que não geraram os glifos)
+
+    Args:
+        samples: Lista de tuplas (recorte RGB(A), texto esperado)
+
+    Returns:
+        {"chars", "correct", "char_accuracy", "exact", "exact_accuracy", "errors": [(esperado, lido)]}
+    """
+    ocr = ocr or DigitOCR()
+    chars = correct = exact = 0
+    errors = []
+    for crop, expected in samples:
+        expected = expected.replace(" ", "")
+        text = ocr.read(crop)
+        chars += len(expected)
+        correct += sum(1 for a, b in zip(expected, text) if a == b) if len(text) == len(expected) else 0
+        if text == expected:
+            exact += 1
+        else:
+            errors.append((expected, text))
+    return {"chars": chars, "correct": correct, "char_accuracy": correct / chars if chars else 0.0,
+            "exact": exact, "exact_accuracy": exact / len(samples) if samples else 0.0, "errors": errors}
+
+
+def benchmark(crops: list, repeat: int = 50) -> dict:
+    """
+    Compara o DigitOCR com o pytesseract nos mesmos recortes
+
+    Returns:
+        {"ocr_ms", "ocr_texts", "tesseract_ms", "tesseract_texts"} (tesseract None se indisponível)
+    """
+    ocr = DigitOCR()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        texts = [ocr.read(crop) for crop in crops]
+    result = {"ocr_ms": (time.perf_counter() - start) / (repeat * len(crops)) * 1000, "ocr_texts": texts,
+              "tesseract_ms": None, "tesseract_texts": None}
+
+    try:
+        import pytesseract
+        config = "--psm 7 -c tessedit_char_whitelist=0123456789/,.%()"
+        start = time.perf_counter()
+        result["tesseract_texts"] = [pytesseract.image_to_string(crop[..., :3], config=config).strip()
+                                     for crop in crops]
+        result["tesseract_ms"] = (time.perf_counter() - start) / len(crops) * 1000
+    except Exception as e:
+        print(f"⚠ pytesseract indisponível: {e}")
+    return result
+
+
+def _load_crop(path: str, region: str = None) -> np.ndarray:
+    image = cv2.imread(path, cv2.IMREAD_COLOR)
+    if image is None:
+        raise FileNotFoundError(path)
+    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    if region:
+        x, y, w, h = (int(value) for value in region.split(","))
+        image = image[y:y + h, x:x + w]
+    return image
+
+
+if __name__ == "__main__":
+    import sys
+
+    usage = ("Uso:\n"
+             "  python3 digit_ocr.py harvest <imagem> <x,y,l,a> <texto>\n"
+             "  python3 digit_ocr.py read <imagem> [x,y,l,a]\n"
+             "  python3 digit_ocr.py eval <imagem> <x,y,l,a> <texto> [<imagem> <x,y,l,a> <texto> ...]\n"
+             "  python3 digit_ocr.py bench <imagem> <x,y,l,a> [<imagem> <x,y,l,a> ...]")
+    if len(sys.argv) < 3:
+        print(usage)
+        sys.exit(1)
+
+    command = sys.argv[1]
+    if command == "harvest" and len(sys.argv) == 5:
+        harvest(_load_crop(sys.argv[2], sys.argv[3]), sys.argv[4])
+    elif command == "read":
+        print(DigitOCR().read(_load_crop(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)))
+    elif command == "eval" and len(sys.argv) % 3 == 2:
+        args = sys.argv[2:]
+        samples = [(_load_crop(path, region), text) for path, region, text in zip(args[::3], args[1::3], args[2::3])]
+        result = evaluate(samples)
+        print(f"✓ Caracteres: {result['correct']}/{result['chars']} ({result['char_accuracy']:.1%}) | "
+              f"textos exatos: {result['exact']}/{len(samples)} ({result['exact_accuracy']:.1%})")
+        for expected, text in result["errors"]:
+            print(f"   ✗ esperado {expected} -> lido {text}")
+    elif command == "bench" and len(sys.argv) % 2 == 0:
+        crops = [_load_crop(path, region) for path, region in zip(sys.argv[2::2], sys.argv[3::2])]
+        result = benchmark(crops)
+        print(f"✓ DigitOCR: {result['ocr_ms']:.3f} ms/recorte -> {result['ocr_texts']}")
+        if result["tesseract_ms"] is not None:
+            print(f"✓ pytesseract: {result['tesseract_ms']:.1f} ms/recorte -> {result['tesseract_texts']}")
+    else:
+        print(usage)
+        sys.exit(1)
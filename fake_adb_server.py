@@ -0,0 +1,225 @@
+"""
+Servidor ADB falso para testes locais
+Implementa o subconjunto do protocolo host usado pelo AdbClient e executa os serviços
+shell:/exec: com o /bin/sh local, permitindo rodar o bot sem um celular conectado.
+install_fake_device() gera também um executável `adb` falso e os comandos do aparelho
+(`input`, `wm`) com latência e taxa de falha configuráveis, para medir o bot sem celular
+"""
+import os
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+
+# Executável `adb` falso: os comandos shell rodam no /bin/sh local com os comandos falsos no PATH
+FAKE_ADB = """#!/bin/sh
+[ "$1" = "-s" ] && shift 2
+case "$1" in
+  shell) shift; if [ $# -eq 0 ]; then exec sh; else exec sh -c "$*"; fi;;
+  exec-out|exec-in) shift; exec sh -c "$*";;
+  devices) printf 'List of devices attached\n%s\tdevice\n' "${FAKE_ADB_SERIAL:-emulator-5554}";;
+  version) echo "Android Debug Bridge version 1.0.41 (fake)";;
+  connect) echo "connected to $2";;
+  disconnect) echo "disconnected $2";;
+  *) echo "adb: comando não suportado pelo adb falso: $1" >&2; exit 1;;
+esac
+"""
+
+# `input` falso: espera a latência sorteada (mais a duração do swipe) e falha com a taxa configurada
+FAKE_INPUT = """#!/bin/sh
+[ -n "$FAKE_ADB_LOG" ] && echo "input $*" >> "$FAKE_ADB_LOG"
+extra=0
+[ "$1" = "swipe" ] && [ -n "$6" ] && extra="$6"
+set -- $(awk -v l="${FAKE_ADB_LATENCY:-0}" -v j="${FAKE_ADB_JITTER:-0}" -v f="${FAKE_ADB_FAILURE_RATE:-0}" \
+  -v e="$extra" -v s="$$" 'BEGIN { srand(); srand(s + int(rand() * 1000003)); d = l + j * rand() + e / 1000;
+  printf "%.4f %d", d, rand() < f }')
+[ "$1" != "0.0000" ] && sleep "$1"
+if [ "$2" = "1" ]; then
+  echo "Error: falha injetada pelo dispositivo falso" >&2
+  exit 1
+fi
+exit 0
+"""
+
+# `wm` falso: tamanho e densidade de FAKE_ADB_SIZE / FAKE_ADB_DENSITY
+FAKE_WM = """#!/bin/sh
+case "$1" in
+  size) echo "Physical size: ${FAKE_ADB_SIZE:-1080x2400}";;
+  density) echo "Physical density: ${FAKE_ADB_DENSITY:-420}";;
+esac
+"""
+
+
+def install_fake_device(bin_dir: str = None) -> str:
+    """
+    Escreve o `adb` falso e os comandos do aparelho em uma pasta
+
+    Coloque a pasta no início do PATH para o backend subprocess/session usar o adb falso;
+    o FakeAdbServer já a coloca no PATH dos comandos que executa.
+
+    Args:
+        bin_dir: Pasta de destino (None = pasta temporária nova)
+
+    Returns:
+        Caminho da pasta
+    """
+    bin_dir = bin_dir or tempfile.mkdtemp(prefix="fake_adb_")
+    os.makedirs(bin_dir, exist_ok=True)
+    for name, content in (("adb", FAKE_ADB), ("input", FAKE_INPUT), ("wm", FAKE_WM)):
+        path = os.path.join(bin_dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.chmod(path, 0o755)
+    return bin_dir
+
+
+def fake_device_env(bin_dir: str, latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0,
+                    serial: str = "emulator-5554") -> dict:
+    """
+    Variáveis de ambiente do dispositivo falso
+
+    Args:
+        bin_dir: Pasta gerada por install_fake_device()
+        latency: Latência fixa de cada `input` em segundos
+        jitter: Latência extra sorteada entre 0 e jitter segundos
+        failure_rate: Fração dos comandos `input` que falham (0 a 1)
+        serial: Serial listado pelo `adb devices` falso
+    """
+    env = dict(os.environ)
+    env["PATH"] = bin_dir + os.pathsep + env.get("PATH", "")
+    env["FAKE_ADB_LATENCY"] = str(latency)
+    env["FAKE_ADB_JITTER"] = str(jitter)
+    env["FAKE_ADB_FAILURE_RATE"] = str(failure_rate)
+    env["FAKE_ADB_SERIAL"] = serial
+    return env
+
+
+class FakeAdbHandler(socketserver.BaseRequestHandler):
+    """Atende uma conexão de cliente como o servidor adb faria"""
+
+    def _read_request(self) -> str:
+        header = self._recv_exact(4)
+        if not header:
+            return ""
+        return self._recv_exact(int(header, 16)).decode("utf-8")
+
+    def _recv_exact(self, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.request.recv(size - len(data))
+            if not chunk:
+                return b""
+            data += chunk
+        return bytes(data)
+
+    def _okay(self, payload: str = None):
+        data = b"OKAY"
+        if payload is not None:
+            body = payload.encode("utf-8")
+            data += b"%04x" % len(body) + body
+        self.request.sendall(data)
+
+    def _fail(self, message: str):
+        body = message.encode("utf-8")
+        self.request.sendall(b"FAIL" + b"%04x" % len(body) + body)
+
+    def handle(self):
+        server = self.server
+        request = self._read_request()
+
+        if request == "host:version":
+            self._okay("%04x" % 41)
+        elif request == "host:devices":
+            self._okay("".join(f"{serial}\tdevice\n" for serial in sorted(server.devices)))
+        elif request.startswith("host:connect:"):
+            address = request[len("host:connect:"):]
+            already = address in server.devices
+            server.devices.add(address)
+            self._okay(f"already connected to {address}" if already else f"connected to {address}")
+        elif request.startswith("host:disconnect:"):
+            address = request[len("host:disconnect:"):]
+            server.devices.discard(address)
+            self._okay(f"disconnected {address}")
+        elif request.startswith("host:transport:"):
+            serial = request[len("host:transport:"):]
+            if serial not in server.devices:
+                self._fail(f"device '{serial}' not found")
+                return
+            self._okay()
+            self._serve_device(self._read_request())
+        else:
+            self._fail(f"unknown host service '{request}'")
+
+    def _serve_device(self, service: str):
+        """Executa shell:<cmd> ou exec:<cmd> com o stdin/stdout ligados ao socket"""
+        if service.startswith("shell:"):
+            command = service[len("shell:"):] or "sh"
+        elif service.startswith("exec:"):
+            command = service[len("exec:"):]
+        else:
+            self._fail(f"unknown service '{service}'")
+            return
+
+        self._okay()
+        process = subprocess.Popen(
+            ["sh", "-c", command],
+            stdin=self.request,
+            stdout=self.request,
+            stderr=subprocess.STDOUT,
+            env=self.server.env
+        )
+        self.server.commands += 1
+        process.wait()
+
+
+class FakeAdbServer(socketserver.ThreadingTCPServer):
+    """Servidor adb falso escutando em localhost (porta 0 = porta livre escolhida pelo sistema)"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port: int = 0, devices: list = None, latency: float = 0.0, jitter: float = 0.0,
+                 failure_rate: float = 0.0, bin_dir: str = None):
+        """
+        Args:
+            port: Porta TCP (padrão: 0, porta livre)
+            devices: Seriais inicialmente conectados (padrão: ["emulator-5554"])
+            latency, jitter, failure_rate: Comportamento do `input` falso (ver fake_device_env)
+            bin_dir: Pasta dos comandos falsos (None = gerada com install_fake_device)
+        """
+        super().__init__(("127.0.0.1", port), FakeAdbHandler)
+        self.devices = set(devices or ["emulator-5554"])
+        self.commands = 0
+        self.bin_dir = install_fake_device(bin_dir)
+        self.env = fake_device_env(self.bin_dir, latency, jitter, failure_rate, sorted(self.devices)[0])
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self):
+        """Inicia o servidor em uma thread em segundo plano"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Para o servidor"""
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 5037
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    failure_rate = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+    server = FakeAdbServer(port, latency=latency, failure_rate=failure_rate)
+    print(f"✓ Servidor ADB falso escutando em 127.0.0.1:{server.port}")
+    print(f"   input: latência {latency * 1000:.0f}ms | falhas {failure_rate:.0%} | adb falso em {server.bin_dir}")
+    print("   Pressione Ctrl+C para parar")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹ Servidor parado")
@@ -0,0 +1,345 @@
+"""
+Execução em frota: vários celulares em um único processo
+Um agendador compartilhado dispara as ações de todos os dispositivos e um pool de
+threads limitado executa os comandos, com contadores de saúde e vazão por dispositivo.
+Com "vision" configurado, as capturas vão para um VisionPool compartilhado e o HP lido
+dispara a poção pelo mesmo agendador
+"""
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from adb_client import AdbClient
+from compiled_config import CompiledConfig, compile_config
+from metrics import METRICS
+from metrics_server import MetricsServer
+from scheduler import Scheduler, PRIORITY_POTION, PRIORITY_SKILLS
+from simple_bot import SimpleBotADB, load_config
+
+# Falhas seguidas até o dispositivo ser marcado como offline e reconectado
+MAX_CONSECUTIVE_FAILURES = 5
+
+# Padrões da seção "vision" da frota
+VISION_INTERVAL = 0.5
+POTION_BELOW = 40.0
+POTION_COOLDOWN = 3.0
+
+
+class DeviceWorker:
+    """Um dispositivo da frota: bot, perfil de ações e contadores de saúde"""
+
+    def __init__(self, bot: SimpleBotADB, profile: CompiledConfig, max_pending: int = 4):
+        """
+        Args:
+            bot: Bot já configurado para o dispositivo
+            profile: Perfil do dispositivo compilado (compile_config)
+            max_pending: Ações enfileiradas por dispositivo antes de descartar novas
+        """
+        self.bot = bot
+        self.profile = profile
+        self.max_pending = max_pending
+        self.state = "desconectado"
+        self.ok = 0
+        self.failed = 0
+        self.dropped = 0
+        self.reconnects = 0
+        self.consecutive_failures = 0
+        self.pending = 0
+        self.started = time.monotonic()
+        self.capture = None
+        self.potion = None
+        self.hp = None
+        self.capturing = False
+        self._lock = threading.Lock()
+        self._device_lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.bot.device_address
+
+    def submit(self, executor: ThreadPoolExecutor, x: int, y: int, label: str = ""):
+        """Enfileira um clique no pool (descarta se o dispositivo já está atrasado)"""
+        with self._lock:
+            if self.state != "ok" or self.pending >= self.max_pending:
+                self.dropped += 1
+                return
+            self.pending += 1
+        executor.submit(self._tap, x, y, label)
+
+    def _tap(self, x: int, y: int, label: str = ""):
+        # Um comando por vez por dispositivo; dispositivos diferentes rodam em paralelo
+        with self._device_lock:
+            success = self.bot.tap(x, y, label)
+        with self._lock:
+            self.pending -= 1
+            if success:
+                self.ok += 1
+                self.consecutive_failures = 0
+            else:
+                self.failed += 1
+                self.consecutive_failures += 1
+                if self.consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                    self.state = "offline"
+
+    def on_vision(self, device: str, output: dict):
+        """Retorno do VisionPool: guarda o HP lido para o job da poção"""
+        with self._lock:
+            self.hp = output.get("hp")
+
+    def take_hp(self) -> float:
+        """Retorna e limpa a última leitura de HP (None se não chegou leitura nova)"""
+        with self._lock:
+            hp, self.hp = self.hp, None
+            return hp
+
+    def start_capture(self) -> bool:
+        """Marca o início de uma captura (False se o dispositivo não está ok ou já está capturando)"""
+        with self._lock:
+            if self.state != "ok" or self.capturing:
+                return False
+            self.capturing = True
+            return True
+
+    def start_reconnect(self) -> bool:
+        """
+        Marca um dispositivo offline como "reconectando"
+
+        Returns:
+            True se a reconexão deve ser disparada (False se já está em andamento ou não está offline)
+        """
+        with self._lock:
+            if self.state != "offline":
+                return False
+            self.state = "reconectando"
+            return True
+
+    def reconnect(self) -> bool:
+        """Tenta reconectar um dispositivo offline (volta para "offline" se falhar)"""
+        with self._device_lock:
+            self.bot.disconnect()
+            connected = self.bot.connect()
+        with self._lock:
+            self.reconnects += 1
+            if connected:
+                self.state = "ok"
+                self.consecutive_failures = 0
+            else:
+                # A próxima verificação de saúde tenta de novo
+                self.state = "offline"
+        return connected
+
+    def stats(self) -> dict:
+        """Retorna contadores de saúde e vazão do dispositivo"""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        with self._lock:
+            return {
+                "device": self.name,
+                "state": self.state,
+                "ok": self.ok,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "reconnects": self.reconnects,
+                "actions_per_sec": self.ok / elapsed
+            }
+
+
+class FleetRunner:
+    """Supervisor que roda todos os dispositivos da frota com concorrência limitada"""
+
+    def __init__(self, fleet_config: dict, max_workers: int = 16, status_interval: float = 30.0):
+        """
+        Args:
+            fleet_config: Configuração com a lista "devices" (ver build_workers)
+            max_workers: Comandos ADB simultâneos em todo o processo
+            status_interval: Intervalo em segundos do relatório de saúde
+        """
+        self.config = fleet_config
+        self.max_workers = fleet_config.get("max_workers", max_workers)
+        self.status_interval = fleet_config.get("status_interval", status_interval)
+        self.scheduler = Scheduler()
+        self.workers = []
+        self.stop_event = threading.Event()
+        self.vision = None
+        self._vision_lock = threading.Lock()
+        self._client = AdbClient()
+
+    def build_workers(self) -> list:
+        """
+        Cria um DeviceWorker para cada entrada de "devices"
+
+        Cada entrada é {"device": "IP:porta", "profile": "nome"} e pode sobrescrever
+        camera_reset/lure/clicks/vision; o perfil vem de "profiles" ou das seções globais.
+        Com vision.potion no perfil, o dispositivo ganha um ScreenCapture para o pool de visão.
+        """
+        profiles = self.config.get("profiles", {})
+        backend = self.config.get("backend", "socket")
+
+        for entry in self.config.get("devices", []):
+            profile = dict(self.config)
+            profile.update(profiles.get(entry.get("profile"), {}))
+            profile.update(entry)
+            try:
+                settings = compile_config(profile)
+            except ValueError as e:
+                print(f"✗ Perfil inválido para {entry.get('device')}: {e}")
+                continue
+            bot = SimpleBotADB(
+                device_address=entry["device"],
+                backend=profile.get("backend", backend),
+                client=self._client,
+                screen=profile.get("screen")
+            )
+            worker = DeviceWorker(bot, settings)
+            vision = profile.get("vision") or {}
+            if vision.get("potion"):
+                from screen_capture import ScreenCapture
+                worker.capture = ScreenCapture(entry["device"], client=self._client, rois=vision.get("rois"))
+                worker.potion = vision["potion"]
+            self.workers.append(worker)
+        return self.workers
+
+    def _vision_pool(self, shape: tuple):
+        """VisionPool compartilhado, criado no primeiro quadro (None se o formato não bate)"""
+        with self._vision_lock:
+            if self.vision is None:
+                # Visão só é carregada aqui (requer numpy/opencv)
+                from vision_pool import VisionPool
+                vision = self.config.get("vision", {})
+                self.vision = VisionPool(frame_shape=shape, workers=vision.get("workers"),
+                                         detectors=("hp",), rois=vision.get("rois")).start()
+                for worker in self.workers:
+                    if worker.potion:
+                        self.vision.register(worker.name, worker.on_vision)
+            if tuple(shape) != self.vision.frame_shape:
+                return None
+            return self.vision
+
+    def _capture(self, worker: DeviceWorker):
+        """Captura um quadro do dispositivo e envia para o pool de visão (roda no executor)"""
+        try:
+            frame = worker.capture.capture()
+            pool = self._vision_pool(frame.shape)
+            if pool is None:
+                print(f"⚠ {worker.name}: quadro {frame.shape} diferente do pool de visão, ignorado")
+            else:
+                pool.submit(worker.name, frame)
+        except Exception as e:
+            print(f"✗ Captura de {worker.name} falhou: {e}")
+        finally:
+            with worker._lock:
+                worker.capturing = False
+
+    def _register_jobs(self, worker: DeviceWorker, executor: ThreadPoolExecutor, offset: float):
+        """Registra camera reset, lure e cliques do dispositivo no agendador compartilhado"""
+        profile = worker.profile
+
+        def make_tap(x, y, label):
+            return lambda: worker.submit(executor, x, y, label)
+
+        for action in (profile.camera_reset, profile.lure):
+            if action.enabled:
+                self.scheduler.add_job(f"{worker.name} {action.description}",
+                                       make_tap(action.x, action.y, action.description),
+                                       action.interval, action.priority, offset)
+        if profile.clicks:
+            steps = [(make_tap(c.x, c.y, c.description), c.interval) for c in profile.clicks]
+            self.scheduler.add_sequence(f"{worker.name} Cliques", steps, PRIORITY_SKILLS, offset)
+        if worker.potion:
+            self._register_vision_jobs(worker, executor, offset)
+
+    def _register_vision_jobs(self, worker: DeviceWorker, executor: ThreadPoolExecutor, offset: float):
+        """Registra a captura para o pool de visão e a poção disparada pelo HP lido"""
+        potion = worker.potion
+        below = potion.get("below", POTION_BELOW)
+        cooldown = potion.get("cooldown", POTION_COOLDOWN)
+        interval = self.config.get("vision", {}).get("interval", VISION_INTERVAL)
+        ready = [0.0]
+
+        def capture():
+            if worker.start_capture():
+                executor.submit(self._capture, worker)
+
+        def drink():
+            # O retorno do pool só guarda o HP; a decisão roda aqui, na thread do agendador
+            hp = worker.take_hp()
+            now = time.monotonic()
+            if hp is not None and hp < below and now >= ready[0]:
+                ready[0] = now + cooldown
+                worker.submit(executor, potion["x"], potion["y"], "Poção")
+
+        self.scheduler.add_job(f"{worker.name} Visão", capture, interval, PRIORITY_SKILLS, offset)
+        self.scheduler.add_job(f"{worker.name} Poção", drink, interval, PRIORITY_POTION, offset)
+
+    def _health_check(self, executor: ThreadPoolExecutor):
+        """Reconecta em segundo plano os dispositivos marcados como offline"""
+        for worker in self.workers:
+            if worker.start_reconnect():
+                executor.submit(worker.reconnect)
+
+    def print_status(self):
+        """Mostra a tabela de saúde e vazão da frota"""
+        stats = [worker.stats() for worker in self.workers]
+        total = sum(stat["actions_per_sec"] for stat in stats)
+        online = sum(1 for stat in stats if stat["state"] == "ok")
+        print(f"\n📊 Frota: {online}/{len(stats)} online | {total:.1f} ações/s")
+        for stat in stats:
+            print(f"   {stat['device']}: {stat['state']} | ✓ {stat['ok']} ✗ {stat['failed']} "
+                  f"descartadas {stat['dropped']} | reconexões {stat['reconnects']} | "
+                  f"{stat['actions_per_sec']:.2f} ações/s")
+
+    def run(self):
+        """Conecta todos os dispositivos e roda o agendador até Ctrl+C"""
+        if not self.workers:
+            self.build_workers()
+        if not self.workers:
+            print("✗ Nenhum dispositivo em \"devices\" na configuração da frota!")
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Conexões em paralelo, limitadas pelo mesmo pool
+            results = list(executor.map(lambda w: w.bot.connect(), self.workers))
+            for worker, connected in zip(self.workers, results):
+                with worker._lock:
+                    worker.state = "ok" if connected else "offline"
+
+            # Desloca o início de cada dispositivo para não disparar todos no mesmo instante
+            spread = 1.0 / len(self.workers)
+            for i, worker in enumerate(self.workers):
+                self._register_jobs(worker, executor, i * spread)
+            self.scheduler.add_job("saúde", lambda: self._health_check(executor), 5.0, 0)
+            self.scheduler.add_job("status", self.print_status, self.status_interval, 0, self.status_interval)
+
+            metrics_server = None
+            metrics_config = self.config.get("metrics", {})
+            if metrics_config.get("port"):
+                try:
+                    metrics_server = MetricsServer(METRICS, metrics_config["port"],
+                                                   metrics_config.get("host", "127.0.0.1")).start()
+                    for worker in self.workers:
+                        metrics_server.watch_bot(worker.bot, lambda worker=worker: worker.state)
+                    metrics_server.watch_scheduler(self.scheduler)
+                except OSError as e:
+                    print(f"⚠ Endpoint de métricas indisponível: {e}")
+
+            print(f"\n🚀 Frota iniciada: {len(self.workers)} dispositivos | {self.max_workers} comandos simultâneos")
+            print("   Pressione Ctrl+C para parar\n")
+            try:
+                self.scheduler.run(self.stop_event)
+            except KeyboardInterrupt:
+                print("\n\n⏹ Frota parada")
+            finally:
+                self.stop_event.set()
+                self.print_status()
+                METRICS.print_report()
+                if metrics_server:
+                    metrics_server.stop()
+                if self.vision is not None:
+                    self.vision.stop()
+                for worker in self.workers:
+                    worker.bot.disconnect()
+
+
+if __name__ == "__main__":
+    config_file = sys.argv[1] if len(sys.argv) > 1 else "bot_config.json"
+    FleetRunner(load_config(config_file)).run()
@@ -0,0 +1,102 @@
+"""
+Filtro de quadros sem mudança
+Reduz cada região (HP, XP, minimapa...) a uma grade pequena de médias por bloco e só deixa
+o detector rodar quando a região mudou desde a última execução; nos outros quadros devolve
+o resultado anterior e contabiliza a economia
+"""
+import cv2
+import numpy as np
+
+from screen_capture import DEFAULT_ROIS
+
+
+class FrameGate:
+    """Decide por região se o quadro mudou o suficiente para rodar os detectores"""
+
+    def __init__(self, rois: dict = None, grid: int = 8, threshold: float = 3.0, max_skips: int = 0):
+        """
+        Args:
+            rois: Regiões nomeadas {"nome": (x, y, largura, altura)} (padrão: DEFAULT_ROIS)
+            grid: Lado da grade de blocos (grid x grid médias por canal)
+            threshold: Diferença média absoluta entre as grades (0-255) que conta como mudança
+            max_skips: Força a execução após esse número de quadros pulados seguidos (0 = nunca)
+        """
+        self.rois = {name: tuple(roi) for name, roi in (rois or DEFAULT_ROIS).items()}
+        self.grid = grid
+        self.threshold = threshold
+        self.max_skips = max_skips
+        self._signatures = {}
+        self._results = {}
+        self._skips = {}
+        self._counts = {name: [0, 0] for name in self.rois}
+
+    def signature(self, region: np.ndarray) -> np.ndarray:
+        """Médias por bloco da região (grid x grid x canais) em int16"""
+        region = region[..., :3]
+        if not region.flags.c_contiguous:
+            region = np.ascontiguousarray(region)
+        return cv2.resize(region, (self.grid, self.grid), interpolation=cv2.INTER_AREA).astype(np.int16)
+
+    def changed(self, name: str, frame: np.ndarray) -> bool:
+        """
+        Verifica se a região mudou desde a última vez que foi aceita
+
+        A comparação é sempre com a assinatura da última execução, então mudanças lentas
+        acumulam até passar do limite em vez de se perderem quadro a quadro
+        """
+        x, y, w, h = self.rois[name]
+        current = self.signature(frame[y:y + h, x:x + w])
+        counts = self._counts.setdefault(name, [0, 0])
+        counts[0] += 1
+
+        previous = self._signatures.get(name)
+        skips = self._skips.get(name, 0)
+        if (previous is not None and float(np.abs(current - previous).mean()) < self.threshold
+                and not (self.max_skips and skips >= self.max_skips)):
+            self._skips[name] = skips + 1
+            return False
+
+        self._signatures[name] = current
+        self._skips[name] = 0
+        counts[1] += 1
+        return True
+
+    def run(self, name: str, frame: np.ndarray, detector):
+        """
+        Roda detector(frame) só se a região mudou; senão devolve o último resultado
+
+        Args:
+            name: Nome da região em self.rois
+            frame: Quadro inteiro
+            detector: Função que recebe o quadro (ex.: HPBarReader.read, MinimapAnalyzer.analyze_frame)
+        """
+        if self.changed(name, frame) or name not in self._results:
+            self._results[name] = detector(frame)
+        return self._results[name]
+
+    def reset(self, name: str = None):
+        """Esquece as assinaturas (de uma região ou de todas), forçando a próxima execução"""
+        for store in (self._signatures, self._results, self._skips):
+            if name is None:
+                store.clear()
+            else:
+                store.pop(name, None)
+
+    def stats(self) -> dict:
+        """Por região: quadros verificados, execuções, quadros pulados e fração pulada"""
+        report = {}
+        for name, (checks, runs) in self._counts.items():
+            report[name] = {
+                "checks": checks,
+                "runs": runs,
+                "skipped": checks - runs,
+                "skip_ratio": (checks - runs) / checks if checks else 0.0
+            }
+        return report
+
+    def print_report(self):
+        """Mostra quanto trabalho de visão foi economizado"""
+        print("\n🧮 FILTRO DE QUADROS:")
+        for name, item in self.stats().items():
+            print(f"  {name}: {item['runs']}/{item['checks']} execuções | "
+                  f"{item['skip_ratio'] * 100:.0f}% pulados")
@@ -0,0 +1,162 @@
+"""
+Leitor da barra de HP
+Localiza a barra uma vez por template matching contra o vida.png e guarda a região na sessão;
+nos quadros seguintes calcula a porcentagem só com uma máscara de cor vetorizada sobre essa região
+"""
+import os
+import time
+
+import cv2
+import numpy as np
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vida.png")
+
+
+def red_mask(pixels: np.ndarray, min_red: int = 120, min_delta: int = 60) -> np.ndarray:
+    """Máscara booleana dos pixels vermelhos (preenchimento da barra) em uma imagem RGB(A)"""
+    r = pixels[..., 0].astype(np.int16)
+    g = pixels[..., 1].astype(np.int16)
+    b = pixels[..., 2].astype(np.int16)
+    return (r > min_red) & (r - g > min_delta) & (r - b > min_delta)
+
+
+class HPBarReader:
+    """Lê a porcentagem de HP de quadros RGB/RGBA (formato do ScreenCapture e do ScreenStream)"""
+
+    name = "HP"
+    mask = staticmethod(red_mask)
+    # True = a barra ocupa toda a largura do quadro (o template só fixa a altura)
+    full_width = False
+
+    def __init__(self, template_path: str = TEMPLATE_PATH, source=None, min_score: float = 0.7,
+                 min_fill: float = 0.25, search_region: tuple = None):
+        """
+        Args:
+            template_path: Imagem de referência da barra (padrão: vida.png)
+            source: Função sem argumentos que retorna o quadro atual (usada por poll())
+            min_score: Score mínimo do template matching para aceitar a localização
+            min_fill: Fração mínima de pixels da cor da barra para uma coluna contar como cheia
+            search_region: Região (x, y, largura, altura) onde procurar a barra (None = tela toda)
+        """
+        template = cv2.imread(template_path, cv2.IMREAD_COLOR)
+        if template is None:
+            raise FileNotFoundError(f"template da barra de {self.name} não encontrado: {template_path}")
+        self.template = cv2.cvtColor(template, cv2.COLOR_BGR2RGB)
+        self.source = source
+        self.min_score = min_score
+        self.min_fill = min_fill
+        self.search_region = search_region
+        self.band = self._find_band(self.template)
+        self.roi = None
+        self.score = 0.0
+        self.last = None
+        self.last_time = 0.0
+
+    def _find_band(self, template: np.ndarray) -> tuple:
+        """Linhas (início, fim) do template ocupadas pela barra"""
+        rows = np.flatnonzero(self.mask(template).mean(axis=1) > 0.5)
+        if rows.size == 0:
+            raise ValueError(f"barra de {self.name} não encontrada no template")
+        return int(rows[0]), int(rows[-1]) + 1
+
+    def locate(self, frame: np.ndarray) -> bool:
+        """
+        Procura a barra no quadro e guarda a região para os próximos quadros
+
+        Returns:
+            True se encontrou a barra com score suficiente
+        """
+        image = np.ascontiguousarray(frame[..., :3])
+        offset_x = offset_y = 0
+        if self.search_region is not None:
+            offset_x, offset_y, w, h = self.search_region
+            image = image[offset_y:offset_y + h, offset_x:offset_x + w]
+
+        result = cv2.matchTemplate(image, self.template, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (x, y) = cv2.minMaxLoc(result)
+        self.score = float(score)
+        if score < self.min_score:
+            print(f"✗ Barra de {self.name} não encontrada (score {score:.2f})")
+            return False
+
+        top, bottom = self.band
+        if self.full_width:
+            self.roi = (0, offset_y + y + top, frame.shape[1], bottom - top)
+        else:
+            self.roi = (offset_x + x, offset_y + y + top, self.template.shape[1], bottom - top)
+        print(f"✓ Barra de {self.name} em {self.roi} (score {score:.2f})")
+        return True
+
+    def reset(self):
+        """Descarta a região guardada (ex.: após mudar a resolução ou a rotação)"""
+        self.roi = None
+
+    def read(self, frame: np.ndarray) -> float:
+        """
+        Calcula a porcentagem preenchida da barra no quadro
+
+        O texto sobre a barra não tem a cor do preenchimento, então a porcentagem vem da
+        última coluna cheia e não da contagem de colunas
+
+        Returns:
+            Porcentagem de 0 a 100, ou None se a barra não foi localizada
+        """
+        if self.roi is None and not self.locate(frame):
+            return None
+        x, y, w, h = self.roi
+        columns = self.mask(frame[y:y + h, x:x + w]).mean(axis=0) >= self.min_fill
+        # argmax no vetor invertido = distância da última coluna cheia até a borda direita
+        filled = w - int(columns[::-1].argmax()) if columns.any() else 0
+
+        self.last = filled * 100.0 / w
+        self.last_time = time.monotonic()
+        return self.last
+
+    def poll(self) -> float:
+        """Lê a barra no quadro atual da fonte (para jobs do Scheduler)"""
+        return self.read(self.source())
+
+    def below(self, percent: float) -> bool:
+        """True se a última leitura está abaixo de `percent`"""
+        return self.last is not None and self.last < percent
+
+
+def benchmark(paths: list, repeat: int = 200) -> dict:
+    """
+    Mede o tempo de read() sobre quadros salvos (a localização acontece no primeiro quadro)
+
+    Returns:
+        {"frames", "reads", "mean_us", "max_us", "values"}
+    """
+    frames = []
+    for path in paths:
+        image = cv2.imread(path, cv2.IMREAD_COLOR)
+        if image is None:
+            raise FileNotFoundError(path)
+        frames.append(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+
+    reader = HPBarReader()
+    values = [reader.read(frame) for frame in frames]
+    timings = []
+    for _ in range(repeat):
+        for frame in frames:
+            start = time.perf_counter()
+            reader.read(frame)
+            timings.append(time.perf_counter() - start)
+    return {
+        "frames": len(frames),
+        "reads": len(timings),
+        "mean_us": sum(timings) / len(timings) * 1e6,
+        "max_us": max(timings) * 1e6,
+        "values": values
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    result = benchmark(sys.argv[1:] or [TEMPLATE_PATH])
+    for path, value in zip(sys.argv[1:] or [TEMPLATE_PATH], result["values"]):
+        print(f"  {path}: {'-' if value is None else f'{value:.1f}%'}")
+    print(f"✓ {result['reads']} leituras em {result['frames']} quadros | "
+          f"média {result['mean_us']:.1f} µs | máximo {result['max_us']:.1f} µs")
@@ -0,0 +1,176 @@
+"""
+Pipeline de comandos de entrada em lote
+Agrupa as ações (taps, swipes) enviadas quase ao mesmo tempo por várias threads
+em uma única chamada shell no dispositivo, com resultado individual por ação.
+Uma ação sozinha sai na hora; quem dispara um grupo (ex: o agendador com camera reset,
+lure e skill vencidos juntos) anuncia o tamanho com expect() e o lote sai quando o
+grupo chega inteiro ou a janela acaba
+"""
+import subprocess
+import threading
+
+
+class _PendingAction:
+    """Ação aguardando execução no próximo lote"""
+
+    __slots__ = ("command", "timeout", "done", "result", "error")
+
+    def __init__(self, command: str, timeout: float):
+        self.command = command
+        self.timeout = timeout
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class InputBatcher:
+    """Junta as ações recebidas dentro de uma janela de tempo e as executa em um único round-trip"""
+
+    MARKER = "__BOT_ACAO__"
+
+    def __init__(self, execute, window: float = 0.02, max_batch: int = 16):
+        """
+        Inicializa o batcher (a thread de envio é criada em start())
+
+        Args:
+            execute: Função (script, timeout) -> CompletedProcess que roda um script shell no dispositivo
+            window: Espera máxima em segundos pelas ações anunciadas com expect(), contada a partir
+                da primeira ação do lote (padrão: 20ms)
+            max_batch: Máximo de ações por lote
+        """
+        self.execute = execute
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.actions = 0
+        self._pending = []
+        self._expected = 1
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """Inicia a thread que envia os lotes"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Para a thread de envio (ações pendentes ainda são executadas)"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def expect(self, count: int):
+        """
+        Anuncia quantas ações o próximo lote deve reunir (enviadas por threads diferentes)
+
+        Args:
+            count: Ações do grupo; o lote sai assim que todas chegarem ou quando a janela acabar
+        """
+        with self._cond:
+            self._expected = max(1, count)
+            self._cond.notify_all()
+
+    def submit(self, command: str, timeout: float = 5) -> subprocess.CompletedProcess:
+        """
+        Enfileira uma ação e bloqueia até o resultado do seu lote
+
+        Args:
+            command: Linha de comando shell da ação (ex: "input tap 100 200")
+            timeout: Tempo máximo da ação em segundos
+
+        Returns:
+            CompletedProcess com o returncode e a saída desta ação
+        """
+        action = _PendingAction(command, timeout)
+        with self._cond:
+            if not self._running:
+                raise RuntimeError("batcher de entrada não iniciado")
+            self._pending.append(action)
+            self._cond.notify_all()
+
+        # Margem para a janela de agrupamento e para as ações que rodam antes no mesmo lote
+        if not action.done.wait(timeout + self.window + self._queued_time()):
+            raise subprocess.TimeoutExpired(command, timeout)
+        if action.error is not None:
+            raise action.error
+        return action.result
+
+    def _queued_time(self) -> float:
+        with self._cond:
+            return sum(a.timeout for a in self._pending)
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+
+                # Espera o grupo anunciado (no máximo a janela); ações avulsas saem na hora e as
+                # que chegam enquanto um lote está no dispositivo seguem juntas no próximo
+                self._cond.wait_for(
+                    lambda: len(self._pending) >= min(self._expected, self.max_batch) or not self._running,
+                    timeout=self.window
+                )
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+                self._expected = 1
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: list):
+        """Executa o lote como um script e distribui os resultados por ação"""
+        script = "; ".join(
+            f"{action.command} 2>&1; echo \"{self.MARKER}{i} $?\""
+            for i, action in enumerate(batch)
+        )
+        try:
+            result = self.execute(script, sum(action.timeout for action in batch))
+        except Exception as e:
+            for action in batch:
+                action.error = e
+                action.done.set()
+            return
+
+        self.batches += 1
+        self.actions += len(batch)
+
+        outputs = {}
+        current = []
+        for line in result.stdout.splitlines(keepends=True):
+            pos = line.find(self.MARKER)
+            if pos < 0:
+                current.append(line)
+                continue
+            current.append(line[:pos])
+            index, _, code = line[pos + len(self.MARKER):].strip().partition(" ")
+            try:
+                outputs[int(index)] = (int(code), "".join(current))
+            except ValueError:
+                pass
+            current = []
+
+        for i, action in enumerate(batch):
+            # Ação sem marcador: o script foi interrompido antes dela
+            returncode, text = outputs.get(i, (1, result.stderr or "lote interrompido"))
+            action.result = subprocess.CompletedProcess(
+                action.command, returncode, stdout=text, stderr="" if returncode == 0 else text
+            )
+            action.done.set()
+
+    def stats(self) -> dict:
+        """Retorna contadores do batcher (lotes, ações e média de ações por lote)"""
+        return {
+            "batches": self.batches,
+            "actions": self.actions,
+            "actions_per_batch": self.actions / self.batches if self.batches else 0.0
+        }
@@ -0,0 +1,314 @@
+"""
+Injeção direta de eventos em /dev/input
+O `input tap` inicia um processo Java (app_process) a cada chamada; aqui o touchscreen é
+descoberto uma vez (getevent -p) e os toques são escritos como structs input_event
+pré-codificadas pela sessão shell persistente, com latência de poucos milissegundos
+"""
+import re
+import struct
+import subprocess
+
+# Tipos e códigos de evento (linux/input-event-codes.h)
+EV_SYN = 0x00
+EV_KEY = 0x01
+EV_ABS = 0x03
+SYN_REPORT = 0x00
+BTN_TOUCH = 0x14a
+ABS_MT_SLOT = 0x2f
+ABS_MT_TOUCH_MAJOR = 0x30
+ABS_MT_POSITION_X = 0x35
+ABS_MT_POSITION_Y = 0x36
+ABS_MT_TRACKING_ID = 0x39
+ABS_MT_PRESSURE = 0x3a
+
+# struct input_event: timeval (2 longs) + type (u16) + code (u16) + value (s32)
+EVENT_FORMAT_64 = struct.Struct("<qqHHi")
+EVENT_FORMAT_32 = struct.Struct("<llHHi")
+
+
+class TouchDevice:
+    """Dispositivo de entrada descoberto via `getevent -p` com as faixas dos eixos"""
+
+    __slots__ = ("path", "name", "axes", "keys", "direct")
+
+    def __init__(self, path: str, name: str = ""):
+        self.path = path
+        self.name = name
+        self.axes = {}
+        self.keys = set()
+        self.direct = False
+
+    @property
+    def is_touchscreen(self) -> bool:
+        """True se o dispositivo reporta posição multi-touch (ABS_MT_POSITION_X/Y)"""
+        return ABS_MT_POSITION_X in self.axes and ABS_MT_POSITION_Y in self.axes
+
+    def axis_range(self, code: int) -> tuple:
+        """Retorna (min, max) de um eixo ABS"""
+        return self.axes[code]
+
+    def __repr__(self):
+        return f"TouchDevice({self.path!r}, {self.name!r})"
+
+
+_AXIS_RE = re.compile(r"([0-9a-f]{4})\s*:\s*value\s+-?\d+,\s*min\s+(-?\d+),\s*max\s+(-?\d+)")
+
+
+def parse_getevent(output: str) -> list:
+    """
+    Interpreta a saída de `getevent -p`
+
+    Args:
+        output: Texto retornado por `getevent -p`
+
+    Returns:
+        Lista de TouchDevice (todos os dispositivos, touchscreen ou não)
+    """
+    devices = []
+    device = None
+    section = None
+    for raw_line in output.splitlines():
+        line = raw_line.strip()
+        if line.startswith("add device"):
+            device = TouchDevice(line.split(":", 1)[1].strip())
+            devices.append(device)
+            section = None
+            continue
+        if device is None:
+            continue
+        if line.startswith("name:"):
+            device.name = line.split(":", 1)[1].strip().strip('"')
+        elif line.startswith("KEY ("):
+            section = "key"
+            line = line.split(":", 1)[1]
+        elif line.startswith("ABS ("):
+            section = "abs"
+            line = line.split(":", 1)[1]
+        elif line.startswith(("REL (", "SW (", "LED (", "MSC (", "FF (", "SND (")):
+            section = None
+        elif line.startswith("input props:"):
+            section = "props"
+            continue
+
+        if section == "abs":
+            for code, low, high in _AXIS_RE.findall(line):
+                device.axes[int(code, 16)] = (int(low), int(high))
+        elif section == "key":
+            for code in re.findall(r"\b[0-9a-f]{4}\b", line):
+                device.keys.add(int(code, 16))
+        elif section == "props" and "INPUT_PROP_DIRECT" in line:
+            device.direct = True
+    return devices
+
+
+def find_touchscreen(devices: list) -> TouchDevice:
+    """Escolhe o touchscreen (prefere dispositivos com INPUT_PROP_DIRECT); None se não houver"""
+    candidates = [device for device in devices if device.is_touchscreen]
+    candidates.sort(key=lambda device: not device.direct)
+    return candidates[0] if candidates else None
+
+
+class EventEncoder:
+    """Codifica toques em bytes de input_event (puro Python, testável sem dispositivo)"""
+
+    def __init__(self, device: TouchDevice, screen_width: int, screen_height: int,
+                 rotation: int = 0, arch64: bool = True):
+        """
+        Args:
+            device: Touchscreen com as faixas dos eixos
+            screen_width: Largura natural da tela em pixels (`wm size`, orientação retrato)
+            screen_height: Altura natural da tela em pixels
+            rotation: Rotação atual da tela (0-3, como Surface.ROTATION_*)
+            arch64: True para struct de 24 bytes (userspace 64 bits), False para 16 bytes
+        """
+        self.device = device
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.rotation = rotation
+        self.event = EVENT_FORMAT_64 if arch64 else EVENT_FORMAT_32
+        self.x_min, self.x_max = device.axis_range(ABS_MT_POSITION_X)
+        self.y_min, self.y_max = device.axis_range(ABS_MT_POSITION_Y)
+        self.has_slot = ABS_MT_SLOT in device.axes
+        self.has_pressure = ABS_MT_PRESSURE in device.axes
+        self.has_major = ABS_MT_TOUCH_MAJOR in device.axes
+        self.has_btn_touch = BTN_TOUCH in device.keys
+        self._tracking_id = 0
+        # Escalas pré-calculadas: pixel natural -> unidade do eixo
+        self._sx = (self.x_max - self.x_min) / max(screen_width - 1, 1)
+        self._sy = (self.y_max - self.y_min) / max(screen_height - 1, 1)
+
+    def pack(self, ev_type: int, code: int, value: int) -> bytes:
+        """Codifica um único input_event (timestamp zero: o kernel preenche na escrita)"""
+        return self.event.pack(0, 0, ev_type, code, value)
+
+    def to_axes(self, x: int, y: int) -> tuple:
+        """Converte coordenadas de tela (na rotação atual) para unidades dos eixos do touchscreen"""
+        w, h = self.screen_width, self.screen_height
+        if self.rotation == 1:
+            nx, ny = w - 1 - y, x
+        elif self.rotation == 2:
+            nx, ny = w - 1 - x, h - 1 - y
+        elif self.rotation == 3:
+            nx, ny = y, h - 1 - x
+        else:
+            nx, ny = x, y
+        return round(self.x_min + nx * self._sx), round(self.y_min + ny * self._sy)
+
+    def next_tracking_id(self) -> int:
+        self._tracking_id = (self._tracking_id + 1) & 0xffff
+        return self._tracking_id
+
+    def syn(self) -> bytes:
+        return self.pack(EV_SYN, SYN_REPORT, 0)
+
+    def down(self, x: int, y: int, slot: int = 0, tracking_id: int = None, first: bool = True) -> bytes:
+        """
+        Eventos de um dedo tocando a tela (sem SYN_REPORT)
+
+        Args:
+            x, y: Coordenadas de tela
+            slot: Slot multi-touch (protocolo B)
+            tracking_id: ID de rastreamento (None = próximo ID)
+            first: True se é o primeiro dedo na tela (emite BTN_TOUCH 1)
+        """
+        ax, ay = self.to_axes(x, y)
+        data = b""
+        if self.has_slot:
+            data += self.pack(EV_ABS, ABS_MT_SLOT, slot)
+        data += self.pack(EV_ABS, ABS_MT_TRACKING_ID,
+                          self.next_tracking_id() if tracking_id is None else tracking_id)
+        data += self.pack(EV_ABS, ABS_MT_POSITION_X, ax)
+        data += self.pack(EV_ABS, ABS_MT_POSITION_Y, ay)
+        if self.has_major:
+            data += self.pack(EV_ABS, ABS_MT_TOUCH_MAJOR, 5)
+        if self.has_pressure:
+            data += self.pack(EV_ABS, ABS_MT_PRESSURE, 50)
+        if first and self.has_btn_touch:
+            data += self.pack(EV_KEY, BTN_TOUCH, 1)
+        return data
+
+    def move(self, x: int, y: int, slot: int = 0) -> bytes:
+        """Eventos de um dedo se movendo (sem SYN_REPORT)"""
+        ax, ay = self.to_axes(x, y)
+        data = self.pack(EV_ABS, ABS_MT_SLOT, slot) if self.has_slot else b""
+        return data + self.pack(EV_ABS, ABS_MT_POSITION_X, ax) + self.pack(EV_ABS, ABS_MT_POSITION_Y, ay)
+
+    def up(self, slot: int = 0, last: bool = True) -> bytes:
+        """Eventos de um dedo saindo da tela (sem SYN_REPORT); last=True emite BTN_TOUCH 0"""
+        data = self.pack(EV_ABS, ABS_MT_SLOT, slot) if self.has_slot else b""
+        data += self.pack(EV_ABS, ABS_MT_TRACKING_ID, -1)
+        if last and self.has_btn_touch:
+            data += self.pack(EV_KEY, BTN_TOUCH, 0)
+        return data
+
+    def tap(self, x: int, y: int, hold_ms: int = 40) -> list:
+        """
+        Codifica um toque simples
+
+        Args:
+            hold_ms: Tempo com o dedo na tela; sem ele alguns jogos descartam o toque
+                (o down e o up chegam no mesmo instante)
+
+        Returns:
+            Lista de tuplas (bytes, pausa em segundos após escrever)
+        """
+        return [(self.down(x, y) + self.syn(), hold_ms / 1000), (self.up() + self.syn(), 0.0)]
+
+    def swipe(self, x1: int, y1: int, x2: int, y2: int, duration: int = 300, step_ms: int = 16) -> list:
+        """
+        Codifica um arrasto linear de (x1, y1) até (x2, y2)
+
+        Args:
+            duration: Duração em milissegundos
+            step_ms: Intervalo entre os pontos intermediários
+
+        Returns:
+            Lista de tuplas (bytes, pausa em segundos após escrever)
+        """
+        steps = max(1, duration // step_ms)
+        delay = duration / 1000 / steps
+        frames = [(self.down(x1, y1) + self.syn(), delay)]
+        for i in range(1, steps + 1):
+            t = i / steps
+            x = round(x1 + (x2 - x1) * t)
+            y = round(y1 + (y2 - y1) * t)
+            frames.append((self.move(x, y) + self.syn(), delay if i < steps else 0.0))
+        frames.append((self.up() + self.syn(), 0.0))
+        return frames
+
+
+def printf_escape(data: bytes) -> str:
+    """Escapa bytes como octais para o printf do shell (\\ooo)"""
+    return "".join(f"\\{b:03o}" for b in data)
+
+
+def frames_to_script(frames: list, path: str) -> str:
+    """
+    Transforma os quadros de eventos em uma única linha de script shell
+
+    Cada quadro é escrito por um printf (uma única escrita no dispositivo de eventos),
+    com as pausas feitas no próprio celular
+    """
+    parts = []
+    for data, pause in frames:
+        parts.append(f"printf '{printf_escape(data)}' > {path}")
+        if pause > 0:
+            parts.append(f"sleep {pause:.3f}")
+    return "; ".join(parts)
+
+
+class RawInputInjector:
+    """Backend de injeção que escreve input_event direto no touchscreen do dispositivo"""
+
+    def __init__(self, run_script):
+        """
+        Args:
+            run_script: Função (script, timeout) -> CompletedProcess, ex: SimpleBotADB._run_script
+        """
+        self.run_script = run_script
+        self.device = None
+        self.encoder = None
+
+    def discover(self) -> bool:
+        """
+        Descobre o touchscreen, a resolução, a rotação e a arquitetura (feito uma vez por conexão)
+
+        Returns:
+            True se o touchscreen foi encontrado
+        """
+        result = self.run_script("getevent -p", timeout=10)
+        self.device = find_touchscreen(parse_getevent(result.stdout))
+        if self.device is None:
+            print("✗ Touchscreen não encontrado em getevent -p")
+            return False
+
+        size = self.run_script("wm size", timeout=5).stdout
+        match = re.findall(r"(\d+)x(\d+)", size)
+        if not match:
+            print(f"✗ Não foi possível ler a resolução: {size.strip()}")
+            return False
+        # "Override size" (última linha) prevalece sobre "Physical size"; ambos na orientação natural
+        width, height = (int(v) for v in match[-1])
+
+        rotation_out = self.run_script("dumpsys input | grep -m1 SurfaceOrientation", timeout=5).stdout
+        rotation_match = re.search(r"SurfaceOrientation:\s*(\d)", rotation_out)
+        rotation = int(rotation_match.group(1)) if rotation_match else 0
+
+        abi = self.run_script("getprop ro.product.cpu.abi", timeout=5).stdout
+        self.encoder = EventEncoder(self.device, width, height, rotation, arch64="64" in abi)
+        print(f"✓ Touchscreen {self.device.name} em {self.device.path} "
+              f"(rotação {rotation}, {'64' if '64' in abi else '32'} bits)")
+        return True
+
+    def send_frames(self, frames: list, timeout: float) -> subprocess.CompletedProcess:
+        """Escreve quadros de eventos (bytes, pausa) no touchscreen com um único comando"""
+        return self.run_script(frames_to_script(frames, self.device.path), timeout=timeout)
+
+    def tap(self, x: int, y: int, timeout: float = 5) -> subprocess.CompletedProcess:
+        """Toque simples via eventos brutos"""
+        return self.send_frames(self.encoder.tap(x, y), timeout)
+
+    def swipe(self, x1: int, y1: int, x2: int, y2: int, duration: int = 300,
+              timeout: float = 10) -> subprocess.CompletedProcess:
+        """Arrasto via eventos brutos, com as pausas no dispositivo"""
+        return self.send_frames(self.encoder.swipe(x1, y1, x2, y2, duration), timeout + duration / 1000)
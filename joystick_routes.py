@@ -0,0 +1,101 @@
+"""
+Compilador de rotas do joystick
+Transforma a configuração do joystick em um único script shell executado no dispositivo,
+com as pausas feitas no próprio celular: um ciclo completo de lure custa um único round-trip
+"""
+import hashlib
+import shlex
+
+from compiled_config import as_joystick
+
+ROUTE_PATH = "/data/local/tmp/bot_lure_route.sh"
+
+
+def lure_directions(joystick_config) -> list:
+    """
+    Retorna as direções do quadrado de lure (Joystick compilado ou dicionário da seção joystick)
+
+    Returns:
+        Lista de tuplas (nome, x, y) na ordem frente -> esquerda -> trás -> direita
+    """
+    joystick = as_joystick(joystick_config)
+    return [
+        ("frente", joystick.forward.x, joystick.forward.y),
+        ("esquerda", joystick.left.x, joystick.left.y),
+        ("trás", joystick.backward.x, joystick.backward.y),
+        ("direita", joystick.right.x, joystick.right.y)
+    ]
+
+
+def _route_params(joystick_config) -> tuple:
+    joystick = as_joystick(joystick_config)
+    return (joystick.center_x, joystick.center_y, joystick.step_duration, joystick.step_interval,
+            joystick.steps_per_direction)
+
+
+def compile_lure_route(joystick_config, mode: str = "motionevent") -> str:
+    """
+    Compila o lure com passos intervalados em um script shell
+
+    Args:
+        joystick_config: Joystick compilado ou dicionário da seção joystick (center_x/center_y,
+            direções, step_duration, step_interval, steps_per_direction)
+        mode: "motionevent" (DOWN no centro, MOVE até a direção, sleep, UP) ou
+            "swipe" (um `input swipe` por passo)
+
+    Returns:
+        Conteúdo do script
+    """
+    if mode not in ("motionevent", "swipe"):
+        raise ValueError(f"modo de rota inválido: {mode}")
+
+    center_x, center_y, step_duration, step_interval, steps = _route_params(joystick_config)
+    hold = f"{step_duration / 1000:g}"
+
+    lines = ["#!/system/bin/sh", "# Rota de lure gerada pelo bot - frente, esquerda, trás, direita"]
+    for name, end_x, end_y in lure_directions(joystick_config):
+        lines.append(f"# {name}")
+        for step in range(steps):
+            if mode == "motionevent":
+                lines.append(f"input motionevent DOWN {center_x} {center_y}")
+                lines.append(f"input motionevent MOVE {end_x} {end_y}")
+                lines.append(f"sleep {hold}")
+                lines.append(f"input motionevent UP {end_x} {end_y}")
+            else:
+                lines.append(f"input swipe {center_x} {center_y} {end_x} {end_y} {step_duration}")
+            if step < steps - 1:
+                lines.append(f"sleep {step_interval:g}")
+        lines.append("sleep 0.5")
+    return "\n".join(lines) + "\n"
+
+
+def route_duration(joystick_config) -> float:
+    """Duração nominal de um ciclo da rota em segundos (sem a latência do `input`)"""
+    _, _, step_duration, step_interval, steps = _route_params(joystick_config)
+    per_direction = steps * step_duration / 1000 + max(steps - 1, 0) * step_interval + 0.5
+    return 4 * per_direction
+
+
+def route_digest(script: str) -> str:
+    """Hash curto do script, usado para reenviar a rota só quando ela muda"""
+    return hashlib.sha1(script.encode("utf-8")).hexdigest()[:12]
+
+
+def upload_commands(script: str, path: str = ROUTE_PATH, lines_per_command: int = 40) -> list:
+    """
+    Monta as linhas de comando que gravam o script no dispositivo
+
+    Usa printf com cada linha entre aspas, uma linha de comando por bloco, para funcionar
+    pela sessão persistente e respeitar o limite de tamanho de comando de adbd antigos
+
+    Returns:
+        Lista de comandos a executar em ordem
+    """
+    lines = script.splitlines()
+    commands = []
+    for start in range(0, len(lines), lines_per_command):
+        quoted = " ".join(shlex.quote(line) for line in lines[start:start + lines_per_command])
+        redirect = ">" if start == 0 else ">>"
+        commands.append(f"printf '%s\\n' {quoted} {redirect} {path}")
+    commands.append(f"chmod 755 {path}")
+    return commands
@@ -0,0 +1,204 @@
+"""
+Métricas de latência das ações do bot
+Histogramas com buckets logarítmicos de memória fixa (p50/p95/p99/máximo) e contadores de
+sucesso, falha e timeout por ação, dispositivo e descrição, com snapshot barato e dump periódico
+"""
+import json
+import math
+import threading
+import time
+
+# Faixa coberta pelos buckets (segundos) e buckets por oitava (erro relativo ~4%)
+MIN_LATENCY = 1e-5
+MAX_LATENCY = 300.0
+BUCKETS_PER_OCTAVE = 16
+
+OUTCOMES = ("ok", "failed", "timeout")
+
+
+class Histogram:
+    """Histograma logarítmico de latências com memória fixa"""
+
+    __slots__ = ("counts", "count", "total", "max", "_scale", "_size")
+
+    def __init__(self):
+        self._scale = BUCKETS_PER_OCTAVE / math.log(2)
+        self._size = int(math.log(MAX_LATENCY / MIN_LATENCY) * self._scale) + 2
+        self.counts = [0] * self._size
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        if seconds <= MIN_LATENCY:
+            index = 0
+        else:
+            index = min(int(math.log(seconds / MIN_LATENCY) * self._scale) + 1, self._size - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "Histogram"):
+        """Soma as contagens de outro histograma (ex.: total de todas as séries)"""
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def _upper_bound(self, index: int) -> float:
+        return MIN_LATENCY * math.exp(index / self._scale)
+
+    def quantile(self, q: float) -> float:
+        """Latência (limite superior do bucket, limitado ao máximo visto) do quantil q"""
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return min(self._upper_bound(index), self.max)
+        return self.max
+
+    def buckets(self) -> list:
+        """Buckets não vazios como (limite superior em segundos, contagem acumulada)"""
+        cumulative = 0
+        result = []
+        for index, count in enumerate(self.counts):
+            if count:
+                cumulative += count
+                result.append((self._upper_bound(index), cumulative))
+        return result
+
+
+class Series:
+    """Latências e contadores de uma combinação ação/dispositivo/descrição"""
+
+    __slots__ = ("action", "device", "label", "histogram", "ok", "failed", "timeout")
+
+    def __init__(self, action: str, device: str, label: str):
+        self.action = action
+        self.device = device
+        self.label = label
+        self.histogram = Histogram()
+        self.ok = 0
+        self.failed = 0
+        self.timeout = 0
+
+    def snapshot(self) -> dict:
+        histogram = self.histogram
+        return {
+            "action": self.action,
+            "device": self.device,
+            "label": self.label,
+            "count": histogram.count,
+            "ok": self.ok,
+            "failed": self.failed,
+            "timeout": self.timeout,
+            "mean_ms": histogram.total / histogram.count * 1000 if histogram.count else 0.0,
+            "p50_ms": histogram.quantile(0.50) * 1000,
+            "p95_ms": histogram.quantile(0.95) * 1000,
+            "p99_ms": histogram.quantile(0.99) * 1000,
+            "max_ms": histogram.max * 1000
+        }
+
+
+class MetricsRegistry:
+    """
+    Conjunto de séries de métricas
+
+    Só a criação de uma série nova usa lock; o registro de uma medida são poucas operações
+    sem lock (cada dispositivo executa uma ação por vez, então não há escritores concorrentes
+    na mesma série)
+    """
+
+    def __init__(self):
+        self.series = {}
+        self.counters = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._dump_thread = None
+        self._dump_stop = threading.Event()
+
+    def get(self, action: str, device: str, label: str = "") -> Series:
+        key = (action, device, label)
+        series = self.series.get(key)
+        if series is None:
+            with self._lock:
+                series = self.series.setdefault(key, Series(action, device, label))
+        return series
+
+    def record(self, action: str, device: str, seconds: float, outcome: str = "ok", label: str = ""):
+        """
+        Registra uma execução
+
+        Args:
+            action: Ação (tap, move_joystick, connect...)
+            device: Dispositivo
+            seconds: Latência medida com relógio monotônico
+            outcome: "ok", "failed" ou "timeout"
+            label: Descrição da ação (ex.: "Camera Reset", "Skill 1")
+        """
+        series = self.get(action, device, label or "")
+        series.histogram.record(seconds)
+        if outcome == "ok":
+            series.ok += 1
+        elif outcome == "timeout":
+            series.timeout += 1
+        else:
+            series.failed += 1
+
+    def increment(self, name: str, device: str, amount: int = 1):
+        """Soma `amount` ao contador `name` do dispositivo (ex.: "lure_cycles")"""
+        key = (name, device)
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def snapshot(self) -> list:
+        """Lista de dicionários com contadores e percentis de todas as séries"""
+        return [series.snapshot() for series in list(self.series.values())]
+
+    def print_report(self):
+        """Mostra a tabela de latências"""
+        print("\n⏱️  LATÊNCIA DAS AÇÕES:")
+        for item in sorted(self.snapshot(), key=lambda item: (item["device"], item["action"], item["label"])):
+            label = f" [{item['label']}]" if item["label"] else ""
+            print(f"  {item['device']} {item['action']}{label}: {item['count']}x | "
+                  f"p50 {item['p50_ms']:.1f}ms p95 {item['p95_ms']:.1f}ms p99 {item['p99_ms']:.1f}ms "
+                  f"máx {item['max_ms']:.1f}ms | ✓ {item['ok']} ✗ {item['failed']} ⌛ {item['timeout']}")
+
+    def dump(self, path: str = None):
+        """Grava o snapshot como uma linha JSON em `path` ou mostra a tabela (path None)"""
+        if path is None:
+            self.print_report()
+            return
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"time": time.time(), "series": self.snapshot()}, ensure_ascii=False) + "\n")
+
+    def start_dump(self, interval: float, path: str = None):
+        """Faz dump() a cada `interval` segundos em uma thread em segundo plano"""
+        if self._dump_thread is not None:
+            return
+
+        def loop():
+            while not self._dump_stop.wait(interval):
+                try:
+                    self.dump(path)
+                except OSError as e:
+                    print(f"✗ Erro ao gravar métricas: {e}")
+
+        self._dump_stop.clear()
+        self._dump_thread = threading.Thread(target=loop, daemon=True)
+        self._dump_thread.start()
+
+    def stop_dump(self):
+        if self._dump_thread is not None:
+            self._dump_stop.set()
+            self._dump_thread.join(timeout=2)
+            self._dump_thread = None
+
+
+# Registro padrão compartilhado por todos os bots do processo
+METRICS = MetricsRegistry()
@@ -0,0 +1,190 @@
+"""
+Endpoint HTTP de métricas e saúde
+Expõe em formato texto do Prometheus os contadores e latências do MetricsRegistry, o atraso do
+agendador e o estado de conexão de cada dispositivo (/metrics), além de uma sonda /health.
+O servidor roda em uma thread própria e só lê os registros na hora da coleta: o caminho do
+tap não ganha nenhum lock
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from metrics import METRICS, MetricsRegistry
+
+DEFAULT_PORT = 9108
+PREFIX = "sro_bot"
+
+# Limites (segundos) exportados no histograma; fixos para o histogram_quantile do Prometheus
+EXPORT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _labels(**labels) -> str:
+    """Formata os rótulos {chave="valor"} escapando aspas, barras e quebras de linha"""
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+class MetricsServer:
+    """Servidor HTTP com /metrics (Prometheus) e /health para uma sessão ou uma frota"""
+
+    def __init__(self, registry: MetricsRegistry = None, port: int = DEFAULT_PORT, host: str = "127.0.0.1"):
+        """
+        Args:
+            registry: Registro de métricas (padrão: metrics.METRICS compartilhado)
+            port: Porta HTTP
+            host: Interface de escuta ("0.0.0.0" para coletar de outra máquina)
+        """
+        self.registry = registry or METRICS
+        self.port = port
+        self.host = host
+        self.devices = []
+        self.schedulers = []
+        self.started = time.time()
+        self._httpd = None
+        self._thread = None
+
+    def watch_bot(self, bot, state=None):
+        """
+        Inclui o estado de conexão do bot nas métricas e no /health
+
+        Args:
+            bot: SimpleBotADB
+            state: Função que devolve o estado ("ok", "offline"...); padrão: bot.connected
+        """
+        self.devices.append((bot, state))
+
+    def watch_scheduler(self, scheduler):
+        """Inclui execuções, deadlines perdidos e atraso dos jobs do agendador"""
+        self.schedulers.append(scheduler)
+
+    def _device_states(self) -> dict:
+        states = {}
+        for bot, state in self.devices:
+            states[bot.device_address] = state() if state else ("ok" if bot.connected else "offline")
+        return states
+
+    def render(self) -> str:
+        """Texto no formato de exposição do Prometheus"""
+        lines = [
+            f"# HELP {PREFIX}_uptime_seconds Tempo desde o início da coleta",
+            f"# TYPE {PREFIX}_uptime_seconds gauge",
+            f"{PREFIX}_uptime_seconds {time.time() - self.started:.3f}",
+        ]
+
+        series = list(self.registry.series.values())
+        lines += [f"# HELP {PREFIX}_actions_total Ações executadas por resultado",
+                  f"# TYPE {PREFIX}_actions_total counter"]
+        for item in series:
+            for outcome in ("ok", "failed", "timeout"):
+                labels = _labels(action=item.action, device=item.device, label=item.label, outcome=outcome)
+                lines.append(f"{PREFIX}_actions_total{labels} {getattr(item, outcome)}")
+
+        lines += [f"# HELP {PREFIX}_action_latency_seconds Latência das ações",
+                  f"# TYPE {PREFIX}_action_latency_seconds histogram"]
+        for item in series:
+            histogram = item.histogram
+            buckets = histogram.buckets()
+            count = histogram.count
+            name = f"{PREFIX}_action_latency_seconds"
+            base = dict(action=item.action, device=item.device, label=item.label)
+            index = 0
+            cumulative = 0
+            for bound in EXPORT_BUCKETS:
+                while index < len(buckets) and buckets[index][0] <= bound:
+                    cumulative = buckets[index][1]
+                    index += 1
+                lines.append(f"{name}_bucket{_labels(**base, le=bound)} {cumulative}")
+            lines.append(f"{name}_bucket{_labels(**base, le='+Inf')} {count}")
+            lines.append(f"{name}_sum{_labels(**base)} {histogram.total:.6f}")
+            lines.append(f"{name}_count{_labels(**base)} {count}")
+
+        counters = sorted(self.registry.counters.items())
+        names = sorted({name for (name, _), _ in counters})
+        for name in names:
+            lines += [f"# TYPE {PREFIX}_{name}_total counter"]
+            for (counter, device), value in counters:
+                if counter == name:
+                    lines.append(f"{PREFIX}_{name}_total{_labels(device=device)} {value}")
+
+        if self.schedulers:
+            lines += [f"# HELP {PREFIX}_scheduler_runs_total Execuções de cada job do agendador",
+                      f"# TYPE {PREFIX}_scheduler_runs_total counter"]
+            stats = [job for scheduler in self.schedulers for job in scheduler.stats()]
+            for job in stats:
+                lines.append(f"{PREFIX}_scheduler_runs_total{_labels(job=job['name'])} {job['runs']}")
+            lines += [f"# HELP {PREFIX}_scheduler_missed_total Deadlines perdidos",
+                      f"# TYPE {PREFIX}_scheduler_missed_total counter"]
+            for job in stats:
+                lines.append(f"{PREFIX}_scheduler_missed_total{_labels(job=job['name'])} {job['missed']}")
+            lines += [f"# HELP {PREFIX}_scheduler_lag_seconds Atraso em relação ao deadline",
+                      f"# TYPE {PREFIX}_scheduler_lag_seconds gauge"]
+            for job in stats:
+                lines.append(f"{PREFIX}_scheduler_lag_seconds{_labels(job=job['name'], stat='avg')} "
+                             f"{job['avg_lag']:.6f}")
+                lines.append(f"{PREFIX}_scheduler_lag_seconds{_labels(job=job['name'], stat='max')} "
+                             f"{job['max_lag']:.6f}")
+
+        states = self._device_states()
+        if states:
+            lines += [f"# HELP {PREFIX}_connected Dispositivo conectado (1) ou não (0)",
+                      f"# TYPE {PREFIX}_connected gauge"]
+            for device, state in states.items():
+                lines.append(f"{PREFIX}_connected{_labels(device=device, state=state)} {int(state == 'ok')}")
+        return "\n".join(lines) + "\n"
+
+    def health(self) -> tuple:
+        """
+        Estado da sessão para o /health
+
+        Returns:
+            Tupla (código HTTP, dicionário): 200 com todos os dispositivos "ok", senão 503
+        """
+        states = self._device_states()
+        healthy = all(state == "ok" for state in states.values())
+        return (200 if healthy else 503), {
+            "status": "ok" if healthy else "degraded",
+            "uptime": round(time.time() - self.started, 1),
+            "devices": states
+        }
+
+    def start(self):
+        """Sobe o servidor HTTP em uma thread daemon"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/metrics":
+                    status, body, content_type = 200, server.render(), "text/plain; version=0.0.4; charset=utf-8"
+                elif path == "/health":
+                    status, data = server.health()
+                    body, content_type = json.dumps(data, ensure_ascii=False), "application/json"
+                else:
+                    status, body, content_type = 404, "not found\n", "text/plain"
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"✓ Métricas em http://{self.host}:{self._httpd.server_address[1]}/metrics (saúde em /health)")
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+            self._thread = None
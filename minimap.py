@@ -0,0 +1,130 @@
+"""
+Análise do minimapa
+Recorta o minimapa, gera as máscaras de mobs (pontos vermelhos) e do jogador (seta amarela)
+com limiares HSV vetorizados e agrupa os pixels por componentes conexos, devolvendo as
+posições dos mobs relativas ao jogador
+"""
+import math
+import os
+import time
+
+import cv2
+import numpy as np
+
+from screen_capture import DEFAULT_ROIS
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Faixas HSV do OpenCV (H 0-179); o vermelho dá a volta no H e usa duas faixas
+MOB_RANGES = [((0, 120, 90), (8, 255, 255)), ((170, 120, 90), (179, 255, 255))]
+PLAYER_RANGES = [((20, 150, 180), (35, 255, 255))]
+
+def color_mask(hsv: np.ndarray, ranges: list) -> np.ndarray:
+    """Máscara uint8 (0/255) dos pixels dentro de qualquer uma das faixas HSV"""
+    mask = cv2.inRange(hsv, ranges[0][0], ranges[0][1])
+    for low, high in ranges[1:]:
+        mask |= cv2.inRange(hsv, low, high)
+    return mask
+
+
+class Blip:
+    """Um mob (ou grupo de mobs sobrepostos) no minimapa"""
+
+    __slots__ = ("x", "y", "dx", "dy", "area", "count")
+
+    def __init__(self, x: float, y: float, dx: float, dy: float, area: int, count: int):
+        self.x = x
+        self.y = y
+        self.dx = dx
+        self.dy = dy
+        self.area = area
+        self.count = count
+
+    @property
+    def distance(self) -> float:
+        """Distância até o jogador em pixels do minimapa"""
+        return math.hypot(self.dx, self.dy)
+
+    @property
+    def bearing(self) -> float:
+        """Direção a partir do jogador em graus (0 = para cima, sentido horário)"""
+        return math.degrees(math.atan2(self.dx, -self.dy)) % 360
+
+    def __repr__(self):
+        return f"Blip(dx={self.dx:.0f}, dy={self.dy:.0f}, count={self.count})"
+
+
+class MinimapAnalyzer:
+    """Detecta mobs e o jogador em recortes do minimapa RGB/RGBA"""
+
+    def __init__(self, roi: tuple = None, min_area: int = 8, dot_area: int = 40):
+        """
+        Args:
+            roi: Região (x, y, largura, altura) do minimapa no quadro (padrão: DEFAULT_ROIS["minimap"])
+            min_area: Área mínima em pixels de um componente (descarta ruído e bordas)
+            dot_area: Área típica de um ponto de mob, usada para estimar mobs sobrepostos
+        """
+        self.roi = tuple(roi or DEFAULT_ROIS["minimap"])
+        self.min_area = min_area
+        self.dot_area = dot_area
+        self.player = None
+
+    def _components(self, mask: np.ndarray) -> list:
+        """Componentes conexos da máscara: lista de (cx, cy, área) acima da área mínima"""
+        count, _, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        keep = np.flatnonzero(stats[1:, cv2.CC_STAT_AREA] >= self.min_area) + 1
+        return [(float(centroids[i, 0]), float(centroids[i, 1]), int(stats[i, cv2.CC_STAT_AREA]))
+                for i in keep]
+
+    def analyze(self, minimap: np.ndarray) -> list:
+        """
+        Analisa um recorte do minimapa
+
+        Args:
+            minimap: Recorte RGB ou RGBA (altura, largura, canais)
+
+        Returns:
+            Lista de Blip ordenada pela distância até o jogador. A posição do jogador fica em
+            self.player (centro do recorte quando a seta não é encontrada)
+        """
+        code = cv2.COLOR_RGBA2RGB if minimap.shape[2] == 4 else None
+        rgb = cv2.cvtColor(minimap, code) if code is not None else minimap
+        hsv = cv2.cvtColor(rgb, cv2.COLOR_RGB2HSV)
+
+        players = self._components(color_mask(hsv, PLAYER_RANGES))
+        if players:
+            px, py, _ = max(players, key=lambda component: component[2])
+        else:
+            px, py = minimap.shape[1] / 2, minimap.shape[0] / 2
+        self.player = (px, py)
+
+        blips = [
+            Blip(x, y, x - px, y - py, area, max(1, round(area / self.dot_area)))
+            for x, y, area in self._components(color_mask(hsv, MOB_RANGES))
+        ]
+        blips.sort(key=lambda blip: blip.dx * blip.dx + blip.dy * blip.dy)
+        return blips
+
+    def analyze_frame(self, frame: np.ndarray) -> list:
+        """Recorta o minimapa do quadro inteiro (view, sem cópia) e analisa"""
+        x, y, w, h = self.roi
+        return self.analyze(frame[y:y + h, x:x + w])
+
+
+def load_rgb(path: str) -> np.ndarray:
+    """Carrega uma imagem do disco em RGB"""
+    image = cv2.imread(path, cv2.IMREAD_COLOR)
+    if image is None:
+        raise FileNotFoundError(path)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+if __name__ == "__main__":
+    analyzer = MinimapAnalyzer()
+    minimap = load_rgb(os.path.join(BASE_DIR, "mini_map.png"))
+    total = 2000
+    start = time.perf_counter()
+    for _ in range(total):
+        analyzer.analyze(minimap)
+    elapsed = time.perf_counter() - start
+    print(f"✓ {total / elapsed:.0f} minimapas/s ({elapsed / total * 1e6:.0f} µs cada)")
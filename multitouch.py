@@ -0,0 +1,169 @@
+"""
+Gestos multi-touch simultâneos
+Mantém um dedo segurando o joystick enquanto outros dedos tocam nas skills, tudo em um único
+fluxo de eventos multi-ponteiro (protocolo B, um slot por dedo) gerado com o EventEncoder
+"""
+from input_events import ABS_MT_SLOT, EventEncoder
+
+
+class Pointer:
+    """Um dedo na tela: slot multi-touch, tracking id e posição atual"""
+
+    __slots__ = ("slot", "tracking_id", "x", "y")
+
+    def __init__(self, slot: int, tracking_id: int, x: int, y: int):
+        self.slot = slot
+        self.tracking_id = tracking_id
+        self.x = x
+        self.y = y
+
+
+class GestureBuilder:
+    """Monta uma linha do tempo de eventos com vários dedos e a converte em quadros de input_event"""
+
+    def __init__(self, encoder: EventEncoder, max_slots: int = None):
+        """
+        Args:
+            encoder: Encoder do touchscreen (faixas dos eixos, rotação e formato do struct)
+            max_slots: Quantidade de slots do touchscreen (padrão: faixa de ABS_MT_SLOT ou 10)
+        """
+        self.encoder = encoder
+        if max_slots is None:
+            slot_range = encoder.device.axes.get(ABS_MT_SLOT)
+            max_slots = slot_range[1] + 1 if slot_range else 10
+        self.max_slots = max_slots
+        self.pointers = {}
+        self._timeline = []
+        self._order = 0
+
+    def _free_slot(self) -> int:
+        for slot in range(self.max_slots):
+            if slot not in self.pointers:
+                return slot
+        raise RuntimeError("todos os slots multi-touch estão em uso")
+
+    def _add(self, at_ms: float, data: bytes):
+        self._order += 1
+        self._timeline.append((at_ms, self._order, data))
+
+    def down(self, at_ms: float, x: int, y: int) -> int:
+        """
+        Coloca um dedo na tela
+
+        Returns:
+            Slot do dedo (use em move/up)
+        """
+        slot = self._free_slot()
+        first = not self.pointers
+        tracking_id = self.encoder.next_tracking_id()
+        self.pointers[slot] = Pointer(slot, tracking_id, x, y)
+        self._add(at_ms, self.encoder.down(x, y, slot=slot, tracking_id=tracking_id, first=first))
+        return slot
+
+    def move(self, at_ms: float, slot: int, x: int, y: int):
+        """Move um dedo que está na tela"""
+        pointer = self.pointers[slot]
+        pointer.x, pointer.y = x, y
+        self._add(at_ms, self.encoder.move(x, y, slot=slot))
+
+    def up(self, at_ms: float, slot: int):
+        """Tira um dedo da tela (BTN_TOUCH 0 só quando for o último)"""
+        del self.pointers[slot]
+        self._add(at_ms, self.encoder.up(slot=slot, last=not self.pointers))
+
+    def drag(self, start_ms: float, slot: int, x: int, y: int, duration_ms: float, step_ms: float = 16):
+        """Arrasta um dedo da posição atual até (x, y) em duration_ms"""
+        pointer = self.pointers[slot]
+        x0, y0 = pointer.x, pointer.y
+        steps = max(1, int(duration_ms // step_ms))
+        for i in range(1, steps + 1):
+            t = i / steps
+            self.move(start_ms + duration_ms * t, slot, round(x0 + (x - x0) * t), round(y0 + (y - y0) * t))
+
+    def tap(self, at_ms: float, x: int, y: int, hold_ms: float = 40):
+        """Toque rápido com um dedo extra (não interfere nos dedos já na tela)"""
+        slot = self.down(at_ms, x, y)
+        self.up(at_ms + hold_ms, slot)
+
+    def frames(self) -> list:
+        """
+        Converte a linha do tempo em quadros
+
+        Eventos no mesmo instante são agrupados em um único SYN_REPORT; a ordem de
+        inserção é preservada para eventos simultâneos.
+
+        Returns:
+            Lista de tuplas (bytes, pausa em segundos até o próximo quadro), como EventEncoder.swipe
+        """
+        timeline = sorted(self._timeline)
+        frames = []
+        i = 0
+        while i < len(timeline):
+            at_ms = timeline[i][0]
+            data = b""
+            while i < len(timeline) and timeline[i][0] == at_ms:
+                data += timeline[i][2]
+                i += 1
+            next_ms = timeline[i][0] if i < len(timeline) else at_ms
+            frames.append((data + self.encoder.syn(), (next_ms - at_ms) / 1000))
+        return frames
+
+
+def move_and_cast(encoder: EventEncoder, center_x: int, center_y: int, end_x: int, end_y: int,
+                  duration: int, taps: list, ramp_ms: int = 80, hold_ms: int = 40) -> list:
+    """
+    Segura o joystick na direção (end_x, end_y) por `duration` ms enquanto toca nas skills
+
+    Args:
+        encoder: Encoder do touchscreen
+        center_x, center_y: Centro do joystick
+        end_x, end_y: Posição do joystick para a direção desejada
+        duration: Tempo total segurando o joystick em milissegundos
+        taps: Lista de tuplas (x, y, instante em ms) com os toques nas skills
+        ramp_ms: Tempo para levar o joystick do centro até a direção
+        hold_ms: Tempo de cada toque nas skills
+
+    Returns:
+        Quadros de eventos prontos para input_events.frames_to_script
+    """
+    gesture = GestureBuilder(encoder)
+    joystick = gesture.down(0, center_x, center_y)
+    gesture.drag(0, joystick, end_x, end_y, min(ramp_ms, duration))
+    # Os toques ocupam outros slots enquanto o dedo do joystick continua pressionado
+    for x, y, at_ms in sorted(taps, key=lambda tap: tap[2]):
+        # schedule_taps já deixa para a próxima janela os toques que não terminariam antes de
+        # soltar o joystick; aqui só protege listas montadas à mão
+        if at_ms + hold_ms < duration:
+            gesture.tap(max(at_ms, 1), x, y, hold_ms)
+    gesture.up(duration, joystick)
+    return gesture.frames()
+
+
+def schedule_taps(clicks, duration: int, offset_ms: float = 0.0, start_index: int = 0,
+                  hold_ms: float = 40) -> tuple:
+    """
+    Distribui a sequência clicks[] (com seus intervalos) dentro de uma janela de movimento
+
+    Args:
+        clicks: Cliques compilados (Click com x, y, interval)
+        duration: Duração da janela em milissegundos
+        offset_ms: Instante do próximo clique dentro da janela (continuação da janela anterior)
+        start_index: Índice do próximo clique da sequência
+        hold_ms: Duração de cada toque (mesmo valor passado ao move_and_cast); um toque que não
+            terminaria antes do fim da janela fica para o início da próxima
+
+    Returns:
+        Tupla (toques [(x, y, ms)], offset para a próxima janela, índice do próximo clique)
+    """
+    taps = []
+    at_ms = offset_ms
+    index = start_index
+    if not clicks:
+        return taps, 0.0, 0
+    while at_ms + hold_ms < duration:
+        click = clicks[index % len(clicks)]
+        taps.append((click.x, click.y, at_ms))
+        # Intervalo mínimo de 50ms para o toque anterior terminar
+        at_ms += max(click.interval, 0.05) * 1000
+        index += 1
+    return taps, max(at_ms - duration, 0.0), index % len(clicks)
@@ -0,0 +1,226 @@
+"""
+Agendador de ações por deadline
+Um único heap com deadlines absolutos (time.monotonic) substitui as threads com
+time.sleep(interval), que acumulavam atraso a cada comando e disputavam o dispositivo
+"""
+import heapq
+import itertools
+import threading
+import time
+
+# Prioridades padrão: maior valor executa primeiro quando os deadlines coincidem
+PRIORITY_POTION = 40
+PRIORITY_CAMERA_RESET = 30
+PRIORITY_LURE = 20
+PRIORITY_SKILLS = 10
+
+
+class Job:
+    """Ação periódica (ou sequência de ações) registrada no agendador"""
+
+    __slots__ = ("name", "steps", "priority", "index", "deadline",
+                 "runs", "missed", "max_lag", "total_lag", "active")
+
+    def __init__(self, name: str, steps: list, priority: int = 0):
+        """
+        Args:
+            name: Nome exibido nos relatórios
+            steps: Lista de tuplas (ação, intervalo); a próxima etapa roda `intervalo`
+                segundos após o deadline da etapa atual
+            priority: Prioridade em empates de deadline (maior executa primeiro)
+        """
+        self.name = name
+        self.steps = steps
+        self.priority = priority
+        self.index = 0
+        self.deadline = 0.0
+        self.runs = 0
+        self.missed = 0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.active = True
+
+
+def run_in_order(actions: list):
+    """Executa as ações em sequência; um erro não impede as seguintes e sobe no fim"""
+    error = None
+    for action in actions:
+        try:
+            action()
+        except Exception as e:
+            if error is None:
+                error = e
+    if error is not None:
+        raise error
+
+
+class Scheduler:
+    """Executa jobs em uma única thread respeitando deadlines absolutos e prioridades"""
+
+    def __init__(self, tolerance: float = 0.05, group_window: float = 0.0, dispatch=None):
+        """
+        Args:
+            tolerance: Atraso máximo em segundos antes de uma execução contar como deadline perdido
+            group_window: Jobs que vencem até `group_window` segundos à frente entram na mesma
+                passada (adiantados), para saírem juntos no mesmo envio
+            dispatch: Função que recebe a lista de ações vencidas na passada e as executa
+                (padrão: uma após a outra nesta thread)
+        """
+        self.tolerance = tolerance
+        self.group_window = group_window
+        self.dispatch = dispatch or run_in_order
+        self.jobs = []
+        self._heap = []
+        self._seq = itertools.count()
+
+    def add_job(self, name: str, action, interval: float, priority: int = 0, start_delay: float = 0.0) -> Job:
+        """
+        Registra uma ação periódica
+
+        Args:
+            name: Nome do job
+            action: Função sem argumentos executada a cada período
+            interval: Período em segundos
+            priority: Prioridade em empates de deadline
+            start_delay: Atraso da primeira execução em segundos
+
+        Returns:
+            Job registrado
+        """
+        return self.add_sequence(name, [(action, interval)], priority, start_delay)
+
+    def add_sequence(self, name: str, steps: list, priority: int = 0, start_delay: float = 0.0) -> Job:
+        """
+        Registra uma sequência cíclica de ações, cada uma com o seu intervalo (ex: clicks[])
+
+        Args:
+            name: Nome do job
+            steps: Lista de tuplas (ação, intervalo após a ação)
+            priority: Prioridade em empates de deadline
+            start_delay: Atraso da primeira execução em segundos
+
+        Returns:
+            Job registrado
+        """
+        if not steps:
+            raise ValueError(f"job '{name}' sem etapas")
+        job = Job(name, steps, priority)
+        job.deadline = time.monotonic() + start_delay
+        self.jobs.append(job)
+        self._push(job)
+        return job
+
+    def remove_job(self, job: Job):
+        """Desativa um job (a entrada no heap é descartada quando chegar a vez dela)"""
+        job.active = False
+        if job in self.jobs:
+            self.jobs.remove(job)
+
+    def group(self, window: float, dispatch):
+        """
+        Agrupa os jobs que vencem juntos (ver group_window e dispatch no construtor)
+
+        Args:
+            window: Antecedência máxima em segundos para um job entrar na passada atual
+            dispatch: Função que executa a lista de ações da passada (ex: SimpleBotADB.run_together)
+        """
+        self.group_window = window
+        self.dispatch = dispatch
+
+    def _push(self, job: Job):
+        heapq.heappush(self._heap, (job.deadline, -job.priority, next(self._seq), job))
+
+    def run_pending(self) -> float:
+        """
+        Executa uma vez cada job vencido, por deadline e prioridade, e volta para o loop
+
+        Um job mais lento que o próprio intervalo continua vencido ao terminar; ele só roda
+        de novo na próxima passada, então run() sempre volta a conferir o stop_event
+
+        Returns:
+            Segundos até o próximo deadline (0 se já há jobs vencidos; None se não houver jobs)
+        """
+        now = time.monotonic()
+        horizon = now + self.group_window
+        due = []
+        while self._heap:
+            deadline, _, _, job = self._heap[0]
+            if not job.active:
+                heapq.heappop(self._heap)
+                continue
+            if deadline > horizon:
+                break
+            heapq.heappop(self._heap)
+            due.append((deadline, job))
+        if not due:
+            return self._heap[0][0] - now if self._heap else None
+
+        actions = []
+        for deadline, job in due:
+            lag = max(0.0, now - deadline)
+            job.total_lag += lag
+            if lag > job.max_lag:
+                job.max_lag = lag
+            if lag > self.tolerance:
+                job.missed += 1
+            actions.append(job.steps[job.index][0])
+
+        try:
+            self.dispatch(actions)
+        finally:
+            finished = time.monotonic()
+            for deadline, job in due:
+                interval = job.steps[job.index][1]
+                job.runs += 1
+                job.index = (job.index + 1) % len(job.steps)
+                # Próximo deadline é absoluto: a latência do comando não se acumula no período
+                job.deadline = deadline + interval
+                if job.deadline < finished:
+                    # Atrasado mais de um período: realinha em vez de disparar uma rajada
+                    job.deadline = finished + interval
+                if job.active:
+                    self._push(job)
+
+        while self._heap and not self._heap[0][3].active:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - time.monotonic())
+
+    def run(self, stop_event: threading.Event = None):
+        """
+        Executa o loop do agendador até stop_event ser sinalizado
+
+        Args:
+            stop_event: Evento de parada (None = roda até KeyboardInterrupt)
+        """
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            wait = self.run_pending()
+            if wait is None:
+                wait = 0.5
+            # Acorda no deadline ou na parada (limitado para enxergar jobs novos)
+            if stop_event.wait(min(wait, 0.5)):
+                break
+
+    def stats(self) -> list:
+        """Retorna uma lista de dicionários com execuções, deadlines perdidos e atraso por job"""
+        return [
+            {
+                "name": job.name,
+                "priority": job.priority,
+                "runs": job.runs,
+                "missed": job.missed,
+                "avg_lag": job.total_lag / job.runs if job.runs else 0.0,
+                "max_lag": job.max_lag
+            }
+            for job in self.jobs
+        ]
+
+    def print_report(self):
+        """Mostra o resumo de pontualidade de cada job"""
+        print("\n⏱️  Pontualidade do agendador:")
+        for stat in self.stats():
+            print(f"   {stat['name']}: {stat['runs']} execuções | "
+                  f"{stat['missed']} deadlines perdidos | "
+                  f"atraso médio {stat['avg_lag'] * 1000:.1f}ms | máx {stat['max_lag'] * 1000:.1f}ms")
@@ -0,0 +1,163 @@
+"""
+Captura de tela em formato bruto
+Lê o `screencap` sem PNG via exec-out (ou socket do servidor adb) direto para um buffer
+pré-alocado e reutilizado; os quadros são views NumPy sobre esse buffer, sem cópia por quadro
+"""
+import collections
+import struct
+import subprocess
+import time
+
+import numpy as np
+
+# Formatos de pixel do screencap (android.graphics.PixelFormat) -> bytes por pixel
+PIXEL_FORMATS = {1: 4, 2: 4, 3: 3, 4: 2, 5: 4}
+
+# Regiões padrão (x, y, largura, altura) para tela 1920x1080 - ajuste em bot_config.json -> vision.rois
+DEFAULT_ROIS = {
+    "hp": (20, 20, 240, 40),
+    "xp": (0, 1060, 1920, 20),
+    "minimap": (1700, 20, 200, 200)
+}
+
+
+class ScreenCapture:
+    """Captura quadros brutos do dispositivo como arrays NumPy (altura, largura, 4) em RGBA"""
+
+    def __init__(self, device_address: str, client=None, rois: dict = None, fps_window: int = 30):
+        """
+        Args:
+            device_address: Serial/endereço do dispositivo
+            client: AdbClient para capturar via socket (None = `adb exec-out screencap`)
+            rois: Regiões nomeadas {"nome": (x, y, largura, altura)} (padrão: DEFAULT_ROIS)
+            fps_window: Quantidade de quadros usada no cálculo de FPS
+        """
+        self.device_address = device_address
+        self.client = client
+        self.rois = {name: tuple(roi) for name, roi in (rois or DEFAULT_ROIS).items()}
+        self.width = None
+        self.height = None
+        self.pixel_format = None
+        self.header_size = None
+        self.frames = 0
+        self._buffer = None
+        self._view = None
+        self._frame = None
+        self._times = collections.deque(maxlen=fps_window)
+
+    def _open_stream(self):
+        """Abre o stream do screencap bruto; retorna (objeto com readinto, função de fechamento)"""
+        if self.client is not None:
+            sock = self.client.open_service(self.device_address, "exec:screencap", timeout=10)
+            return sock, sock.close
+        process = subprocess.Popen(
+            ["adb", "-s", self.device_address, "exec-out", "screencap"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0
+        )
+
+        def close():
+            process.stdout.close()
+            process.wait(timeout=5)
+        return process.stdout, close
+
+    @staticmethod
+    def _readinto(stream, view: memoryview) -> int:
+        """Preenche a view com o stream; retorna os bytes lidos (menos que o tamanho = fim do stream)"""
+        readinto = getattr(stream, "recv_into", None) or stream.readinto
+        total = 0
+        while total < len(view):
+            count = readinto(view[total:])
+            if not count:
+                break
+            total += count
+        return total
+
+    def _first_capture(self, stream) -> np.ndarray:
+        """Primeiro quadro: lê tudo, interpreta o cabeçalho uma vez e aloca o buffer definitivo"""
+        chunks = []
+        chunk = bytearray(1 << 20)
+        view = memoryview(chunk)
+        while True:
+            count = self._readinto(stream, view)
+            chunks.append(bytes(view[:count]))
+            if count < len(view):
+                break
+        data = b"".join(chunks)
+        if len(data) < 12:
+            raise ValueError("resposta do screencap vazia")
+
+        self.width, self.height, self.pixel_format = struct.unpack_from("<III", data)
+        bpp = PIXEL_FORMATS.get(self.pixel_format, 4)
+        # Android 9+ acrescenta o colorspace ao cabeçalho (16 bytes em vez de 12)
+        self.header_size = len(data) - self.width * self.height * bpp
+        if self.header_size not in (12, 16):
+            raise ValueError(f"cabeçalho do screencap inesperado ({self.header_size} bytes)")
+
+        self._buffer = bytearray(data)
+        self._view = memoryview(self._buffer)
+        self._frame = np.frombuffer(
+            self._buffer, dtype=np.uint8, count=self.width * self.height * bpp, offset=self.header_size
+        ).reshape(self.height, self.width, bpp)
+        print(f"✓ Captura bruta {self.width}x{self.height} (formato {self.pixel_format}, "
+              f"cabeçalho {self.header_size} bytes)")
+        return self._frame
+
+    def capture(self) -> np.ndarray:
+        """
+        Captura um quadro
+
+        Returns:
+            View NumPy (altura, largura, bytes por pixel) sobre o buffer interno. O conteúdo é
+            sobrescrito na próxima captura: use .copy() para guardar o quadro
+        """
+        stream, close = self._open_stream()
+        try:
+            if self._buffer is None:
+                frame = self._first_capture(stream)
+            else:
+                count = self._readinto(stream, self._view)
+                extra = self._readinto(stream, memoryview(bytearray(1))) if count == len(self._view) else 0
+                if count != len(self._view) or extra:
+                    # Resolução/rotação mudou: reinterpreta o cabeçalho no próximo quadro
+                    self._buffer = None
+                    raise ValueError(f"tamanho do quadro mudou ({count + extra} de {len(self._view)} bytes)")
+                frame = self._frame
+        finally:
+            close()
+
+        self.frames += 1
+        self._times.append(time.monotonic())
+        return frame
+
+    def roi(self, name: str, frame: np.ndarray = None) -> np.ndarray:
+        """Retorna a view (sem cópia) de uma região nomeada do quadro atual ou do quadro informado"""
+        x, y, w, h = self.rois[name]
+        frame = self._frame if frame is None else frame
+        return frame[y:y + h, x:x + w]
+
+    def capture_rois(self, names: list = None) -> dict:
+        """Captura um quadro e retorna apenas as views das regiões pedidas (padrão: todas)"""
+        frame = self.capture()
+        return {name: self.roi(name, frame) for name in (names or self.rois)}
+
+    @property
+    def fps(self) -> float:
+        """Quadros por segundo na janela recente"""
+        if len(self._times) < 2:
+            return 0.0
+        return (len(self._times) - 1) / max(self._times[-1] - self._times[0], 1e-9)
+
+
+if __name__ == "__main__":
+    import sys
+    from simple_bot import load_config
+
+    config = load_config()
+    capture = ScreenCapture(config.get("device"), rois=config.get("vision", {}).get("rois"))
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"📷 Capturando {total} quadros...")
+    for _ in range(total):
+        capture.capture()
+    print(f"✓ {capture.fps:.1f} FPS ({capture.width}x{capture.height})")
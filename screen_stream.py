@@ -0,0 +1,251 @@
+"""
+Captura contínua via screenrecord (H.264)
+Mantém um `screenrecord --output-format=h264 -` rodando, decodifica no host com ffmpeg em
+uma thread e guarda os quadros em um ring buffer NumPy limitado: quem consome sempre recebe
+o quadro mais recente e quadros antigos são descartados. Funciona offline com um arquivo .h264
+"""
+import collections
+import shutil
+import subprocess
+import threading
+import time
+
+import numpy as np
+
+# Limite do screenrecord no Android (segundos); o stream é reiniciado ao terminar
+SCREENRECORD_TIME_LIMIT = 180
+
+
+class ScreenStream:
+    """Stream de quadros decodificados (altura, largura, 3) em RGB com ring buffer"""
+
+    def __init__(self, width: int, height: int, source_factory, slots: int = 4,
+                 restart: bool = True, fps_window: int = 30):
+        """
+        Prefira os construtores from_device() e from_file()
+
+        Args:
+            width, height: Tamanho dos quadros decodificados (o mesmo passado ao --size)
+            source_factory: Função sem argumentos que abre o stream H.264; retorna
+                (objeto com read(), função de fechamento)
+            slots: Quadros mantidos no ring buffer
+            restart: Reabre a fonte quando ela termina (limite de 3 minutos do screenrecord)
+            fps_window: Quantidade de quadros usada no cálculo de FPS
+        """
+        if shutil.which("ffmpeg") is None:
+            raise RuntimeError("ffmpeg não encontrado - instale com: sudo apt install ffmpeg")
+        self.width = width
+        self.height = height
+        self.source_factory = source_factory
+        self.restart = restart
+        self.frame_size = width * height * 3
+        self.decoded = 0
+        self.dropped = 0
+        self._ring = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(slots)]
+        self._latest = -1
+        self._served = -1
+        self._cond = threading.Condition()
+        self._running = False
+        self._threads = []
+        self._decoder = None
+        self._times = collections.deque(maxlen=fps_window)
+
+    @classmethod
+    def from_device(cls, device_address: str, width: int = 960, height: int = 540,
+                    bit_rate: int = 4_000_000, client=None, **kwargs) -> "ScreenStream":
+        """
+        Stream ao vivo do dispositivo
+
+        Args:
+            device_address: Serial/endereço do dispositivo
+            width, height: Resolução do screenrecord (menor = mais FPS)
+            bit_rate: Taxa de bits do encoder do dispositivo
+            client: AdbClient para abrir o stream via socket (None = `adb exec-out`)
+        """
+        command = (f"screenrecord --output-format=h264 --size {width}x{height} "
+                   f"--bit-rate {bit_rate} --time-limit {SCREENRECORD_TIME_LIMIT} -")
+
+        def open_source():
+            if client is not None:
+                sock = client.open_service(device_address, f"exec:{command}")
+                stream = sock.makefile("rb")
+
+                def close():
+                    stream.close()
+                    sock.close()
+                return stream, close
+            process = subprocess.Popen(
+                ["adb", "-s", device_address, "exec-out", *command.split()],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+
+            def close():
+                process.kill()
+                process.wait()
+            return process.stdout, close
+
+        return cls(width, height, open_source, **kwargs)
+
+    @classmethod
+    def from_file(cls, path: str, width: int, height: int, **kwargs) -> "ScreenStream":
+        """Stream offline a partir de uma gravação .h264 (mesmo pipeline do modo ao vivo)"""
+        def open_source():
+            stream = open(path, "rb")
+            return stream, stream.close
+        kwargs.setdefault("restart", False)
+        return cls(width, height, open_source, **kwargs)
+
+    def start(self):
+        """Inicia as threads de alimentação e decodificação"""
+        self._running = True
+        thread = threading.Thread(target=self._run, daemon=True)
+        thread.start()
+        self._threads = [thread]
+        return self
+
+    def stop(self):
+        """Para o stream"""
+        self._running = False
+        decoder = self._decoder
+        if decoder is not None and decoder.poll() is None:
+            decoder.kill()
+        with self._cond:
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=2)
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def _run(self):
+        while self._running:
+            self._decode_once()
+            if not self.restart:
+                break
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+    def _decode_once(self):
+        """Decodifica uma sessão da fonte até ela terminar"""
+        try:
+            source, close_source = self.source_factory()
+        except Exception as e:
+            print(f"✗ Erro ao abrir o stream H.264: {e}")
+            time.sleep(1)
+            return
+
+        # Sonda mínima em vez de -fflags nobuffer: o nobuffer descarta os quadros lidos na
+        # análise do stream e nada é decodificado até o próximo quadro-chave
+        self._decoder = subprocess.Popen(
+            ["ffmpeg", "-loglevel", "error", "-probesize", "32", "-analyzeduration", "0",
+             "-flags", "low_delay", "-f", "h264", "-i", "pipe:0",
+             "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{self.width}x{self.height}", "pipe:1"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0
+        )
+        feeder = threading.Thread(target=self._feed, args=(source, self._decoder.stdin), daemon=True)
+        feeder.start()
+        try:
+            self._read_frames(self._decoder.stdout)
+        finally:
+            close_source()
+            if self._decoder.poll() is None:
+                self._decoder.kill()
+            self._decoder.wait()
+            feeder.join(timeout=2)
+
+    def _feed(self, source, sink):
+        """Copia o H.264 da fonte para o stdin do ffmpeg"""
+        try:
+            while self._running:
+                chunk = source.read(65536)
+                if not chunk:
+                    break
+                sink.write(chunk)
+        except (OSError, ValueError):
+            pass
+        finally:
+            try:
+                sink.close()
+            except OSError:
+                pass
+
+    def _read_frames(self, stdout):
+        """Lê quadros do ffmpeg direto para os slots do ring buffer"""
+        slot = 0
+        while self._running:
+            view = memoryview(self._ring[slot]).cast("B")
+            total = 0
+            while total < self.frame_size:
+                count = stdout.readinto(view[total:])
+                if not count:
+                    return
+                total += count
+
+            with self._cond:
+                # Quadro anterior nunca entregue: foi substituído por um mais novo
+                if self._latest >= 0 and self._served != self._latest:
+                    self.dropped += 1
+                self._latest = slot
+                self.decoded += 1
+                self._times.append(time.monotonic())
+                self._cond.notify_all()
+            slot = (slot + 1) % len(self._ring)
+
+    def latest(self, timeout: float = 1.0, wait_new: bool = True) -> np.ndarray:
+        """
+        Retorna o quadro mais recente
+
+        Args:
+            timeout: Tempo máximo de espera em segundos
+            wait_new: Espera um quadro ainda não entregue (False = devolve o último mesmo repetido)
+
+        Returns:
+            View do slot do ring buffer (válida até o ring dar a volta: use .copy() para guardar),
+            ou None se nenhum quadro chegou no tempo
+        """
+        with self._cond:
+            ready = lambda: self._latest >= 0 and (not wait_new or self._served != self._latest)
+            if not self._cond.wait_for(lambda: ready() or not self._running, timeout) or not ready():
+                return None
+            self._served = self._latest
+            return self._ring[self._latest]
+
+    def frames(self, timeout: float = 1.0):
+        """Itera sobre os quadros mais recentes até o stream terminar"""
+        while True:
+            frame = self.latest(timeout)
+            if frame is None:
+                if not self._running:
+                    return
+                continue
+            yield frame
+
+    @property
+    def fps(self) -> float:
+        """Quadros decodificados por segundo na janela recente"""
+        if len(self._times) < 2:
+            return 0.0
+        return (len(self._times) - 1) / max(self._times[-1] - self._times[0], 1e-9)
+
+    def stats(self) -> dict:
+        """Retorna quadros decodificados, descartados e FPS"""
+        return {"decoded": self.decoded, "dropped": self.dropped, "fps": self.fps}
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 4:
+        print("Uso: python3 screen_stream.py <gravacao.h264> <largura> <altura>")
+        sys.exit(1)
+    stream = ScreenStream.from_file(sys.argv[1], int(sys.argv[2]), int(sys.argv[3])).start()
+    consumed = sum(1 for _ in stream.frames())
+    stats = stream.stats()
+    print(f"✓ {stats['decoded']} quadros decodificados ({stats['fps']:.1f} FPS) | "
+          f"{consumed} consumidos | {stats['dropped']} descartados")
@@ -7,26 +7,173 @@ import time
 import sys
 import json
 import os
+import shlex
 import threading
 
+from adb_session import AdbShellSession
+from adb_client import AdbClient, AdbProtocolError
+from input_batch import InputBatcher
+from input_events import RawInputInjector
+from multitouch import move_and_cast, schedule_taps
+from joystick_routes import (ROUTE_PATH, compile_lure_route, lure_directions, route_digest,
+                             route_duration, upload_commands)
+from scheduler import Scheduler, PRIORITY_SKILLS
+from coordinates import detect_transform, parse_reference, to_profile
+from compiled_config import (CompiledConfig, ConfigWatcher, Joystick, as_joystick, compile_config,
+                             default_joystick)
+from metrics import METRICS, MetricsRegistry
+from metrics_server import MetricsServer
+
 # Constante com endereço padrão do dispositivo
 DEFAULT_DEVICE_ADDRESS = "1170496755"
 
 class SimpleBotADB:
     """Bot simples para interação com dispositivo Android via ADB"""
     
-    def __init__(self, device_address: str = DEFAULT_DEVICE_ADDRESS):
+    def __init__(self, device_address: str = DEFAULT_DEVICE_ADDRESS, backend: str = "subprocess",
+                 batch_window: float = None, client: AdbClient = None, injection: str = "input",
+                 screen=None, metrics: MetricsRegistry = None):
         """
         Inicializa o bot com endereço do dispositivo
         
         Args:
             device_address: Endereço IP:porta do dispositivo (padrão: DEFAULT_DEVICE_ADDRESS)
+            backend: Como os comandos shell são enviados ao dispositivo:
+                "subprocess" (um processo adb por comando),
+                "session" (uma sessão adb shell persistente) ou
+                "socket" (protocolo ADB direto com o servidor na porta 5037, sem o binário adb)
+            batch_window: Janela em segundos para agrupar ações simultâneas em um único
+                envio ao dispositivo (None = sem agrupamento)
+            client: Cliente adb compartilhado para o backend "socket" (ex: vários bots na frota)
+            injection: Como taps e swipes chegam à tela: "input" (comandos input tap/swipe) ou
+                "raw" (eventos escritos direto em /dev/input, bem mais rápido; use com backend
+                "session" ou "socket")
+            screen: Tela de referência das coordenadas ({"width", "height"} ou "normalized");
+                None = coordenadas já em pixels do dispositivo
+            metrics: Registro das latências das ações (padrão: metrics.METRICS compartilhado)
         """
         self.device_address = device_address
         self.connected = False
+        self.backend = backend
+        self.session = None
+        self.client = (client or AdbClient()) if backend == "socket" else None
+        self.batch_window = batch_window
+        self.batcher = None
+        self.uploaded_route = None
+        self.injection = injection
+        self.injector = None
+        self.reference = parse_reference(screen)
+        self.transform = None
+        self.metrics = metrics or METRICS
+        
+    def _shell(self, *args: str, timeout: float = 5) -> subprocess.CompletedProcess:
+        """
+        Executa um comando shell no dispositivo usando o backend configurado
+        
+        Args:
+            args: Comando e argumentos (ex: "input", "tap", "100", "200")
+            timeout: Tempo máximo de espera em segundos
+            
+        Returns:
+            CompletedProcess com returncode, stdout e stderr
+        """
+        return self._submit_script(shlex.join(args), timeout)
+    
+    def _submit_script(self, script: str, timeout: float = 5) -> subprocess.CompletedProcess:
+        """Envia um script pelo batcher (se ativo) ou direto ao dispositivo"""
+        if self.batcher is not None:
+            return self.batcher.submit(script, timeout=timeout)
+        return self._run_script(script, timeout)
+    
+    def run_together(self, actions: list):
+        """
+        Executa ações do mesmo instante ao mesmo tempo; com o batcher ativo elas saem em um único envio
+        
+        Args:
+            actions: Funções sem argumentos (ex: camera reset, lure e skill vencidos juntos no agendador)
+        """
+        if self.batcher is None or len(actions) == 1:
+            for action in actions:
+                action()
+            return
+        
+        errors = []
+        
+        def run(action):
+            try:
+                action()
+            except Exception as e:
+                errors.append(e)
+        
+        self.batcher.expect(len(actions))
+        threads = [threading.Thread(target=run, args=(action,), daemon=True) for action in actions[1:]]
+        for thread in threads:
+            thread.start()
+        run(actions[0])
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+    
+    def _run_script(self, script: str, timeout: float = 5) -> subprocess.CompletedProcess:
+        """Executa uma linha de script shell no dispositivo (sessão persistente ou processo adb)"""
+        if self.session is not None:
+            return self.session.run(script, timeout=timeout)
+        
+        return subprocess.run(
+            ["adb", "-s", self.device_address, "shell", script],
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+    
+    def _open_session(self):
+        """Abre a sessão persistente e o batcher de entrada conforme a configuração"""
+        if self.backend in ("session", "socket") and self.session is None:
+            if self.client is not None:
+                self.session = self.client.session(self.device_address)
+            else:
+                self.session = AdbShellSession(self.device_address)
+            if self.session.start():
+                print("✓ Sessão ADB persistente iniciada")
+            else:
+                print("⚠ Sessão persistente indisponível - usando um processo por comando")
+                self.session = None
+        
+        if self.batch_window and self.batcher is None:
+            self.batcher = InputBatcher(self._run_script, window=self.batch_window)
+            self.batcher.start()
+            print(f"✓ Agrupamento de ações ativo (janela de {self.batch_window * 1000:.0f}ms)")
+        
+        if self.injection == "raw" and self.injector is None:
+            injector = RawInputInjector(self._submit_script)
+            try:
+                if injector.discover():
+                    self.injector = injector
+            except Exception as e:
+                print(f"✗ Erro ao descobrir o touchscreen: {e}")
+            if self.injector is None:
+                print("⚠ Injeção direta indisponível - usando input tap/swipe")
+        
+        if self.reference is not None and self.transform is None:
+            try:
+                self.transform = detect_transform(self._run_script, self.device_address, self.reference)
+                print(f"✓ Coordenadas convertidas para {self.transform.width}x{self.transform.height}")
+            except Exception as e:
+                print(f"✗ Erro ao ler o tamanho da tela: {e}")
         
     def check_adb(self) -> bool:
         """Verifica se ADB está instalado"""
+        if self.client is not None:
+            try:
+                self.client.version()
+                print(f"✓ Servidor ADB encontrado em {self.client.host}:{self.client.port}")
+                return True
+            except (OSError, AdbProtocolError, ValueError):
+                print(f"✗ Servidor ADB não encontrado em {self.client.host}:{self.client.port}")
+                print("   Inicie com: adb start-server")
+                return False
+        
         try:
             result = subprocess.run(
                 ["adb", "version"],
@@ -45,6 +192,9 @@ class SimpleBotADB:
     def get_connected_devices(self) -> list:
         """Retorna lista de dispositivos conectados via ADB"""
         try:
+            if self.client is not None:
+                return [serial for serial, state in self.client.devices() if state == "device"]
+            
             result = subprocess.run(
                 ["adb", "devices"],
                 capture_output=True,
@@ -66,6 +216,10 @@ class SimpleBotADB:
     
     def connect(self) -> bool:
         """Conecta ao dispositivo via ADB (WiFi ou USB)"""
+        start = time.perf_counter()
+        outcome = "failed"
+        # Após reconectar (ou reiniciar o celular) a rota em /data/local/tmp pode não existir mais
+        self.uploaded_route = None
         try:
             # Verifica se já existe um dispositivo conectado
             connected_devices = self.get_connected_devices()
@@ -74,23 +228,30 @@ class SimpleBotADB:
             if self.device_address in connected_devices:
                 print(f"✓ Dispositivo {self.device_address} já conectado via USB")
                 self.connected = True
+                self._open_session()
+                outcome = "ok"
                 return True
             
             # Se tem ":" no endereço, é WiFi (IP:porta)
             if ":" in self.device_address:
-                result = subprocess.run(
-                    ["adb", "connect", self.device_address],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
+                if self.client is not None:
+                    output = self.client.connect(self.device_address)
+                else:
+                    output = subprocess.run(
+                        ["adb", "connect", self.device_address],
+                        capture_output=True,
+                        text=True,
+                        timeout=10
+                    ).stdout
                 
-                if "connected" in result.stdout.lower() or "already connected" in result.stdout.lower():
+                if "connected" in output.lower() or "already connected" in output.lower():
                     print(f"✓ Conectado a {self.device_address} via WiFi")
                     self.connected = True
+                    self._open_session()
+                    outcome = "ok"
                     return True
                 else:
-                    print(f"✗ Falha ao conectar via WiFi: {result.stdout}")
+                    print(f"✗ Falha ao conectar via WiFi: {output}")
                     return False
             else:
                 # É um ID de dispositivo, mas não está conectado
@@ -98,38 +259,67 @@ class SimpleBotADB:
                 print(f"   Dispositivos disponíveis: {connected_devices}")
                 return False
                 
+        except subprocess.TimeoutExpired:
+            outcome = "timeout"
+            print(f"✗ Tempo esgotado ao conectar em {self.device_address}")
+            return False
         except Exception as e:
             print(f"✗ Erro na conexão: {e}")
             return False
+        finally:
+            self.metrics.record("connect", self.device_address, time.perf_counter() - start, outcome)
     
     def disconnect(self) -> bool:
         """Desconecta do dispositivo"""
+        start = time.perf_counter()
+        outcome = "failed"
         try:
+            if self.batcher is not None:
+                self.batcher.stop()
+                self.batcher = None
+            
+            self.injector = None
+            self.uploaded_route = None
+            if self.session is not None:
+                self.session.close()
+                self.session = None
+            
             # Se for WiFi (tem ":"), desconecta. Se for USB, apenas marca como desconectado
             if ":" in self.device_address:
-                result = subprocess.run(
-                    ["adb", "disconnect", self.device_address],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
+                if self.client is not None:
+                    self.client.disconnect(self.device_address)
+                else:
+                    subprocess.run(
+                        ["adb", "disconnect", self.device_address],
+                        capture_output=True,
+                        text=True,
+                        timeout=5
+                    )
                 print("✓ Desconectado do WiFi")
             else:
                 print("✓ Sessão encerrada (dispositivo USB permanece conectado)")
             
             self.connected = False
+            outcome = "ok"
             return True
+        except subprocess.TimeoutExpired:
+            outcome = "timeout"
+            print(f"✗ Tempo esgotado ao desconectar de {self.device_address}")
+            return False
         except Exception as e:
             print(f"✗ Erro ao desconectar: {e}")
             return False
+        finally:
+            self.metrics.record("disconnect", self.device_address, time.perf_counter() - start, outcome)
     
-    def tap(self, x: int, y: int) -> bool:
+    def tap(self, x: int, y: int, label: str = "") -> bool:
         """
         Realiza um clique em coordenadas específicas
         
         Args:
             x: Coordenada X
             y: Coordenada Y
+            label: Descrição da ação nas métricas (ex: "Camera Reset", "Skill 1")
             
         Returns:
             True se o clique foi executado com sucesso
@@ -137,24 +327,33 @@ class SimpleBotADB:
         if not self.connected:
             print("✗ Dispositivo não conectado")
             return False
-            
+        
+        start = time.perf_counter()
+        outcome = "failed"
         try:
-            result = subprocess.run(
-                ["adb", "-s", self.device_address, "shell", "input", "tap", str(x), str(y)],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            if self.transform is not None:
+                x, y = self.transform.map(x, y)
+            if self.injector is not None:
+                result = self.injector.tap(x, y, timeout=5)
+            else:
+                result = self._shell("input", "tap", str(x), str(y), timeout=5)
             
             if result.returncode == 0:
+                outcome = "ok"
                 return True
             else:
                 print(f"✗ Erro ao clicar: {result.stderr}")
                 return False
                 
+        except subprocess.TimeoutExpired:
+            outcome = "timeout"
+            print(f"✗ Tempo esgotado ao clicar em ({x}, {y})")
+            return False
         except Exception as e:
             print(f"✗ Erro ao executar clique: {e}")
             return False
+        finally:
+            self.metrics.record("tap", self.device_address, time.perf_counter() - start, outcome, label)
     
     def click_loop(self, x: int, y: int, interval: float = 1.0, max_clicks: int = None):
         """
@@ -241,12 +440,7 @@ class SimpleBotADB:
             return False
         
         try:
-            result = subprocess.run(
-                ["adb", "-s", self.device_address, "shell", "settings", "put", "system", "pointer_location", "1"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            result = self._shell("settings", "put", "system", "pointer_location", "1", timeout=5)
             
             if result.returncode == 0:
                 print("✓ Pointer Location ATIVADO - coordenadas visíveis na tela")
@@ -271,12 +465,7 @@ class SimpleBotADB:
             return False
         
         try:
-            result = subprocess.run(
-                ["adb", "-s", self.device_address, "shell", "settings", "put", "system", "pointer_location", "0"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            result = self._shell("settings", "put", "system", "pointer_location", "0", timeout=5)
             
             if result.returncode == 0:
                 print("✓ Pointer Location DESATIVADO")
@@ -289,7 +478,8 @@ class SimpleBotADB:
             print(f"✗ Erro ao desativar pointer_location: {e}")
             return False
     
-    def move_joystick(self, start_x: int, start_y: int, end_x: int, end_y: int, duration: int = 4000, direction: str = "") -> bool:
+    def move_joystick(self, start_x: int, start_y: int, end_x: int, end_y: int, duration: int = 4000, direction: str = "",
+                      label: str = "") -> bool:
         """
         Move o joystick de uma posição para outra
         
@@ -300,6 +490,7 @@ class SimpleBotADB:
             end_y: Coordenada Y final do joystick
             duration: Duração do movimento em milissegundos (padrão: 4000ms = 4s)
             direction: Nome da direção para exibição (opcional)
+            label: Descrição da ação nas métricas (ex: "frente")
             
         Returns:
             True se o movimento foi executado com sucesso
@@ -308,27 +499,38 @@ class SimpleBotADB:
             print("✗ Dispositivo não conectado")
             return False
         
+        start = time.perf_counter()
+        outcome = "failed"
         try:
             direction_text = f" ({direction})" if direction else ""
             print(f"🕹️  Movendo joystick{direction_text} por {duration/1000}s...")
-            result = subprocess.run(
-                ["adb", "-s", self.device_address, "shell", "input", "swipe", 
-                 str(start_x), str(start_y), str(end_x), str(end_y), str(duration)],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            if self.transform is not None:
+                start_x, start_y = self.transform.map(start_x, start_y)
+                end_x, end_y = self.transform.map(end_x, end_y)
+            if self.injector is not None:
+                result = self.injector.swipe(start_x, start_y, end_x, end_y, duration, timeout=10)
+            else:
+                result = self._shell("input", "swipe", str(start_x), str(start_y),
+                                     str(end_x), str(end_y), str(duration), timeout=10)
             
             if result.returncode == 0:
                 print(f"✓ Joystick movido com sucesso")
+                outcome = "ok"
                 return True
             else:
                 print(f"✗ Erro ao mover joystick: {result.stderr}")
                 return False
                 
+        except subprocess.TimeoutExpired:
+            outcome = "timeout"
+            print("✗ Tempo esgotado ao mover joystick")
+            return False
         except Exception as e:
             print(f"✗ Erro ao executar movimento: {e}")
             return False
+        finally:
+            self.metrics.record("move_joystick", self.device_address, time.perf_counter() - start,
+                                outcome, label)
     
     def move_joystick_forward(self, start_x: int, start_y: int, end_x: int = None, end_y: int = None, duration: int = 4000) -> bool:
         """
@@ -356,12 +558,12 @@ class SimpleBotADB:
         
         return self.move_joystick(start_x, start_y, end_x, end_y, duration, "frente")
     
-    def lure_with_joystick(self, joystick_config: dict, duration: int = 4000, interval: float = 0.5) -> bool:
+    def lure_with_joystick(self, joystick_config, duration: int = 4000, interval: float = 0.5) -> bool:
         """
         Executa sequência de movimentos para Lure: frente -> esquerda -> trás -> direita
         
         Args:
-            joystick_config: Dicionário com configurações do joystick
+            joystick_config: Joystick compilado ou dicionário da seção joystick
             duration: Duração de cada movimento em milissegundos (padrão: 4000ms = 4s)
             interval: Intervalo entre movimentos em segundos (padrão: 0.5s)
             
@@ -372,14 +574,12 @@ class SimpleBotADB:
             print("✗ Dispositivo não conectado")
             return False
         
-        center_x = joystick_config.get('center_x', 248)
-        center_y = joystick_config.get('center_y', 789)
-        duration = joystick_config.get('duration', duration)  # Usa do config ou mantém padrão
-        
-        forward = joystick_config.get('forward', {})
-        left = joystick_config.get('left', {})
-        backward = joystick_config.get('backward', {})
-        right = joystick_config.get('right', {})
+        if not isinstance(joystick_config, Joystick):
+            # Dicionário: usa a duração do config ou mantém o argumento
+            joystick_config = {"duration": duration, **(joystick_config or {})}
+        joystick = as_joystick(joystick_config)
+        center_x, center_y = joystick.center_x, joystick.center_y
+        duration = joystick.duration
         
         print("\n🎯 Iniciando sequência Lure com Joystick...")
         print(f"   Duração de cada movimento: {duration/1000}s\n")
@@ -387,22 +587,22 @@ class SimpleBotADB:
         success = True
         
         # 1. Mover para frente
-        if not self.move_joystick(center_x, center_y, forward.get('x', 246), forward.get('y', 697), duration, "frente"):
+        if not self.move_joystick(center_x, center_y, *joystick.forward, duration, "frente"):
             success = False
         time.sleep(interval)
         
         # 2. Mover para esquerda
-        if not self.move_joystick(center_x, center_y, left.get('x', 334), left.get('y', 787), duration, "esquerda"):
+        if not self.move_joystick(center_x, center_y, *joystick.left, duration, "esquerda"):
             success = False
         time.sleep(interval)
         
         # 3. Mover para trás
-        if not self.move_joystick(center_x, center_y, backward.get('x', 243), backward.get('y', 869), duration, "trás"):
+        if not self.move_joystick(center_x, center_y, *joystick.backward, duration, "trás"):
             success = False
         time.sleep(interval)
         
         # 4. Mover para direita
-        if not self.move_joystick(center_x, center_y, right.get('x', 162), right.get('y', 787), duration, "direita"):
+        if not self.move_joystick(center_x, center_y, *joystick.right, duration, "direita"):
             success = False
         
         if success:
@@ -412,13 +612,14 @@ class SimpleBotADB:
         
         return success
     
-    def lure_with_joystick_steps(self, joystick_config: dict, step_duration: int = 500, step_interval: float = 0.3, steps_per_direction: int = 8) -> bool:
+    def lure_with_joystick_steps(self, joystick_config, step_duration: int = 500, step_interval: float = 0.3, steps_per_direction: int = 8) -> bool:
         """
         Executa sequência de movimentos para Lure com passos intervalados: frente -> esquerda -> trás -> direita
         Cria efeito de caminhada com pausas entre os passos
         
         Args:
-            joystick_config: Dicionário com configurações do joystick
+            joystick_config: Joystick compilado ou dicionário da seção joystick (os valores do
+                joystick têm prioridade sobre os argumentos)
             step_duration: Duração de cada passo em milissegundos (padrão: 500ms)
             step_interval: Intervalo entre passos em segundos (padrão: 0.3s)
             steps_per_direction: Quantidade de passos por direção (padrão: 8)
@@ -430,34 +631,25 @@ class SimpleBotADB:
             print("✗ Dispositivo não conectado")
             return False
         
-        center_x = joystick_config.get('center_x', 248)
-        center_y = joystick_config.get('center_y', 789)
-        
-        # Lê configurações do JSON ou usa padrões
-        step_duration = joystick_config.get('step_duration', step_duration)
-        step_interval = joystick_config.get('step_interval', step_interval)
-        steps_per_direction = joystick_config.get('steps_per_direction', steps_per_direction)
-        
-        forward = joystick_config.get('forward', {})
-        left = joystick_config.get('left', {})
-        backward = joystick_config.get('backward', {})
-        right = joystick_config.get('right', {})
+        if not isinstance(joystick_config, Joystick):
+            # Dicionário: campos ausentes usam os argumentos
+            joystick_config = {"step_duration": step_duration, "step_interval": step_interval,
+                               "steps_per_direction": steps_per_direction, **(joystick_config or {})}
+        joystick = as_joystick(joystick_config)
+        center_x, center_y = joystick.center_x, joystick.center_y
+        step_duration = joystick.step_duration
+        step_interval = joystick.step_interval
+        steps_per_direction = joystick.steps_per_direction
         
         print("\n🎯 Iniciando sequência Lure com passos intervalados...")
         print(f"   Duração do passo: {step_duration}ms | Intervalo: {step_interval}s | Passos/direção: {steps_per_direction}\n")
         
         success = True
-        directions = [
-            ("frente", forward.get('x', 246), forward.get('y', 697)),
-            ("esquerda", left.get('x', 334), left.get('y', 787)),
-            ("trás", backward.get('x', 243), backward.get('y', 869)),
-            ("direita", right.get('x', 162), right.get('y', 787))
-        ]
-        
-        for direction_name, end_x, end_y in directions:
+        for direction_name, end_x, end_y in lure_directions(joystick):
             print(f"➜ Caminhando para {direction_name}...")
             for step in range(steps_per_direction):
-                if not self.move_joystick(center_x, center_y, end_x, end_y, step_duration, f"{direction_name} (passo {step+1}/{steps_per_direction})"):
+                if not self.move_joystick(center_x, center_y, end_x, end_y, step_duration, f"{direction_name} (passo {step+1}/{steps_per_direction})",
+                                          label=direction_name):
                     success = False
                 if step < steps_per_direction - 1:  # Não espera após o último passo
                     time.sleep(step_interval)
@@ -470,6 +662,183 @@ class SimpleBotADB:
         
         return success
 
+    
+    def lure_with_joystick_script(self, joystick_config, mode: str = "motionevent") -> bool:
+        """
+        Executa o lure com passos intervalados como um único script no dispositivo
+        
+        A rota é compilada a partir do joystick_config e enviada uma vez (reenviada só se
+        a configuração mudar); cada ciclo custa um único comando e as pausas entre os
+        passos acontecem no próprio celular, sem jitter do host.
+        
+        Args:
+            joystick_config: Joystick compilado ou dicionário da seção joystick
+            mode: "motionevent" (DOWN/MOVE/UP com sleep no dispositivo) ou "swipe"
+            
+        Returns:
+            True se o ciclo foi executado com sucesso
+        """
+        if not self.connected:
+            print("✗ Dispositivo não conectado")
+            return False
+        
+        try:
+            joystick = as_joystick(joystick_config)
+            if self.transform is not None:
+                joystick = self.transform.map_joystick(joystick)
+            script = compile_lure_route(joystick, mode)
+            digest = route_digest(script)
+            if self.uploaded_route != digest:
+                for command in upload_commands(script):
+                    result = self._run_script(command, timeout=10)
+                    if result.returncode != 0:
+                        print(f"✗ Erro ao enviar rota: {result.stderr}")
+                        return False
+                self.uploaded_route = digest
+                print(f"✓ Rota de lure enviada para {ROUTE_PATH} ({mode})")
+            
+            duration = route_duration(joystick)
+            print(f"\n🎯 Executando rota de lure no dispositivo (~{duration:.1f}s)...")
+            # Margem para o tempo de inicialização de cada `input` no dispositivo
+            result = self._run_script(f"sh {ROUTE_PATH}", timeout=duration * 3 + 10)
+            
+            if result.returncode == 0:
+                print("✓ Sequência Lure com passos completada!")
+                return True
+            else:
+                print(f"✗ Erro na rota de lure: {result.stderr}")
+                return False
+                
+        except Exception as e:
+            print(f"✗ Erro ao executar rota de lure: {e}")
+            return False
+
+    
+    def lure_with_joystick_casting(self, joystick_config, clicks) -> bool:
+        """
+        Lure com joystick segurado continuamente em cada direção enquanto usa as skills
+        
+        Um dedo fica no joystick (centro -> direção) e outros dedos tocam nas skills de
+        clicks[] nos seus intervalos, no mesmo fluxo multi-touch. Movimento e combate não
+        esperam um pelo outro. Requer injection "raw".
+        
+        Args:
+            joystick_config: Joystick compilado ou dicionário da seção joystick
+            clicks: Cliques compilados (compile_config(...).clicks)
+            
+        Returns:
+            True se todos os movimentos foram executados com sucesso
+        """
+        if not self.connected:
+            print("✗ Dispositivo não conectado")
+            return False
+        
+        if self.injector is None:
+            print("⚠ Multi-touch requer injection \"raw\" - usando passos intervalados")
+            return self.lure_with_joystick_steps(joystick_config)
+        
+        joystick = as_joystick(joystick_config)
+        if self.transform is not None:
+            joystick = self.transform.map_joystick(joystick)
+            clicks = self.transform.map_clicks(clicks)
+        center_x, center_y = joystick.center_x, joystick.center_y
+        step_duration = joystick.step_duration
+        step_interval = joystick.step_interval
+        steps_per_direction = joystick.steps_per_direction
+        # Mesmo tempo total de caminhada por direção, agora sem soltar o joystick
+        hold = int(steps_per_direction * step_duration + (steps_per_direction - 1) * step_interval * 1000)
+        
+        print("\n🎯 Iniciando Lure com joystick + skills simultâneos...")
+        print(f"   {hold / 1000:.1f}s por direção | {len(clicks)} skills em paralelo\n")
+        
+        success = True
+        offset, index = 0.0, 0
+        for direction_name, end_x, end_y in lure_directions(joystick):
+            taps, offset, index = schedule_taps(clicks, hold, offset, index)
+            frames = move_and_cast(self.injector.encoder, center_x, center_y, end_x, end_y, hold, taps)
+            try:
+                result = self.injector.send_frames(frames, timeout=10 + hold / 1000)
+                if result.returncode == 0:
+                    print(f"➜ {direction_name}: {len(taps)} skills durante o movimento")
+                else:
+                    print(f"✗ Erro no movimento para {direction_name}: {result.stderr}")
+                    success = False
+            except Exception as e:
+                print(f"✗ Erro ao executar movimento para {direction_name}: {e}")
+                success = False
+        
+        if success:
+            print("\n✓ Sequência Lure com skills completada!")
+        else:
+            print("\n⚠ Sequência Lure com skills completada com alguns erros")
+        
+        return success
+
+
+    def lure_with_joystick_steering(self, joystick_config, steering, capture, analyzer) -> bool:
+        """
+        Lure guiado pelo minimapa: cada passo anda na direção dos mobs
+        
+        Antes de cada passo captura a tela, localiza os mobs no minimapa e converte a direção
+        do alvo nos vetores calibrados do joystick. Sem mobs visíveis o passo segue o quadrado
+        frente -> esquerda -> trás -> direita; com o jogador sobre o alvo o passo é pulado.
+        
+        Args:
+            joystick_config: Joystick compilado ou dicionário da seção joystick
+            steering: MobSteering que escolhe o alvo
+            capture: ScreenCapture usada para ler o minimapa
+            analyzer: MinimapAnalyzer
+        
+        Returns:
+            True se todos os movimentos foram executados com sucesso
+        """
+        if not self.connected:
+            print("✗ Dispositivo não conectado")
+            return False
+        
+        joystick = as_joystick(joystick_config)
+        center_x, center_y = joystick.center_x, joystick.center_y
+        step_duration = joystick.step_duration
+        step_interval = joystick.step_interval
+        steps_per_direction = joystick.steps_per_direction
+        directions = lure_directions(joystick)
+        
+        print(f"\n🎯 Iniciando Lure guiado pelo minimapa ({steering.mode})...")
+        
+        success = True
+        total_steps = steps_per_direction * len(directions)
+        for step in range(total_steps):
+            try:
+                blips = analyzer.analyze_frame(capture.capture())
+            except Exception as e:
+                print(f"⚠ Erro ao ler o minimapa: {e}")
+                blips = []
+            plan = steering.plan(blips)
+            
+            if plan is not None:
+                end_x, end_y, bearing, count = plan
+                label = f"{count} mobs a {bearing:.0f}°"
+            elif blips:
+                print("  ⚔️  Sobre o grupo de mobs - aguardando")
+                time.sleep(step_duration / 1000)
+                continue
+            else:
+                name, end_x, end_y = directions[step // steps_per_direction]
+                label = f"{name} (sem mobs)"
+            
+            if not self.move_joystick(center_x, center_y, end_x, end_y, step_duration,
+                                      f"{label} - passo {step+1}/{total_steps}", label="steering"):
+                success = False
+            if step < total_steps - 1:
+                time.sleep(step_interval)
+        
+        if success:
+            print("\n✓ Sequência Lure guiada completada!")
+        else:
+            print("\n⚠ Sequência Lure guiada completada com alguns erros")
+        
+        return success
+
 
 def load_config(config_file: str = "bot_config.json") -> dict:
     """
@@ -543,12 +912,24 @@ def calibration_mode(bot: SimpleBotADB, config: dict):
     print("\n" + "="*60)
     print("🎯 MODO DE CALIBRAÇÃO - Captura de Coordenadas")
     print("="*60)
+    # O Pointer Location mostra pixels do dispositivo; com o perfil "screen" o arquivo guarda
+    # coordenadas do perfil, então cada ponto digitado é convertido antes de salvar
+    if bot.reference is not None and bot.transform is None:
+        print("✗ Perfil \"screen\" ativo, mas a resolução do dispositivo não foi lida")
+        print("   Conecte ao dispositivo antes de calibrar")
+        return
+
+    def profile(x, y):
+        return to_profile(bot.transform, bot.reference, x, y)
+
     print("\n📋 Instruções:")
     print("   1. Ative o Pointer Location no menu principal (opção 2)")
     print("   2. Toque na tela onde deseja capturar as coordenadas")
     print("   3. Observe as coordenadas no topo da tela")
     print("   4. Digite as coordenadas aqui quando solicitado")
     print("   5. As configurações serão salvas automaticamente\n")
+    if bot.reference is not None:
+        print("   As coordenadas digitadas (pixels do dispositivo) são convertidas para o perfil \"screen\"\n")
     
     print("🔧 O que deseja calibrar?")
     print("1 - Camera Reset")
@@ -556,7 +937,8 @@ def calibration_mode(bot: SimpleBotADB, config: dict):
     print("3 - Joystick (centro e direções)")
     print("4 - Adicionar novo clique na sequência")
     print("5 - Limpar todos os cliques da sequência")
-    print("6 - Voltar")
+    print("6 - Calibração automática (print da tela)")
+    print("7 - Voltar")
     
     try:
         opcao = input("\nEscolha: ").strip()
@@ -567,6 +949,7 @@ def calibration_mode(bot: SimpleBotADB, config: dict):
             x = int(input("   Coordenada X: ").strip())
             y = int(input("   Coordenada Y: ").strip())
             interval = float(input("   Intervalo em segundos [padrão: 8.0]: ").strip() or "8.0")
+            x, y = profile(x, y)
             
             config['camera_reset'] = {
                 "enabled": True,
@@ -585,6 +968,7 @@ def calibration_mode(bot: SimpleBotADB, config: dict):
             y = int(input("   Coordenada Y: ").strip())
             interval = float(input("   Intervalo em segundos [padrão: 3.0]: ").strip() or "3.0")
             enabled = input("   Habilitar agora? (s/n) [padrão: n]: ").strip().lower() == 's'
+            x, y = profile(x, y)
             
             config['lure'] = {
                 "enabled": enabled,
@@ -616,6 +1000,12 @@ def calibration_mode(bot: SimpleBotADB, config: dict):
             
             right_x = int(input("   Direita X: ").strip())
             right_y = int(input("   Direita Y: ").strip())
+
+            center_x, center_y = profile(center_x, center_y)
+            forward_x, forward_y = profile(forward_x, forward_y)
+            backward_x, backward_y = profile(backward_x, backward_y)
+            left_x, left_y = profile(left_x, left_y)
+            right_x, right_y = profile(right_x, right_y)
             
             config['joystick'] = {
                 "center_x": center_x,
@@ -641,6 +1031,7 @@ def calibration_mode(bot: SimpleBotADB, config: dict):
             y = int(input("   Coordenada Y: ").strip())
             interval = float(input("   Intervalo após este clique em segundos [padrão: 2.0]: ").strip() or "2.0")
             description = input("   Descrição (ex: Skill 1): ").strip() or "Sem descrição"
+            x, y = profile(x, y)
             
             if 'clicks' not in config:
                 config['clicks'] = []
@@ -665,6 +1056,11 @@ def calibration_mode(bot: SimpleBotADB, config: dict):
                 print("✗ Operação cancelada")
                 
         elif opcao == "6":
+            # Visão só é carregada aqui (requer numpy/opencv)
+            from auto_calibration import auto_calibrate
+            auto_calibrate(config, bot.device_address, client=bot.client)
+            
+        elif opcao == "7":
             return
         else:
             print("✗ Opção inválida!")
@@ -675,19 +1071,85 @@ def calibration_mode(bot: SimpleBotADB, config: dict):
         print("\n\n✗ Calibração cancelada")
 
 
+def schedule_bot_actions(bot: SimpleBotADB, scheduler: Scheduler, settings: CompiledConfig, counts: dict) -> list:
+    """
+    Registra no agendador as ações da opção 1: camera reset, lure e a sequência de cliques
+    
+    Args:
+        bot: Bot conectado
+        scheduler: Agendador que executará as ações
+        settings: Configuração compilada (compile_config)
+        counts: Contadores {"clicks", "camera", "lure"} atualizados a cada ação bem-sucedida
+    
+    Returns:
+        Jobs registrados (para remover ao recarregar a configuração)
+    """
+    jobs = []
+    camera = settings.camera_reset
+    lure = settings.lure
+    
+    if bot.batcher is not None:
+        # Ações que vencem dentro da janela saem juntas em um único envio ao dispositivo
+        scheduler.group(bot.batch_window, bot.run_together)
+    
+    if camera.enabled:
+        def camera_reset():
+            if bot.tap(camera.x, camera.y, label="Camera Reset"):
+                counts["camera"] += 1
+                print(f"  📷 Camera Reset #{counts['camera']}")
+        
+        jobs.append(scheduler.add_job("Camera Reset", camera_reset, camera.interval, camera.priority))
+        print(f"   📷 Camera Reset ativado (paralelo a cada {camera.interval}s)")
+    
+    if lure.enabled:
+        def lure_tap():
+            if bot.tap(lure.x, lure.y, label="Lure"):
+                counts["lure"] += 1
+                print(f"  🎯 Lure #{counts['lure']}")
+        
+        jobs.append(scheduler.add_job("Lure", lure_tap, lure.interval, lure.priority))
+        print(f"   🎯 Lure ativado (paralelo a cada {lure.interval}s)")
+    
+    def make_click(click):
+        def click_action():
+            if bot.tap(click.x, click.y, label=click.description):
+                counts["clicks"] += 1
+                print(f"  ✓ Clique #{counts['clicks']} em ({click.x}, {click.y}) - {click.description}")
+            else:
+                print(f"  ✗ Falha no clique em ({click.x}, {click.y})")
+        return click_action
+    
+    # Sequência de cliques: cada clique roda `interval` segundos após o deadline do anterior
+    if settings.clicks:
+        steps = [(make_click(click), click.interval) for click in settings.clicks]
+        jobs.append(scheduler.add_sequence("Cliques", steps, PRIORITY_SKILLS))
+    
+    return jobs
+
+
 def main():
     """Função principal com exemplo de uso"""
     
-    # Carrega configurações do JSON
+    # Carrega configurações do JSON e compila uma vez (validação + objetos imutáveis)
     config = load_config()
+    try:
+        settings = compile_config(config)
+    except ValueError as e:
+        print(f"✗ Configuração inválida: {e}")
+        sys.exit(1)
+    # Recarrega o arquivo durante a execução: lure, intervalos e cliques mudam sem reiniciar
+    watcher = ConfigWatcher("bot_config.json", settings)
     
-    DEVICE = config.get("device", DEFAULT_DEVICE_ADDRESS)
-    CLICKS = config.get("clicks", [])
-    CAMERA_RESET = config.get("camera_reset", {})
-    LURE = config.get("lure", {})
+    DEVICE = settings.device or DEFAULT_DEVICE_ADDRESS
+    BACKEND = settings.backend
+    BATCH_WINDOW = settings.batch_window
+    INJECTION = settings.injection
+    SCREEN = config.get("screen")
+    METRICS_CONFIG = config.get("metrics", {})
     
     # Inicializa o bot
-    bot = SimpleBotADB(device_address=DEVICE)
+    bot = SimpleBotADB(device_address=DEVICE, backend=BACKEND, batch_window=BATCH_WINDOW,
+                       injection=INJECTION, screen=SCREEN)
     
     # Verifica ADB
     if not bot.check_adb():
@@ -697,6 +1159,20 @@ def main():
     if not bot.connect():
         sys.exit(1)
     
+    # Dump periódico das latências (tabela no console ou JSONL em dump_file)
+    if METRICS_CONFIG.get('dump_interval'):
+        bot.metrics.start_dump(METRICS_CONFIG['dump_interval'], METRICS_CONFIG.get('dump_file'))
+    
+    # Endpoint /metrics (Prometheus) e /health para acompanhar a sessão de fora
+    metrics_server = None
+    if METRICS_CONFIG.get('port'):
+        try:
+            metrics_server = MetricsServer(bot.metrics, METRICS_CONFIG['port'],
+                                           METRICS_CONFIG.get('host', "127.0.0.1")).start()
+            metrics_server.watch_bot(bot)
+        except OSError as e:
+            print(f"⚠ Endpoint de métricas indisponível: {e}")
+    
     print("\n" + "="*50)
     print("BOT SIMPLES ADB - MENU")
     print("="*50)
@@ -710,111 +1186,71 @@ def main():
     print("="*50)
     print(f"\n⚙️  Configuração atual:")
     print(f"   Dispositivo: {DEVICE}")
-    print(f"   Pontos de clique: {len(CLICKS)}")
+    print(f"   Backend ADB: {BACKEND} | Injeção: {INJECTION}")
+    if BATCH_WINDOW:
+        print(f"   Agrupamento de ações: janela de {BATCH_WINDOW}s")
+    print(f"   Pontos de clique: {len(settings.clicks)}")
     
     # Mostra configuração de reset de câmera
-    if CAMERA_RESET.get('enabled'):
-        cam_x = CAMERA_RESET.get('x')
-        cam_y = CAMERA_RESET.get('y')
-        cam_interval = CAMERA_RESET.get('interval', 8.0)
-        print(f"   📷 Camera Reset: ({cam_x}, {cam_y}) a cada {cam_interval}s [PARALELO]")
+    camera = settings.camera_reset
+    if camera.enabled:
+        print(f"   📷 Camera Reset: ({camera.x}, {camera.y}) a cada {camera.interval}s [PARALELO]")
     
     # Mostra configuração do Lure
-    if LURE.get('enabled'):
-        lure_x = LURE.get('x')
-        lure_y = LURE.get('y')
-        lure_interval = LURE.get('interval', 3.0)
-        print(f"   🎯 Lure: ({lure_x}, {lure_y}) a cada {lure_interval}s [PARALELO - ATIVO]")
+    lure = settings.lure
+    if lure.enabled:
+        print(f"   🎯 Lure: ({lure.x}, {lure.y}) a cada {lure.interval}s [PARALELO - ATIVO]")
     else:
         print(f"   🎯 Lure: [DESATIVADO]")
     
-    if CLICKS:
+    if settings.clicks:
         print(f"\n📍 Sequência de cliques:")
-        for i, click in enumerate(CLICKS, 1):
-            desc = click.get('description', 'Sem descrição')
-            interval = click.get('interval', 1.0)
-            print(f"   {i}. ({click['x']}, {click['y']}) - {desc} [{interval}s]")
+        for i, click in enumerate(settings.clicks, 1):
+            print(f"   {i}. ({click.x}, {click.y}) - {click.description or 'Sem descrição'} [{click.interval}s]")
     
     try:
         opcao = input("\nEscolha uma opção: ").strip()
         
         if opcao == "1":
-            if not CLICKS:
+            if not settings.clicks:
                 print("✗ Nenhum ponto de clique configurado no bot_config.json!")
                 return
             
             print(f"\n🤖 Iniciando bot...")
-            print(f"   Clicando em {len(CLICKS)} posições com intervalos individuais")
+            print(f"   Clicando em {len(settings.clicks)} posições com intervalos individuais")
             
-            # Flag de controle para parar as threads
-            stop_flag = threading.Event()
+            # Um único agendador com deadlines absolutos para todas as ações periódicas
+            scheduler = Scheduler()
+            counts = {"clicks": 0, "camera": 0, "lure": 0}
+            jobs = schedule_bot_actions(bot, scheduler, settings, counts)
+            applied = {"version": watcher.version, "jobs": jobs}
+            if metrics_server:
+                metrics_server.watch_scheduler(scheduler)
             
-            # Thread para resetar câmera em paralelo
-            camera_thread = None
-            if CAMERA_RESET.get('enabled'):
-                cam_x = CAMERA_RESET.get('x')
-                cam_y = CAMERA_RESET.get('y')
-                cam_interval = CAMERA_RESET.get('interval', 8.0)
-                
-                def camera_reset_loop():
-                    cam_count = 0
-                    while not stop_flag.is_set():
-                        if bot.tap(cam_x, cam_y):
-                            cam_count += 1
-                            print(f"  📷 Camera Reset #{cam_count}")
-                        time.sleep(cam_interval)
-                
-                camera_thread = threading.Thread(target=camera_reset_loop, daemon=True)
-                camera_thread.start()
-                print(f"   📷 Camera Reset ativado (paralelo a cada {cam_interval}s)")
-            
-            # Thread para Lure em paralelo
-            lure_thread = None
-            if LURE.get('enabled'):
-                lure_x = LURE.get('x')
-                lure_y = LURE.get('y')
-                lure_interval = LURE.get('interval', 3.0)
-                
-                def lure_loop():
-                    lure_count = 0
-                    while not stop_flag.is_set():
-                        if bot.tap(lure_x, lure_y):
-                            lure_count += 1
-                            print(f"  🎯 Lure #{lure_count}")
-                        time.sleep(lure_interval)
-                
-                lure_thread = threading.Thread(target=lure_loop, daemon=True)
-                lure_thread.start()
-                print(f"   🎯 Lure ativado (paralelo a cada {lure_interval}s)")
+            def apply_config():
+                # Troca os jobs na própria thread do agendador quando o observador compila uma versão nova
+                if watcher.version == applied["version"]:
+                    return
+                for job in applied["jobs"]:
+                    scheduler.remove_job(job)
+                applied["version"] = watcher.version
+                applied["jobs"] = schedule_bot_actions(bot, scheduler, watcher.current, counts)
+            
+            scheduler.add_job("Configuração", apply_config, watcher.interval, 0, watcher.interval)
+            watcher.start()
             
             print(f"   Pressione Ctrl+C para parar\n")
             
-            # Executa sequência infinita de cliques principais
-            click_count = 0
             try:
-                while True:
-                    for i, click in enumerate(CLICKS, 1):
-                        x = click['x']
-                        y = click['y']
-                        interval = click.get('interval', 1.0)
-                        desc = click.get('description', '')
-                        
-                        if bot.tap(x, y):
-                            click_count += 1
-                            print(f"  ✓ Clique #{click_count} em ({x}, {y}) - {desc}")
-                        else:
-                            print(f"  ✗ Falha no clique em ({x}, {y})")
-                        
-                        # Aguarda o intervalo específico deste clique
-                        time.sleep(interval)
-                    
+                scheduler.run()
             except KeyboardInterrupt:
-                print(f"\n\n⏹ Bot parado após {click_count} cliques")
-                stop_flag.set()  # Para as threads
-                if camera_thread:
-                    camera_thread.join(timeout=1)
-                if lure_thread:
-                    lure_thread.join(timeout=1)
+                print(f"\n\n⏹ Bot parado após {counts['clicks']} cliques")
+                scheduler.print_report()
+                bot.metrics.print_report()
+                if bot.batcher:
+                    stats = bot.batcher.stats()
+                    print(f"   📦 {stats['actions']} ações em {stats['batches']} envios "
+                          f"({stats['actions_per_batch']:.1f} por envio)")
             
         elif opcao == "2":
             bot.enable_pointer_location()
@@ -823,20 +1259,19 @@ def main():
             bot.disable_pointer_location()
             
         elif opcao == "4":
-            # Alterna estado do Lure
-            config = load_config()
-            lure_config = config.get("lure", {})
-            current_state = lure_config.get('enabled', False)
-            lure_config['enabled'] = not current_state
+            # Alterna estado do Lure (a configuração já foi carregada no início)
+            lure_config = dict(config.get("lure", {}))
+            lure_config['enabled'] = not settings.lure.enabled
             config['lure'] = lure_config
             
             # Salva no arquivo
             try:
+                compile_config(config)
                 with open('bot_config.json', 'w', encoding='utf-8') as f:
                     json.dump(config, f, indent=2, ensure_ascii=False)
                 
                 if lure_config['enabled']:
-                    print(f"✓ Lure HABILITADO - será ativado na próxima execução do bot")
+                    print(f"✓ Lure HABILITADO - bots em execução aplicam em até {watcher.interval:.0f}s")
                 else:
                     print(f"✓ Lure DESABILITADO")
             except Exception as e:
@@ -844,39 +1279,63 @@ def main():
             
         elif opcao == "5":
             # Executa sequência de Lure com movimentos do joystick em loop COM INTERVALOS
-            config = load_config()
-            joystick_config = config.get("joystick", {})
+            joystick = settings.joystick
             
-            if not joystick_config:
+            if joystick is None:
                 print("\n⚙️  Configuração do joystick não encontrada.")
-                print("   Usando coordenadas padrão do bot_config.json")
-                # Cria config padrão
-                joystick_config = {
-                    'center_x': 248,
-                    'center_y': 789,
-                    'forward': {'x': 246, 'y': 697},
-                    'left': {'x': 334, 'y': 787},
-                    'backward': {'x': 243, 'y': 869},
-                    'right': {'x': 162, 'y': 787}
-                }
+                print("   Usando coordenadas padrão do joystick (convertidas para o perfil \"screen\")")
+                joystick = default_joystick(settings.screen)
             
             print("\n🔄 Iniciando Lure com Joystick (PASSOS INTERVALADOS)...")
             print("   Fazendo trajeto quadrado com pausas no caminhar")
             print("   Pressione Ctrl+C para parar\n")
             
-            cycle_interval = joystick_config.get('cycle_interval', 10)  # Lê do JSON ou usa padrão
+            vision = {}
             
+            def build_steering(joystick):
+                # Visão só é carregada quando o lure guiado está ativo (requer numpy/opencv)
+                if not joystick.steering:
+                    return None
+                from steering import MobSteering
+                if not vision:
+                    from screen_capture import ScreenCapture
+                    from minimap import MinimapAnalyzer
+                    rois = config.get("vision", {}).get("rois")
+                    vision["capture"] = ScreenCapture(DEVICE, client=bot.client, rois=rois)
+                    vision["analyzer"] = MinimapAnalyzer(roi=vision["capture"].rois.get("minimap"))
+                return MobSteering(joystick, joystick.steering)
+            
+            steering = build_steering(joystick)
+            clicks = settings.clicks
             cycle_count = 0
+            version = watcher.version
+            watcher.start()
             try:
                 while True:
+                    if watcher.version != version:
+                        # Joystick (incluindo o modo de direção), intervalo entre ciclos e cliques
+                        # recarregados do arquivo
+                        version = watcher.version
+                        joystick = watcher.current.joystick or default_joystick(watcher.current.screen)
+                        clicks = watcher.current.clicks
+                        steering = build_steering(joystick)
                     cycle_count += 1
+                    bot.metrics.increment("lure_cycles", bot.device_address)
                     print(f"--- Ciclo #{cycle_count} ---")
-                    bot.lure_with_joystick_steps(joystick_config)
-                    print(f"\n⏳ Aguardando {cycle_interval} segundos até próximo ciclo...\n")
-                    time.sleep(cycle_interval)
+                    if steering is not None:
+                        bot.lure_with_joystick_steering(joystick, steering, vision["capture"], vision["analyzer"])
+                    elif joystick.cast_while_moving:
+                        bot.lure_with_joystick_casting(joystick, clicks)
+                    elif joystick.route_script:
+                        bot.lure_with_joystick_script(joystick, joystick.route_script)
+                    else:
+                        bot.lure_with_joystick_steps(joystick)
+                    print(f"\n⏳ Aguardando {joystick.cycle_interval} segundos até próximo ciclo...\n")
+                    time.sleep(joystick.cycle_interval)
                     
             except KeyboardInterrupt:
                 print(f"\n\n⏹ Loop parado após {cycle_count} ciclos")
+                bot.metrics.print_report()
             
         elif opcao == "6":
             calibration_mode(bot, config)
@@ -891,7 +1350,13 @@ def main():
     except KeyboardInterrupt:
         print("\n\nInterrompido pelo usuário")
     finally:
+        watcher.stop()
         bot.disconnect()
+        bot.metrics.stop_dump()
+        if metrics_server:
+            metrics_server.stop()
+        if METRICS_CONFIG.get('dump_file'):
+            bot.metrics.dump(METRICS_CONFIG['dump_file'])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,154 @@
+"""
+Direção do joystick guiada pelos mobs
+Escolhe um alvo entre os mobs do minimapa (grupo mais denso ou mais próximo, usando um
+índice espacial em grade) e converte a direção do alvo para os vetores calibrados do
+joystick, interpolando as diagonais entre frente/direita/trás/esquerda
+"""
+import math
+
+from compiled_config import as_joystick
+from joystick_routes import lure_directions
+
+# Direção no minimapa (graus, 0 = para cima, sentido horário) de cada vetor calibrado
+CARDINAL_BEARINGS = {"frente": 0.0, "direita": 90.0, "trás": 180.0, "esquerda": 270.0}
+
+
+class SpatialGrid:
+    """Índice espacial em grade uniforme para buscas de vizinhos em raio fixo"""
+
+    def __init__(self, cell: float):
+        self.cell = cell
+        self.cells = {}
+
+    def _key(self, x: float, y: float) -> tuple:
+        return int(x // self.cell), int(y // self.cell)
+
+    def insert(self, x: float, y: float, item):
+        self.cells.setdefault(self._key(x, y), []).append((x, y, item))
+
+    def neighbors(self, x: float, y: float, radius: float) -> list:
+        """Itens a até `radius` de (x, y)"""
+        cx, cy = self._key(x, y)
+        reach = max(1, math.ceil(radius / self.cell))
+        limit = radius * radius
+        found = []
+        for gx in range(cx - reach, cx + reach + 1):
+            for gy in range(cy - reach, cy + reach + 1):
+                for ix, iy, item in self.cells.get((gx, gy), ()):
+                    if (ix - x) ** 2 + (iy - y) ** 2 <= limit:
+                        found.append(item)
+        return found
+
+
+def calibrated_vectors(joystick_config) -> list:
+    """
+    Vetores do joystick (relativos ao centro) ordenados pela direção no minimapa
+
+    Returns:
+        Lista de tuplas (graus, dx, dy)
+    """
+    joystick = as_joystick(joystick_config)
+    vectors = [(CARDINAL_BEARINGS[name], x - joystick.center_x, y - joystick.center_y)
+               for name, x, y in lure_directions(joystick)]
+    return sorted(vectors)
+
+
+def joystick_target(joystick_config, bearing: float, vectors: list = None) -> tuple:
+    """
+    Posição do joystick para andar na direção `bearing` do minimapa
+
+    Interpola entre os dois vetores calibrados vizinhos e mantém o raio médio deles,
+    assim a diagonal empurra o joystick tanto quanto as direções calibradas
+
+    Args:
+        joystick_config: Joystick compilado ou dicionário da seção joystick
+        bearing: Direção em graus no minimapa
+        vectors: calibrated_vectors() já calculados (evita recalcular a cada passo)
+
+    Returns:
+        Tupla (x, y) na tela
+    """
+    joystick = as_joystick(joystick_config)
+    vectors = vectors or calibrated_vectors(joystick)
+    bearing %= 360
+    for i, (start, x0, y0) in enumerate(vectors):
+        end, x1, y1 = vectors[(i + 1) % len(vectors)]
+        span = (end - start) % 360
+        offset = (bearing - start) % 360
+        if offset <= span:
+            break
+    t = offset / span
+    dx, dy = x0 + (x1 - x0) * t, y0 + (y1 - y0) * t
+    radius = math.hypot(x0, y0) * (1 - t) + math.hypot(x1, y1) * t
+    length = math.hypot(dx, dy)
+    if length > 0:
+        dx, dy = dx * radius / length, dy * radius / length
+    return round(joystick.center_x + dx), round(joystick.center_y + dy)
+
+
+class MobSteering:
+    """Decide para onde andar a partir dos Blips do MinimapAnalyzer"""
+
+    def __init__(self, joystick_config, mode: str = "densest", radius: float = 20.0,
+                 arrive_distance: float = 8.0):
+        """
+        Args:
+            joystick_config: Joystick compilado ou dicionário da seção joystick
+            mode: "densest" (grupo com mais mobs) ou "nearest" (mob mais próximo)
+            radius: Raio em pixels do minimapa que define um grupo
+            arrive_distance: Distância em que o alvo é considerado alcançado (para de andar)
+        """
+        if mode not in ("densest", "nearest"):
+            raise ValueError(f"modo de direção inválido: {mode}")
+        self.joystick = as_joystick(joystick_config)
+        self.vectors = calibrated_vectors(self.joystick)
+        self.mode = mode
+        self.radius = radius
+        self.arrive_distance = arrive_distance
+
+    def choose_target(self, blips: list) -> tuple:
+        """
+        Escolhe o alvo relativo ao jogador
+
+        Returns:
+            Tupla (dx, dy, mobs no grupo) ou None sem mobs
+        """
+        if not blips:
+            return None
+        if self.mode == "nearest":
+            blip = min(blips, key=lambda b: b.dx * b.dx + b.dy * b.dy)
+            return blip.dx, blip.dy, blip.count
+
+        grid = SpatialGrid(self.radius)
+        for blip in blips:
+            grid.insert(blip.dx, blip.dy, blip)
+        best = None
+        for blip in blips:
+            group = grid.neighbors(blip.dx, blip.dy, self.radius)
+            weight = sum(member.count for member in group)
+            # Empate: o grupo mais perto do jogador
+            score = (weight, -(blip.dx * blip.dx + blip.dy * blip.dy))
+            if best is None or score > best[0]:
+                best = (score, group, weight)
+        _, group, weight = best
+        dx = sum(member.dx * member.count for member in group) / weight
+        dy = sum(member.dy * member.count for member in group) / weight
+        return dx, dy, weight
+
+    def plan(self, blips: list) -> tuple:
+        """
+        Calcula o movimento do joystick até o alvo
+
+        Returns:
+            Tupla (x, y, graus, mobs no grupo) com a posição do joystick, ou None quando não há
+            mobs ou o jogador já está sobre o alvo
+        """
+        target = self.choose_target(blips)
+        if target is None:
+            return None
+        dx, dy, count = target
+        if math.hypot(dx, dy) <= self.arrive_distance:
+            return None
+        bearing = math.degrees(math.atan2(dx, -dy)) % 360
+        x, y = joystick_target(self.joystick, bearing, self.vectors)
+        return x, y, bearing, count
@@ -0,0 +1,5 @@
+"""Os módulos do bot ficam na raiz do repositório e se importam pelo nome (ex: from scheduler import ...)"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
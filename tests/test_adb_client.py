@@ -0,0 +1,96 @@
+import os
+import shutil
+import signal
+import threading
+import time
+
+import pytest
+
+from adb_client import AdbClient, AdbProtocolError, AdbSocketShellSession
+from fake_adb_server import FakeAdbServer
+
+
+@pytest.fixture
+def server():
+    server = FakeAdbServer(devices=["emulator-5554"]).start()
+    yield server
+    server.stop()
+    shutil.rmtree(server.bin_dir, ignore_errors=True)
+
+
+def test_host_requests(server):
+    client = AdbClient(port=server.port)
+
+    assert client.version() == 41
+    assert client.devices() == [("emulator-5554", "device")]
+    assert client.connect("192.168.0.10:5555") == "connected to 192.168.0.10:5555"
+    assert ("192.168.0.10:5555", "device") in client.devices()
+    assert client.disconnect("192.168.0.10:5555") == "disconnected 192.168.0.10:5555"
+
+
+def test_transport_shell_round_trip(server):
+    client = AdbClient(port=server.port)
+
+    assert client.shell("emulator-5554", "echo ola; echo mundo") == "ola\nmundo\n"
+    with pytest.raises(AdbProtocolError, match="not found"):
+        client.shell("desconhecido", "echo ola")
+
+
+def test_socket_session_runs_commands_with_exit_code(server):
+    session = AdbSocketShellSession("emulator-5554", client=AdbClient(port=server.port))
+    try:
+        ok = session.run("echo ola")
+        failed = session.run("echo erro; false")
+    finally:
+        session.close()
+
+    assert (ok.returncode, ok.stdout) == (0, "ola\n")
+    assert (failed.returncode, failed.stdout) == (1, "erro\n")
+
+
+def test_socket_session_restarts_after_connection_drop(server):
+    session = AdbSocketShellSession("emulator-5554", client=AdbClient(port=server.port))
+    try:
+        pid = int(session.run("echo $$").stdout)
+        # O sh do serviço morre: o servidor fecha a conexão
+        os.kill(pid, signal.SIGKILL)
+        deadline = time.monotonic() + 2
+        while session.alive and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not session.alive
+
+        result = session.run("echo de volta")
+    finally:
+        session.close()
+
+    assert result.stdout == "de volta\n"
+    assert session.restarts == 1
+
+
+def test_old_reader_does_not_end_restarted_session(server):
+    session = AdbSocketShellSession("emulator-5554", client=AdbClient(port=server.port))
+    gate = threading.Event()
+    start_reader = session._start_reader
+
+    def slow_reader(stream, *extra):
+        def lines():
+            yield from stream
+            # A leitora antiga só chega ao fim do stream depois do reinício
+            gate.wait(2)
+        start_reader(lines(), *extra)
+
+    try:
+        session._start_reader = slow_reader
+        assert session.start()
+        old_reader = session._reader
+        del session._start_reader
+        assert session.start()
+        gate.set()
+        old_reader.join(timeout=2)
+
+        assert not old_reader.is_alive()
+        assert session.alive
+        assert session.run("echo ok").stdout == "ok\n"
+        assert session.restarts == 0
+    finally:
+        session.close()
@@ -0,0 +1,67 @@
+import shutil
+import subprocess
+import time
+
+import pytest
+
+from adb_session import AdbShellSession
+from fake_adb_server import fake_device_env, install_fake_device
+
+
+@pytest.fixture
+def session(monkeypatch, tmp_path):
+    bin_dir = install_fake_device(str(tmp_path / "bin"))
+    for key, value in fake_device_env(bin_dir).items():
+        monkeypatch.setenv(key, value)
+    monkeypatch.chdir(tmp_path)
+    session = AdbShellSession("emulator-5554")
+    yield session
+    session.close()
+    shutil.rmtree(bin_dir, ignore_errors=True)
+
+
+def test_marker_carries_output_and_exit_code(session):
+    result = session.run("echo olá")
+    assert (result.returncode, result.stdout, result.stderr) == (0, "olá\n", "")
+    pid = session.process.pid
+
+    # Saída sem quebra de linha fica na linha do marcador
+    assert session.run("printf abc").stdout == "abc"
+
+    result = session.run("echo falhou >&2; sh -c 'exit 3'")
+    assert (result.returncode, result.stdout, result.stderr) == (3, "falhou\n", "falhou\n")
+    # Todos os comandos na mesma sessão
+    assert session.process.pid == pid and session.restarts == 0
+
+
+def test_restarts_once_when_session_dies(session):
+    session.run("true")
+    session.process.kill()
+    session.process.wait()
+
+    assert session.run("echo ok").stdout == "ok\n"
+    assert session.restarts == 1
+
+
+def test_command_is_resent_once_after_eof(session):
+    # A primeira tentativa derruba o shell no meio do comando; o reenvio completa
+    result = session.run("if [ ! -e marca ]; then touch marca; kill -9 $$; fi; echo ok")
+    assert result.stdout == "ok\n"
+    assert session.restarts == 1
+
+    with pytest.raises(OSError, match="encerrada durante o comando"):
+        session.run("kill -9 $$")
+
+
+def test_timeout_kills_session_and_next_command_restarts(session):
+    session.run("true")
+    process = session.process
+
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        session.run("sleep 5", timeout=0.3)
+    assert time.monotonic() - start < 3
+    assert process.poll() is not None and not session.alive
+
+    assert session.run("echo de novo").stdout == "de novo\n"
+    assert session.restarts == 1 and session.process is not process
@@ -0,0 +1,33 @@
+import asyncio
+import shutil
+import time
+
+from adb_client import AdbClient
+from async_bot import AsyncSimpleBotADB
+from fake_adb_server import FakeAdbServer
+
+
+def test_socket_pool_uses_separate_sessions():
+    server = FakeAdbServer(devices=["emulator-5554"], latency=0.3).start()
+
+    async def main():
+        bot = AsyncSimpleBotADB("emulator-5554", backend="socket", max_sessions=3,
+                                client=AdbClient(port=server.port))
+        assert await bot.connect()
+        try:
+            start = time.perf_counter()
+            results = await asyncio.gather(*(bot.tap(100 + i, 200) for i in range(3)))
+            return bot._sessions, results, time.perf_counter() - start
+        finally:
+            await bot.disconnect()
+
+    try:
+        sessions, results, elapsed = asyncio.run(main())
+    finally:
+        server.stop()
+        shutil.rmtree(server.bin_dir, ignore_errors=True)
+
+    assert len({id(session) for session in sessions}) == 3
+    assert results == [True, True, True]
+    # Os três taps rodam em paralelo, um em cada sessão
+    assert elapsed < 0.75
@@ -0,0 +1,39 @@
+from auto_calibration import AutoCalibrator
+
+
+def test_apply_merges_skills_into_existing_clicks(tmp_path):
+    config = {"clicks": [
+        {"x": 1, "y": 1, "interval": 0.5, "description": "Skill 2", "hold": True},
+        {"x": 900, "y": 400, "interval": 30.0, "description": "Poção"},
+        {"x": 2, "y": 2, "interval": 2.0, "description": "Skill 1"}
+    ]}
+    found = {"skill_1": (0.9, 100, 200, 20, 40), "skill_2": (0.9, 300, 400, 20, 40),
+             "skill_3": (0.9, 500, 600, 20, 40)}
+
+    updated = AutoCalibrator(str(tmp_path)).apply(config, found, 2400)
+
+    assert updated == ["clicks"]
+    assert config["clicks"] == [
+        {"x": 310, "y": 420, "interval": 0.5, "description": "Skill 2", "hold": True},
+        {"x": 900, "y": 400, "interval": 30.0, "description": "Poção"},
+        {"x": 110, "y": 220, "interval": 2.0, "description": "Skill 1"},
+        {"x": 510, "y": 620, "interval": 1.0, "description": "Skill 3"}
+    ]
+
+
+def test_apply_writes_coordinates_in_screen_profile(tmp_path):
+    found = {"lure": (0.9, 1190, 530, 20, 20), "skill_1": (0.9, 590, 260, 20, 20),
+             "joystick": (0.9, 100, 400, 200, 200)}
+    normalized = {"screen": "normalized"}
+    reference = {"screen": {"width": 1200, "height": 540}}
+
+    AutoCalibrator(str(tmp_path)).apply(normalized, found, 2400, 1080)
+    AutoCalibrator(str(tmp_path)).apply(reference, found, 2400, 1080)
+
+    assert (normalized["lure"]["x"], normalized["lure"]["y"]) == (0.5, 0.5)
+    assert (normalized["clicks"][0]["x"], normalized["clicks"][0]["y"]) == (0.25, 0.25)
+    assert (normalized["joystick"]["center_x"], normalized["joystick"]["center_y"]) == (0.0833, 0.463)
+    assert all(0 <= normalized["joystick"][key][axis] <= 1
+               for key in ("forward", "left", "backward", "right") for axis in ("x", "y"))
+    assert (reference["lure"]["x"], reference["lure"]["y"]) == (600, 270)
+    assert (reference["joystick"]["center_x"], reference["joystick"]["center_y"]) == (100, 250)
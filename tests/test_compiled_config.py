@@ -0,0 +1,73 @@
+import pytest
+
+from compiled_config import ConfigWatcher, Joystick, Point, as_joystick, compile_config, default_joystick
+
+
+def test_joystick_is_compiled_with_defaults():
+    settings = compile_config({"joystick": {"center_x": 300, "forward": {"x": 290, "y": 700},
+                                            "steering": "nearest"}})
+
+    assert isinstance(settings.joystick, Joystick)
+    assert settings.joystick.center_x == 300
+    assert settings.joystick.center_y == Joystick().center_y
+    assert settings.joystick.forward == Point(290, 700)
+    assert settings.joystick.steering == "nearest"
+
+
+def test_missing_joystick_section_is_none():
+    assert compile_config({}).joystick is None
+    assert as_joystick({}) == Joystick()
+
+
+def test_normalized_coordinates_keep_fractions():
+    settings = compile_config({"clicks": [{"x": 0.76, "y": 0.5, "interval": 1}]})
+    assert settings.clicks[0].x == 0.76
+    assert isinstance(compile_config({"clicks": [{"x": 1833.0, "y": 540}]}).clicks[0].x, int)
+
+
+@pytest.mark.parametrize("joystick", [
+    {"steering": "closest"},
+    {"route_script": "tap"},
+    {"step_interval": -1},
+    {"forward": {"x": "a"}},
+])
+def test_invalid_joystick_is_rejected(joystick):
+    with pytest.raises(ValueError):
+        compile_config({"joystick": joystick})
+
+
+def test_default_joystick_follows_screen_profile():
+    normalized = compile_config({"screen": "normalized", "joystick": {"center_x": 0.1}})
+    assert normalized.joystick.center_x == 0.1
+    assert 0 < normalized.joystick.forward.x < 1 and 0 < normalized.joystick.forward.y < 1
+    assert default_joystick((1, 1)).center_x == pytest.approx(248 / 2400, abs=1e-4)
+
+    half = default_joystick((1200, 540))
+    assert half.center_x == 124 and half.forward == Point(123, 348)
+    assert default_joystick(None) == Joystick()
+
+
+@pytest.mark.parametrize("config", [
+    {"clicks": 5},
+    {"clicks": [5]},
+    {"lure": []},
+    {"camera_reset": {"x": None, "y": 10, "enabled": True}},
+    {"camera_reset": {"x": None, "y": 10}},
+    {"joystick": {"forward": 3}},
+    []
+])
+def test_malformed_sections_raise_value_error(config):
+    with pytest.raises(ValueError):
+        compile_config(config)
+
+
+def test_watcher_survives_malformed_file(tmp_path):
+    path = tmp_path / "bot_config.json"
+    path.write_text('{"clicks": []}')
+    watcher = ConfigWatcher(str(path), compile_config({"clicks": []}))
+
+    path.write_text('{"clicks": 5, "lure": []}')
+    assert not watcher.check()
+    path.write_text('{"clicks": [{"x": 1, "y": 2}]}')
+    assert watcher.check()
+    assert watcher.current.clicks[0].interval == 1.0
@@ -0,0 +1,35 @@
+import os
+import shutil
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from digit_ocr import GLYPHS_DIR, DigitOCR, _load_crop, evaluate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def crop(name, region):
+    return _load_crop(os.path.join(ROOT, name), region)
+
+
+def test_glyphs_cover_all_digits():
+    assert set("0123456789") <= set(DigitOCR().chars)
+
+
+def test_held_out_image_is_read_exactly():
+    # mini_map.png não gerou nenhum glifo
+    result = evaluate([(crop("mini_map.png", "55,32,95,25"), "(1933,1278)")], DigitOCR(max_saturation=40))
+    assert result["exact"] == 1
+
+
+def test_read_number_rejects_unrecognized_characters(tmp_path):
+    glyphs = tmp_path / "glyphs"
+    shutil.copytree(GLYPHS_DIR, glyphs, ignore=shutil.ignore_patterns("9_*"))
+    ocr = DigitOCR(str(glyphs))
+    image = crop("localizacao.png", None)
+
+    assert "?" in ocr.read(image)
+    assert ocr.read_number(image) is None
+    assert DigitOCR().read_number(image) == 18211259
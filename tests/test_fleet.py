@@ -0,0 +1,93 @@
+import time
+
+from fleet import FleetRunner
+from scheduler import PRIORITY_CAMERA_RESET, PRIORITY_SKILLS
+
+
+def test_profiles_are_compiled_with_shared_defaults():
+    runner = FleetRunner({
+        "camera_reset": {"enabled": True, "x": 67, "y": 146},
+        "profiles": {"skills": {"clicks": [{"x": 1, "y": 2}, {"x": 3, "y": 4, "interval": 0.5}]}},
+        "devices": [{"device": "10.0.0.1:5555", "profile": "skills"},
+                    {"device": "10.0.0.2:5555", "clicks": 5}]
+    })
+
+    workers = runner.build_workers()
+
+    # O dispositivo com "clicks" inválido é ignorado em vez de derrubar a frota
+    assert [worker.name for worker in workers] == ["10.0.0.1:5555"]
+    profile = workers[0].profile
+    assert (profile.camera_reset.interval, profile.camera_reset.priority) == (8.0, PRIORITY_CAMERA_RESET)
+    assert [click.interval for click in profile.clicks] == [1.0, 0.5]
+    runner._register_jobs(workers[0], None, 0.0)
+    priorities = sorted(job.priority for job in runner.scheduler.jobs)
+    assert PRIORITY_SKILLS in priorities and PRIORITY_CAMERA_RESET in priorities
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, fn, *args):
+        self.calls.append((fn.__name__, args))
+
+
+class FakeCapture:
+    def __init__(self, frame):
+        self.frame = frame
+
+    def capture(self):
+        return self.frame
+
+
+def vision_runner():
+    runner = FleetRunner({
+        "vision": {"interval": 0.2, "workers": 1, "potion": {"x": 900, "y": 500, "below": 50, "cooldown": 60}},
+        "devices": [{"device": "10.0.0.1:5555"}]
+    })
+    worker = runner.build_workers()[0]
+    worker.state = "ok"
+    return runner, worker
+
+
+def test_vision_callback_drives_potion_job():
+    runner, worker = vision_runner()
+    executor = FakeExecutor()
+    runner._register_jobs(worker, executor, 0.0)
+    jobs = {job.name: job.steps[0][0] for job in runner.scheduler.jobs}
+    drink = jobs["10.0.0.1:5555 Poção"]
+
+    # Captura vai para o executor e não repete enquanto a anterior não termina
+    jobs["10.0.0.1:5555 Visão"]()
+    jobs["10.0.0.1:5555 Visão"]()
+    assert executor.calls == [("_capture", (worker,))]
+
+    executor.calls.clear()
+    worker.on_vision(worker.name, {"hp": 80.0})
+    drink()
+    worker.on_vision(worker.name, {"hp": 30.0})
+    drink()
+    # Leitura já consumida e cooldown ativo: nenhuma poção extra
+    drink()
+    worker.on_vision(worker.name, {"hp": 20.0})
+    drink()
+    assert executor.calls == [("_tap", (900, 500, "Poção"))]
+
+
+def test_capture_reaches_worker_through_vision_pool():
+    from vision_pool import _synthetic_frame
+
+    runner, worker = vision_runner()
+    worker.capture = FakeCapture(_synthetic_frame((1080, 1920, 4)))
+    worker.capturing = True
+    try:
+        runner._capture(worker)
+        deadline = time.monotonic() + 30
+        while worker.hp is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        if runner.vision is not None:
+            runner.vision.stop()
+
+    assert worker.hp is not None and 0 <= worker.hp <= 100
+    assert not worker.capturing
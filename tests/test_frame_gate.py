@@ -0,0 +1,64 @@
+import time
+
+import numpy as np
+
+from frame_gate import FrameGate
+from vision_pool import VisionPool, _synthetic_frame
+
+ROIS = {"hp": (20, 20, 240, 40), "minimap": (1700, 20, 200, 200)}
+
+
+def test_unchanged_frame_skips_detector():
+    frame = _synthetic_frame((1080, 1920, 4))
+    gate = FrameGate(rois=ROIS)
+    calls = []
+
+    def detector(frame):
+        calls.append(1)
+        return len(calls)
+
+    assert gate.run("hp", frame, detector) == 1
+    assert gate.run("hp", frame.copy(), detector) == 1
+    changed = frame.copy()
+    changed[20:60, 20:260, :3] = 0
+    assert gate.run("hp", changed, detector) == 2
+    assert gate.stats()["hp"]["skipped"] == 1
+
+
+def test_pool_runs_only_changed_detectors():
+    pool = VisionPool(workers=1, detectors=("hp", "minimap"), rois=ROIS).start()
+    sent = []
+    put = pool._tasks.put
+
+    def record(task):
+        if task is not None:
+            sent.append(task[3])
+        put(task)
+    pool._tasks.put = record
+
+    def wait(count):
+        deadline = time.monotonic() + 30
+        while pool.stats()["processed"] < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    try:
+        frame = _synthetic_frame((1080, 1920, 4))
+        assert pool.submit("d1", frame, timeout=5)
+        wait(1)
+        first = pool.latest("d1")
+
+        assert not pool.submit("d1", frame.copy(), timeout=5)
+        moved = frame.copy()
+        moved[20:220, 1700:1900, :3] = np.roll(moved[20:220, 1700:1900, :3], 60, axis=1)
+        assert pool.submit("d1", moved, timeout=5)
+        wait(2)
+        latest = pool.latest("d1")
+        stats = pool.stats()
+    finally:
+        pool.stop()
+
+    assert sent == [("hp", "minimap"), ("minimap",)]
+    assert (stats["processed"], stats["skipped"]) == (2, 1)
+    # O HP não rodou de novo: continua o resultado do primeiro quadro
+    assert latest["hp"] == first["hp"]
+    assert latest["minimap"] is not None
@@ -0,0 +1,50 @@
+import subprocess
+import threading
+import time
+
+from input_batch import InputBatcher
+
+
+def fake_execute(scripts):
+    def execute(script, timeout):
+        scripts.append(script)
+        stdout = "".join(f"{InputBatcher.MARKER}{i} 0\n" for i in range(script.count(InputBatcher.MARKER)))
+        return subprocess.CompletedProcess(script, 0, stdout=stdout, stderr="")
+    return execute
+
+
+def test_single_action_does_not_wait_for_window():
+    scripts = []
+    batcher = InputBatcher(fake_execute(scripts), window=0.5)
+    batcher.start()
+    try:
+        start = time.perf_counter()
+        result = batcher.submit("input tap 1 2")
+        elapsed = time.perf_counter() - start
+    finally:
+        batcher.stop()
+
+    assert result.returncode == 0
+    assert elapsed < 0.25
+    assert len(scripts) == 1
+
+
+def test_expected_group_goes_in_one_round_trip():
+    scripts = []
+    batcher = InputBatcher(fake_execute(scripts), window=0.5)
+    batcher.start()
+    try:
+        batcher.expect(3)
+        threads = [threading.Thread(target=batcher.submit, args=(f"input tap {i} {i}",)) for i in range(3)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        batcher.stop()
+
+    assert len(scripts) == 1
+    assert all(f"input tap {i} {i}" in scripts[0] for i in range(3))
+    assert elapsed < 0.25
@@ -0,0 +1,119 @@
+import struct
+
+from input_events import (ABS_MT_POSITION_X, ABS_MT_POSITION_Y, ABS_MT_PRESSURE, ABS_MT_SLOT,
+                          ABS_MT_TOUCH_MAJOR, ABS_MT_TRACKING_ID, BTN_TOUCH, EV_ABS, EV_KEY, EV_SYN,
+                          SYN_REPORT, EventEncoder, TouchDevice, find_touchscreen, frames_to_script,
+                          parse_getevent)
+
+GETEVENT_P = """\
+add device 1: /dev/input/event4
+  name:     "gpio-keys"
+  events:
+    KEY (0001): 0072  0073  0074
+  input props:
+    <none>
+add device 2: /dev/input/event3
+  name:     "touchpad"
+  events:
+    ABS (0003): 0035  : value 0, min 0, max 1023, fuzz 0, flat 0, resolution 0
+                0036  : value 0, min 0, max 767, fuzz 0, flat 0, resolution 0
+  input props:
+    INPUT_PROP_POINTER
+add device 3: /dev/input/event2
+  name:     "sec_touchscreen"
+  events:
+    KEY (0001): 014a
+    ABS (0003): 002f  : value 0, min 0, max 9, fuzz 0, flat 0, resolution 0
+                0030  : value 0, min 0, max 255, fuzz 0, flat 0, resolution 0
+                0035  : value 0, min 0, max 1079, fuzz 0, flat 0, resolution 0
+                0036  : value 0, min 0, max 2399, fuzz 0, flat 0, resolution 0
+                0039  : value 0, min 0, max 65535, fuzz 0, flat 0, resolution 0
+                003a  : value 0, min 0, max 255, fuzz 0, flat 0, resolution 0
+  input props:
+    INPUT_PROP_DIRECT
+"""
+
+
+def touchscreen(x_range=(0, 1079), y_range=(0, 2399)) -> TouchDevice:
+    device = TouchDevice("/dev/input/event2", "touch")
+    device.axes = {ABS_MT_SLOT: (0, 9), ABS_MT_TOUCH_MAJOR: (0, 255), ABS_MT_POSITION_X: x_range,
+                   ABS_MT_POSITION_Y: y_range, ABS_MT_TRACKING_ID: (0, 65535), ABS_MT_PRESSURE: (0, 255)}
+    device.keys = {BTN_TOUCH}
+    device.direct = True
+    return device
+
+
+def events(data: bytes, event: struct.Struct) -> list:
+    return [(ev_type, code, value) for _, _, ev_type, code, value in event.iter_unpack(data)]
+
+
+def test_parse_getevent_reads_devices_axes_keys_and_props():
+    keys, touchpad, screen = parse_getevent(GETEVENT_P)
+
+    assert (keys.path, keys.name, keys.keys) == ("/dev/input/event4", "gpio-keys", {0x72, 0x73, 0x74})
+    assert not keys.is_touchscreen
+    assert touchpad.is_touchscreen and not touchpad.direct
+    assert screen.name == "sec_touchscreen"
+    assert screen.direct
+    assert screen.keys == {BTN_TOUCH}
+    assert screen.axes[ABS_MT_SLOT] == (0, 9)
+    assert screen.axis_range(ABS_MT_POSITION_X) == (0, 1079)
+    assert screen.axis_range(ABS_MT_POSITION_Y) == (0, 2399)
+    assert screen.axes[ABS_MT_TRACKING_ID] == (0, 65535)
+
+
+def test_find_touchscreen_prefers_direct_device():
+    assert find_touchscreen(parse_getevent(GETEVENT_P)).path == "/dev/input/event2"
+    assert find_touchscreen(parse_getevent(GETEVENT_P.split("add device 2")[0])) is None
+
+
+def test_to_axes_follows_rotation():
+    expected = {0: (10, 20), 1: (1079 - 20, 10), 2: (1079 - 10, 2399 - 20), 3: (20, 2399 - 10)}
+    for rotation, axes in expected.items():
+        encoder = EventEncoder(touchscreen(), 1080, 2400, rotation=rotation)
+        assert encoder.to_axes(10, 20) == axes, rotation
+
+
+def test_to_axes_scales_to_axis_range():
+    # Eixos com o dobro da resolução da tela e X deslocado em 100
+    encoder = EventEncoder(touchscreen(x_range=(100, 2258), y_range=(0, 4798)), 1080, 2400)
+
+    assert encoder.to_axes(0, 0) == (100, 0)
+    assert encoder.to_axes(500, 1000) == (1100, 2000)
+    assert encoder.to_axes(1079, 2399) == (2258, 4798)
+
+
+def test_pack_uses_64_and_32_bit_layouts():
+    for arch64, size, layout in ((True, 24, "<qqHHi"), (False, 16, "<llHHi")):
+        encoder = EventEncoder(touchscreen(), 1080, 2400, arch64=arch64)
+        data = encoder.pack(EV_ABS, ABS_MT_TRACKING_ID, -1)
+
+        assert len(data) == size
+        assert data == struct.pack(layout, 0, 0, EV_ABS, ABS_MT_TRACKING_ID, -1)
+        assert data[-4:] == b"\xff\xff\xff\xff"
+
+
+def test_tap_holds_between_down_and_up():
+    for arch64 in (True, False):
+        encoder = EventEncoder(touchscreen(), 1080, 2400, arch64=arch64)
+        (down, hold), (up, pause) = encoder.tap(100, 200)
+
+        assert hold == 0.04 and pause == 0.0
+        assert events(down, encoder.event) == [
+            (EV_ABS, ABS_MT_SLOT, 0), (EV_ABS, ABS_MT_TRACKING_ID, 1),
+            (EV_ABS, ABS_MT_POSITION_X, 100), (EV_ABS, ABS_MT_POSITION_Y, 200),
+            (EV_ABS, ABS_MT_TOUCH_MAJOR, 5), (EV_ABS, ABS_MT_PRESSURE, 50),
+            (EV_KEY, BTN_TOUCH, 1), (EV_SYN, SYN_REPORT, 0)
+        ]
+        assert events(up, encoder.event) == [
+            (EV_ABS, ABS_MT_SLOT, 0), (EV_ABS, ABS_MT_TRACKING_ID, -1),
+            (EV_KEY, BTN_TOUCH, 0), (EV_SYN, SYN_REPORT, 0)
+        ]
+
+
+def test_tap_script_sleeps_on_device():
+    encoder = EventEncoder(touchscreen(), 1080, 2400)
+    script = frames_to_script(encoder.tap(100, 200, hold_ms=60), "/dev/input/event2")
+
+    assert script.count("printf") == 2
+    assert "; sleep 0.060; " in script
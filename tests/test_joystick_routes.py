@@ -0,0 +1,77 @@
+import subprocess
+
+import pytest
+
+from joystick_routes import ROUTE_PATH, compile_lure_route, route_digest, route_duration, upload_commands
+from simple_bot import SimpleBotADB
+
+JOYSTICK = {
+    "center_x": 300, "center_y": 800,
+    "forward": {"x": 300, "y": 700}, "left": {"x": 200, "y": 800},
+    "backward": {"x": 300, "y": 900}, "right": {"x": 400, "y": 800},
+    "step_duration": 250, "step_interval": 0.2, "steps_per_direction": 2
+}
+
+
+def test_motionevent_route_holds_each_step_on_device():
+    lines = compile_lure_route(JOYSTICK).splitlines()
+
+    assert lines[0] == "#!/system/bin/sh"
+    assert lines.count("input motionevent DOWN 300 800") == 8
+    assert lines.count("sleep 0.25") == 8
+    # Intervalo só entre passos da mesma direção; 0.5s entre direções
+    assert lines.count("sleep 0.2") == 4
+    assert lines.count("sleep 0.5") == 4
+    forward = lines.index("# frente")
+    assert lines[forward + 1:forward + 4] == ["input motionevent DOWN 300 800",
+                                              "input motionevent MOVE 300 700", "sleep 0.25"]
+
+
+def test_swipe_route_and_invalid_mode():
+    lines = compile_lure_route(JOYSTICK, "swipe").splitlines()
+
+    assert lines.count("input swipe 300 800 200 800 250") == 2
+    assert not any("motionevent" in line for line in lines)
+    with pytest.raises(ValueError, match="modo de rota inválido"):
+        compile_lure_route(JOYSTICK, "tap")
+
+
+def test_route_digest_changes_only_with_script():
+    script = compile_lure_route(JOYSTICK)
+
+    assert route_digest(script) == route_digest(compile_lure_route(dict(JOYSTICK)))
+    assert len(route_digest(script)) == 12
+    assert route_digest(script) != route_digest(compile_lure_route({**JOYSTICK, "step_interval": 0.3}))
+    assert route_digest(script) != route_digest(compile_lure_route(JOYSTICK, "swipe"))
+
+
+def test_route_duration_and_upload_commands():
+    assert route_duration(JOYSTICK) == pytest.approx(4 * (2 * 0.25 + 0.2 + 0.5))
+
+    script = compile_lure_route(JOYSTICK)
+    commands = upload_commands(script, lines_per_command=10)
+    assert len(commands) == -(-len(script.splitlines()) // 10) + 1
+    assert commands[0].endswith(f"> {ROUTE_PATH}") and commands[1].endswith(f">> {ROUTE_PATH}")
+    assert commands[-1] == f"chmod 755 {ROUTE_PATH}"
+    assert "'# trás'" in "".join(commands)
+
+
+def test_route_is_uploaded_again_after_reconnect():
+    bot = SimpleBotADB("emulator-5554")
+    sent = []
+
+    def run_script(command, timeout=5):
+        sent.append(command)
+        return subprocess.CompletedProcess(command, 0, "", "")
+    bot._run_script = run_script
+    uploads = lambda: sum(command.startswith("chmod") for command in sent)
+
+    bot.connected = True
+    assert bot.lure_with_joystick_script(JOYSTICK)
+    assert bot.lure_with_joystick_script(JOYSTICK)
+    assert uploads() == 1
+
+    bot.disconnect()
+    bot.connected = True
+    assert bot.lure_with_joystick_script(JOYSTICK)
+    assert uploads() == 2
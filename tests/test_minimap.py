@@ -0,0 +1,37 @@
+import math
+import os
+
+import pytest
+
+from minimap import BASE_DIR, MinimapAnalyzer, load_rgb
+
+TOLERANCE = 3.0
+
+# Minimapas do repositório: mobs esperados (x, y) e posição do jogador
+REGRESSION_SET = {
+    "mini_map.png": {
+        "player": (103, 102),
+        "mobs": [(86, 72), (94, 77), (91, 116), (106, 120), (92, 123), (119, 129)]
+    },
+    "minimap_mobs_tmp.png": {
+        "player": (104, 100),
+        "mobs": [(70, 84), (101, 93), (74, 118), (99, 123), (97, 156)]
+    }
+}
+
+
+@pytest.mark.parametrize("name", sorted(REGRESSION_SET))
+def test_analyzer_finds_player_and_mobs(name):
+    expected = REGRESSION_SET[name]
+    analyzer = MinimapAnalyzer()
+
+    blips = analyzer.analyze(load_rgb(os.path.join(BASE_DIR, name)))
+    found = [(blip.x, blip.y) for blip in blips]
+
+    missing = [mob for mob in expected["mobs"]
+               if not any(math.dist(mob, position) <= TOLERANCE for position in found)]
+    assert missing == []
+    assert len(found) == len(expected["mobs"])
+    assert math.dist(expected["player"], analyzer.player) <= TOLERANCE
+    # Ordenados do mais próximo ao mais distante do jogador
+    assert [blip.distance for blip in blips] == sorted(blip.distance for blip in blips)
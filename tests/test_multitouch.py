@@ -0,0 +1,39 @@
+from compiled_config import Click
+from input_events import (ABS_MT_POSITION_X, ABS_MT_POSITION_Y, ABS_MT_SLOT, ABS_MT_TRACKING_ID, BTN_TOUCH,
+                          EventEncoder, TouchDevice)
+from multitouch import move_and_cast, schedule_taps
+
+CLICKS = (Click(1000, 100, 0.33, "Skill 1"), Click(1001, 200, 0.33, "Skill 2"), Click(1002, 300, 0.33, "Skill 3"))
+
+
+def encoder() -> EventEncoder:
+    device = TouchDevice("/dev/input/event2", "touch")
+    device.axes = {ABS_MT_SLOT: (0, 9), ABS_MT_POSITION_X: (0, 1079), ABS_MT_POSITION_Y: (0, 2399),
+                   ABS_MT_TRACKING_ID: (0, 65535)}
+    device.keys = {BTN_TOUCH}
+    return EventEncoder(device, 1080, 2400)
+
+
+def sent_taps(frames, event) -> list:
+    """Posições X dos dedos colocados na tela (exceto o do joystick, no slot 0)"""
+    xs = []
+    for data, _ in frames:
+        values = [(code, value) for _, _, _, code, value in event.iter_unpack(data)]
+        for i, (code, value) in enumerate(values):
+            if code == ABS_MT_TRACKING_ID and value >= 0 and values[i - 1] != (ABS_MT_SLOT, 0):
+                xs.append(values[i + 1][1])
+    return xs
+
+
+def test_every_click_is_sent_across_windows():
+    touch = encoder()
+    offset, index, sent = 0.0, 0, []
+    for _ in range(6):
+        # A cada 330ms um toque: o 4º cai nos últimos 40ms da janela de 1000ms
+        taps, offset, index = schedule_taps(CLICKS, 1000, offset, index, hold_ms=40)
+        assert all(at_ms + 40 < 1000 for _, _, at_ms in taps)
+        frames = move_and_cast(touch, 100, 800, 100, 700, 1000, taps, hold_ms=40)
+        sent += sent_taps(frames, touch.event)
+
+    assert len(sent) > len(CLICKS) * 5
+    assert sent == [CLICKS[i % len(CLICKS)].x for i in range(len(sent))]
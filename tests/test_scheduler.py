@@ -0,0 +1,84 @@
+import threading
+import time
+
+from scheduler import Scheduler
+
+
+def test_action_slower_than_interval_still_stops():
+    scheduler = Scheduler()
+    job = scheduler.add_job("Lento", lambda: time.sleep(0.02), 0.01)
+    stop_event = threading.Event()
+    timer = threading.Timer(0.3, stop_event.set)
+    timer.start()
+
+    runner = threading.Thread(target=scheduler.run, args=(stop_event,), daemon=True)
+    runner.start()
+    runner.join(timeout=2)
+    timer.cancel()
+
+    assert not runner.is_alive()
+    assert job.runs > 0
+
+
+def test_each_due_job_runs_once_per_pass():
+    scheduler = Scheduler()
+    calls = []
+    scheduler.add_job("A", lambda: (calls.append("A"), time.sleep(0.02)), 0.01)
+    scheduler.add_job("B", lambda: calls.append("B"), 0.01)
+
+    wait = scheduler.run_pending()
+
+    assert sorted(calls) == ["A", "B"]
+    assert wait is not None and wait >= 0
+
+
+def test_late_job_is_realigned_to_now_plus_interval():
+    scheduler = Scheduler()
+    job = scheduler.add_job("Lento", lambda: time.sleep(0.05), 0.01)
+
+    scheduler.run_pending()
+
+    # Mais de um período atrasado: o próximo deadline fica um período à frente, não no passado
+    assert job.deadline > time.monotonic()
+    assert scheduler.run_pending() > 0
+
+
+def test_sequence_keeps_absolute_deadlines():
+    scheduler = Scheduler()
+    job = scheduler.add_sequence("Cliques", [(lambda: None, 0.5), (lambda: None, 1.0)])
+    first = job.deadline
+
+    scheduler.run_pending()
+
+    assert job.index == 1
+    assert job.deadline == first + 0.5
+
+
+def test_error_does_not_drop_other_due_jobs():
+    scheduler = Scheduler()
+
+    def fail():
+        raise RuntimeError("falhou")
+
+    scheduler.add_job("Erro", fail, 1.0, priority=1)
+    ok = scheduler.add_job("Ok", lambda: None, 1.0)
+
+    try:
+        scheduler.run_pending()
+    except RuntimeError:
+        pass
+
+    assert ok.runs == 1
+    assert len(scheduler._heap) == 2
+
+
+def test_jobs_due_within_group_window_are_dispatched_together():
+    groups = []
+    scheduler = Scheduler(group_window=0.05, dispatch=lambda actions: groups.append(len(actions)))
+    scheduler.add_job("Camera Reset", lambda: None, 1.0, priority=30)
+    scheduler.add_job("Lure", lambda: None, 1.0, priority=20, start_delay=0.02)
+    scheduler.add_job("Cliques", lambda: None, 1.0, start_delay=0.5)
+
+    scheduler.run_pending()
+
+    assert groups == [2]
@@ -0,0 +1,75 @@
+import shutil
+import subprocess
+import time
+
+import numpy as np
+import pytest
+
+from screen_stream import ScreenStream
+
+WIDTH, HEIGHT, FRAMES = 64, 48, 12
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg não encontrado")
+
+
+def level(index: int) -> int:
+    """Cinza do quadro `index` na gravação de teste"""
+    return 10 + 20 * index
+
+
+@pytest.fixture(scope="module")
+def recording(tmp_path_factory):
+    """Gravação .h264 com quadros de cor sólida, um nível de cinza por quadro"""
+    path = str(tmp_path_factory.mktemp("stream") / "gravacao.h264")
+    raw = b"".join(np.full((HEIGHT, WIDTH, 3), level(i), dtype=np.uint8).tobytes() for i in range(FRAMES))
+    result = subprocess.run(
+        ["ffmpeg", "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", "rgb24",
+         "-s", f"{WIDTH}x{HEIGHT}", "-r", "10", "-i", "pipe:0",
+         "-c:v", "libx264", "-qp", "0", "-pix_fmt", "yuv420p", "-f", "h264", path],
+        input=raw, capture_output=True
+    )
+    if result.returncode != 0:
+        pytest.skip(f"ffmpeg sem encoder H.264: {result.stderr.decode(errors='replace').strip()}")
+    return path
+
+
+def wait_finished(stream: ScreenStream, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while stream.running and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not stream.running
+
+
+def test_from_file_decodes_frames_in_order(recording):
+    # Ring maior que a gravação: nenhum slot é reutilizado durante a leitura
+    stream = ScreenStream.from_file(recording, WIDTH, HEIGHT, slots=FRAMES + 4).start()
+    try:
+        frames = [frame.copy() for frame in stream.frames(timeout=5)]
+    finally:
+        stream.stop()
+
+    assert frames and all(frame.shape == (HEIGHT, WIDTH, 3) and frame.dtype == np.uint8 for frame in frames)
+    levels = [int(frame.mean().round()) for frame in frames]
+    assert levels == sorted(set(levels))
+    assert levels[-1] == pytest.approx(level(FRAMES - 1), abs=4)
+    stats = stream.stats()
+    assert stats["decoded"] == FRAMES
+    assert stats["decoded"] == len(frames) + stats["dropped"]
+
+
+def test_ring_keeps_only_the_newest_frames(recording):
+    stream = ScreenStream.from_file(recording, WIDTH, HEIGHT, slots=2).start()
+    try:
+        wait_finished(stream)
+        latest = stream.latest(timeout=1, wait_new=False)
+    finally:
+        stream.stop()
+
+    # Ninguém consumiu: todos os quadros menos o último foram substituídos
+    assert stream.stats()["decoded"] == FRAMES
+    assert stream.stats()["dropped"] == FRAMES - 1
+    assert latest.mean() == pytest.approx(level(FRAMES - 1), abs=4)
+    # O slot anterior ficou com o penúltimo quadro (o ring deu a volta)
+    newest = (FRAMES - 1) % 2
+    assert stream._ring[1 - newest].mean() == pytest.approx(level(FRAMES - 2), abs=4)
+    assert stream.latest(timeout=0.1) is None
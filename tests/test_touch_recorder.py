@@ -0,0 +1,111 @@
+import os
+import threading
+import time
+
+import pytest
+
+from touch_recorder import HEADER, MAGIC, RECORD, TouchRecorder, TouchRecording, TouchReplayer
+
+LINE = "[   12345.678901] 0003 0035 000001f4\n"
+
+
+def test_record_lines_stops_at_duration_without_new_lines(tmp_path):
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, LINE.encode())
+    stream = os.fdopen(read_fd, "r")
+    # Nada mais chega no pipe: só o interrupt (fechar a escrita = EOF) encerra a leitura
+    with TouchRecorder(str(tmp_path / "rec.bin"), "/dev/input/event2") as recorder:
+        start = time.monotonic()
+        count = recorder.record_lines(stream, duration=0.3, interrupt=lambda: os.close(write_fd))
+        elapsed = time.monotonic() - start
+    stream.close()
+
+    assert count == 1
+    assert 0.3 <= elapsed < 1.0
+
+
+def test_record_lines_stops_on_stop_event(tmp_path):
+    read_fd, write_fd = os.pipe()
+    stream = os.fdopen(read_fd, "r")
+    stop_event = threading.Event()
+    threading.Timer(0.2, stop_event.set).start()
+    with TouchRecorder(str(tmp_path / "rec.bin"), "/dev/input/event2") as recorder:
+        start = time.monotonic()
+        recorder.record_lines(stream, stop_event=stop_event, interrupt=lambda: os.close(write_fd))
+        elapsed = time.monotonic() - start
+    stream.close()
+
+    assert elapsed < 1.0
+
+
+def test_recording_round_trip(tmp_path):
+    path = str(tmp_path / "rec.bin")
+    with TouchRecorder(path, "/dev/input/event2", "touch") as recorder:
+        recorder.record_lines([LINE, "[   12345.778901] 0000 0000 00000000\n"])
+
+    with TouchRecording(path) as recording:
+        assert (recording.device_path, recording.device_name, len(recording)) == ("/dev/input/event2", "touch", 2)
+        assert recording.duration == pytest.approx(0.1)
+
+
+def test_recording_rejects_other_version(tmp_path):
+    path = tmp_path / "rec.bin"
+    path.write_bytes(HEADER.pack(MAGIC, 2, RECORD.size, b"/dev/input/event2", b"") + RECORD.pack(0, 0, 0, 0))
+
+    with pytest.raises(ValueError, match="versão 2"):
+        TouchRecording(str(path))
+
+
+def test_recording_rejects_empty_and_truncated_files(tmp_path):
+    for data in (b"", HEADER.pack(MAGIC, 1, RECORD.size, b"", b"")[:20]):
+        path = tmp_path / "rec.bin"
+        path.write_bytes(data)
+
+        with pytest.raises(ValueError, match="não é uma gravação"):
+            TouchRecording(str(path))
+
+
+def write_frames(path: str, offsets: list):
+    """Grava um quadro (posição + SYN_REPORT) em cada offset em segundos"""
+    lines = []
+    for offset in offsets:
+        stamp = f"[{12345 + offset:17.6f}]"
+        lines.append(f"{stamp} 0003 0035 000001f4\n")
+        lines.append(f"{stamp} 0000 0000 00000000\n")
+    with TouchRecorder(path, "/dev/input/event2") as recorder:
+        recorder.record_lines(lines)
+
+
+def test_replayer_sends_frames_on_deadlines_across_loops(tmp_path):
+    path = str(tmp_path / "rec.bin")
+    write_frames(path, [0.0, 0.1, 0.2])
+    sent = []
+
+    with TouchRecording(path) as recording:
+        replayer = TouchReplayer(recording, lambda data: sent.append((time.perf_counter(), data)), speed=2.0)
+        start = time.perf_counter()
+        result = replayer.play(loops=2)
+
+    # Velocidade 2x: quadros a cada 50 ms; a segunda volta começa 0.5s após o último quadro
+    expected = [0.0, 0.05, 0.1, 0.6, 0.65, 0.7]
+    assert result["frames"] == len(sent) == 6
+    assert [at - start for at, _ in sent] == pytest.approx(expected, abs=0.03)
+    assert result["late_max_ms"] < 30
+    assert all(len(data) == 48 for _, data in sent)
+
+
+def test_replayer_infinite_loop_stops_on_stop_event(tmp_path):
+    path = str(tmp_path / "rec.bin")
+    write_frames(path, [0.0, 0.1])
+    stop_event = threading.Event()
+    sent = []
+
+    def send(data):
+        sent.append(data)
+        if len(sent) == 3:
+            stop_event.set()
+
+    with TouchRecording(path) as recording:
+        result = TouchReplayer(recording, send).play(loops=0, stop_event=stop_event)
+
+    assert result["frames"] == len(sent) == 3
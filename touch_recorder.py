@@ -0,0 +1,435 @@
+"""
+Gravação e reprodução de toques
+Grava o stream do `getevent -t` do touchscreen em um log binário compacto (16 bytes por
+evento, com o timestamp do kernel) e reproduz a rotina escrevendo os eventos por um canal
+persistente (`cat > /dev/input/eventN` aberto uma vez). O arquivo é lido por mmap, sem
+carregar a gravação em listas, e cada quadro é enviado no seu deadline absoluto, então
+rotinas de horas não acumulam atraso
+"""
+import mmap
+import os
+import re
+import socket
+import struct
+import subprocess
+import threading
+import time
+
+from input_events import EV_SYN, SYN_REPORT, EVENT_FORMAT_64, RawInputInjector
+
+MAGIC = b"SROTOUCH"
+VERSION = 1
+# Cabeçalho: magic, versão, tamanho do registro, caminho e nome do touchscreen
+HEADER = struct.Struct("<8sHH64s64s")
+# Registro: microssegundos desde o primeiro evento, tipo, código, valor
+RECORD = struct.Struct("<qHHi")
+
+_LINE_RE = re.compile(r"\[\s*(\d+)\.(\d+)\]\s+(?:(\S+):\s+)?([0-9a-f]{4})\s+([0-9a-f]{4})\s+([0-9a-f]{8})")
+
+
+def parse_getevent_line(line: str) -> tuple:
+    """
+    Interpreta uma linha do `getevent -t`
+
+    Returns:
+        Tupla (microssegundos do kernel, tipo, código, valor) ou None se a linha não é um evento
+    """
+    match = _LINE_RE.search(line)
+    if match is None:
+        return None
+    seconds, micros, _, ev_type, code, value = match.groups()
+    value = int(value, 16)
+    if value >= 0x80000000:
+        value -= 0x100000000
+    return int(seconds) * 1_000_000 + int(micros.ljust(6, "0")[:6]), int(ev_type, 16), int(code, 16), value
+
+
+class TouchRecorder:
+    """Escreve eventos no log binário"""
+
+    def __init__(self, path: str, device_path: str, device_name: str = ""):
+        """
+        Args:
+            path: Arquivo de saída
+            device_path: Touchscreen de origem (ex.: /dev/input/event2)
+            device_name: Nome do touchscreen (informativo)
+        """
+        self.path = path
+        self.count = 0
+        self._first = None
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, device_path.encode("utf-8")[:64],
+                                     device_name.encode("utf-8")[:64]))
+
+    def write(self, timestamp_us: int, ev_type: int, code: int, value: int):
+        """Grava um evento (timestamp absoluto em microssegundos; o arquivo guarda o deslocamento)"""
+        if self._first is None:
+            self._first = timestamp_us
+        self._file.write(RECORD.pack(timestamp_us - self._first, ev_type, code, value))
+        self.count += 1
+
+    def record_lines(self, lines, stop_event: threading.Event = None, duration: float = None,
+                     interrupt=None) -> int:
+        """
+        Grava as linhas do `getevent -t` até o fim do stream, stop_event ou duration
+
+        Args:
+            lines: Stream de linhas (bloqueia enquanto ninguém toca na tela)
+            stop_event: Evento para parar a gravação
+            duration: Duração máxima em segundos
+            interrupt: Função que encerra o stream (ex.: termina o processo ou fecha o socket);
+                chamada por uma thread quando duration acaba ou stop_event é sinalizado, mesmo
+                sem nenhuma linha chegando
+
+        Returns:
+            Quantidade de eventos gravados
+        """
+        deadline = time.monotonic() + duration if duration else None
+        done = threading.Event()
+
+        def expired() -> bool:
+            return ((stop_event is not None and stop_event.is_set())
+                    or (deadline is not None and time.monotonic() >= deadline))
+
+        def watch():
+            while not done.wait(0.1):
+                if expired():
+                    interrupt()
+                    return
+
+        watcher = None
+        if interrupt is not None and (stop_event is not None or deadline is not None):
+            watcher = threading.Thread(target=watch, daemon=True)
+            watcher.start()
+        try:
+            for line in lines:
+                event = parse_getevent_line(line)
+                if event is not None:
+                    self.write(*event)
+                if expired():
+                    break
+        except (OSError, ValueError):
+            # Stream encerrado pelo interrupt no meio de uma leitura
+            if not expired():
+                raise
+        finally:
+            done.set()
+            if watcher is not None:
+                watcher.join()
+        return self.count
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TouchRecording:
+    """Gravação aberta por mmap: eventos e quadros são lidos sob demanda"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = None
+        # Arquivo vazio ou cortado no cabeçalho: mmap/unpack falhariam com erros genéricos
+        if os.fstat(self._file.fileno()).st_size < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} não é uma gravação de toques (versão {VERSION})")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, device_path, device_name = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{path} não é uma gravação de toques (versão {VERSION})")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"{path}: gravação na versão {version}, suportada apenas a versão {VERSION}")
+        self.device_path = device_path.rstrip(b"\0").decode("utf-8")
+        self.device_name = device_name.rstrip(b"\0").decode("utf-8")
+        self._view = memoryview(self._mmap)[HEADER.size:]
+        # Ignora um registro incompleto no fim (gravação interrompida)
+        self._view = self._view[:len(self._view) - len(self._view) % RECORD.size]
+
+    def __len__(self) -> int:
+        return len(self._view) // RECORD.size
+
+    @property
+    def duration(self) -> float:
+        """Duração da gravação em segundos"""
+        if not len(self):
+            return 0.0
+        return RECORD.unpack_from(self._view, len(self._view) - RECORD.size)[0] / 1_000_000
+
+    def events(self):
+        """Itera (microssegundos, tipo, código, valor) direto do mmap"""
+        return RECORD.iter_unpack(self._view)
+
+    def frames(self, event_format: struct.Struct = EVENT_FORMAT_64):
+        """
+        Agrupa os eventos até cada SYN_REPORT
+
+        Args:
+            event_format: struct input_event do dispositivo (EVENT_FORMAT_64 ou EVENT_FORMAT_32)
+
+        Yields:
+            Tuplas (segundos desde o início, bytes do quadro)
+        """
+        data = bytearray()
+        for offset_us, ev_type, code, value in self.events():
+            data += event_format.pack(0, 0, ev_type, code, value)
+            if ev_type == EV_SYN and code == SYN_REPORT:
+                yield offset_us / 1_000_000, bytes(data)
+                data.clear()
+
+    def close(self):
+        self._view = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EventChannel:
+    """Canal persistente que escreve bytes de input_event direto no touchscreen"""
+
+    def __init__(self, device_address: str, device_path: str, client=None):
+        """
+        Args:
+            device_address: Serial/endereço do dispositivo
+            device_path: Touchscreen de destino
+            client: AdbClient para abrir o canal via socket (None = `adb exec-in`)
+        """
+        self.device_address = device_address
+        self.device_path = device_path
+        self.client = client
+        self._sock = None
+        self._process = None
+
+    def open(self) -> "EventChannel":
+        command = f"cat > {self.device_path}"
+        if self.client is not None:
+            self._sock = self.client.open_service(self.device_address, f"exec:{command}")
+        else:
+            self._process = subprocess.Popen(
+                ["adb", "-s", self.device_address, "exec-in", command],
+                stdin=subprocess.PIPE,
+                bufsize=0
+            )
+        return self
+
+    def write(self, data: bytes):
+        """Escreve um quadro inteiro (uma escrita por SYN_REPORT)"""
+        if self._sock is not None:
+            self._sock.sendall(data)
+        else:
+            self._process.stdin.write(data)
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if self._process is not None:
+            self._process.stdin.close()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+
+
+class TouchReplayer:
+    """Reproduz uma gravação com deadlines absolutos (sem acúmulo de atraso)"""
+
+    def __init__(self, recording: TouchRecording, send, event_format: struct.Struct = EVENT_FORMAT_64,
+                 speed: float = 1.0, spin: float = 0.002):
+        """
+        Args:
+            recording: Gravação aberta
+            send: Função que escreve os bytes de um quadro (ex.: EventChannel.write)
+            event_format: struct input_event do dispositivo de destino
+            speed: Velocidade da reprodução (2.0 = duas vezes mais rápido)
+            spin: Últimos segundos antes de cada deadline esperados em espera ativa (precisão do sleep)
+        """
+        self.recording = recording
+        self.send = send
+        self.event_format = event_format
+        self.speed = speed
+        self.spin = spin
+
+    def play(self, loops: int = 1, stop_event: threading.Event = None) -> dict:
+        """
+        Reproduz a gravação `loops` vezes (0 = até stop_event)
+
+        Returns:
+            {"frames", "elapsed", "late_avg_ms", "late_max_ms"} com o atraso de envio em relação
+            aos deadlines
+        """
+        if not len(self.recording):
+            return {"frames": 0, "elapsed": 0.0, "late_avg_ms": 0.0, "late_max_ms": 0.0}
+        frames = 0
+        late_total = 0.0
+        late_max = 0.0
+        gap = 0.5  # Pausa entre repetições
+        start = time.perf_counter()
+        base = start
+        loop = 0
+        while not loops or loop < loops:
+            offset = 0.0
+            for offset, data in self.recording.frames(self.event_format):
+                deadline = base + offset / self.speed
+                while True:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    if remaining > self.spin:
+                        time.sleep(remaining - self.spin)
+                if stop_event is not None and stop_event.is_set():
+                    break
+                late = time.perf_counter() - deadline
+                self.send(data)
+                frames += 1
+                late_total += late
+                late_max = max(late_max, late)
+            if stop_event is not None and stop_event.is_set():
+                break
+            loop += 1
+            # A próxima repetição parte do deadline do último quadro, não do relógio atual
+            base += offset / self.speed + gap
+
+        return {
+            "frames": frames,
+            "elapsed": time.perf_counter() - start,
+            "late_avg_ms": late_total / frames * 1000 if frames else 0.0,
+            "late_max_ms": late_max * 1000
+        }
+
+
+def record_session(bot, path: str, duration: float = None) -> int:
+    """
+    Grava os toques feitos na tela do dispositivo até duration ou Ctrl+C
+
+    Args:
+        bot: SimpleBotADB conectado
+        path: Arquivo de saída
+        duration: Duração máxima em segundos (None = até Ctrl+C)
+
+    Returns:
+        Quantidade de eventos gravados
+    """
+    injector = bot.injector or RawInputInjector(bot._run_script)
+    if injector.device is None and not injector.discover():
+        return 0
+
+    device = injector.device
+    command = f"getevent -t {device.path}"
+    if bot.client is not None:
+        sock = bot.client.open_service(bot.device_address, f"shell:{command}")
+        stream = sock.makefile("r", encoding="utf-8", errors="replace")
+        process = None
+    else:
+        process = subprocess.Popen(["adb", "-s", bot.device_address, "shell", command],
+                                   stdout=subprocess.PIPE, text=True, errors="replace")
+        stream = process.stdout
+        sock = None
+
+    def interrupt():
+        # Acorda a leitura bloqueada: o stream termina com EOF
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if process is not None:
+            process.terminate()
+
+    print(f"🔴 Gravando toques de {device.name} ({device.path})... Ctrl+C para parar")
+    with TouchRecorder(path, device.path, device.name) as recorder:
+        try:
+            recorder.record_lines(stream, duration=duration, interrupt=interrupt)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if sock is not None:
+                sock.close()
+            if process is not None:
+                process.terminate()
+        print(f"✓ {recorder.count} eventos gravados em {path}")
+        return recorder.count
+
+
+def replay_session(bot, path: str, loops: int = 1, speed: float = 1.0) -> dict:
+    """
+    Reproduz uma gravação no dispositivo pelo canal persistente
+
+    Returns:
+        Estatísticas de TouchReplayer.play (None se o touchscreen não foi encontrado)
+    """
+    injector = bot.injector or RawInputInjector(bot._run_script)
+    if injector.encoder is None and not injector.discover():
+        return None
+
+    with TouchRecording(path) as recording:
+        if recording.device_path != injector.device.path:
+            print(f"⚠ Gravado em {recording.device_path}, reproduzindo em {injector.device.path}")
+        print(f"▶️  Reproduzindo {len(recording)} eventos ({recording.duration:.1f}s) x{loops or '∞'}")
+        channel = EventChannel(bot.device_address, injector.device.path, bot.client).open()
+        replayer = TouchReplayer(recording, channel.write, injector.encoder.event, speed)
+        stop_event = threading.Event()
+        try:
+            stats = replayer.play(loops, stop_event)
+        except KeyboardInterrupt:
+            stop_event.set()
+            stats = None
+        finally:
+            channel.close()
+    if stats:
+        print(f"✓ {stats['frames']} quadros em {stats['elapsed']:.1f}s | atraso médio "
+              f"{stats['late_avg_ms']:.2f}ms, máximo {stats['late_max_ms']:.2f}ms")
+    return stats
+
+
+if __name__ == "__main__":
+    import sys
+    from simple_bot import DEFAULT_DEVICE_ADDRESS, SimpleBotADB, load_config
+
+    usage = ("Uso:\n"
+             "  python3 touch_recorder.py record <arquivo> [segundos]\n"
+             "  python3 touch_recorder.py play <arquivo> [repetições (0 = infinito)] [velocidade]\n"
+             "  python3 touch_recorder.py info <arquivo>")
+    if len(sys.argv) < 3:
+        print(usage)
+        sys.exit(1)
+
+    command, path = sys.argv[1], sys.argv[2]
+    if command == "info":
+        with TouchRecording(path) as recording:
+            print(f"{recording.device_path} ({recording.device_name}): {len(recording)} eventos, "
+                  f"{recording.duration:.1f}s")
+        sys.exit(0)
+    if command not in ("record", "play"):
+        print(usage)
+        sys.exit(1)
+
+    config = load_config()
+    bot = SimpleBotADB(device_address=config.get("device", DEFAULT_DEVICE_ADDRESS), backend=config.get("backend", "subprocess"))
+    if not bot.connect():
+        sys.exit(1)
+    try:
+        if command == "record":
+            record_session(bot, path, float(sys.argv[3]) if len(sys.argv) > 3 else None)
+        else:
+            replay_session(bot, path, int(sys.argv[3]) if len(sys.argv) > 3 else 1,
+                           float(sys.argv[4]) if len(sys.argv) > 4 else 1.0)
+    finally:
+        bot.disconnect()
@@ -0,0 +1,270 @@
+"""
+Pool de visão multiprocesso
+Os quadros capturados vão para slots de um ring em multiprocessing.shared_memory e só o
+índice do slot é enviado aos processos de visão (HP, XP, minimapa). Nenhum pixel é serializado:
+os workers leem o slot direto da memória compartilhada e devolvem apenas os resultados.
+Antes do envio, um FrameGate por dispositivo descarta as regiões que não mudaram: só os
+detectores das regiões alteradas rodam, e quadros sem mudança nem chegam aos workers
+"""
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from frame_gate import FrameGate
+from screen_capture import DEFAULT_ROIS
+
+DETECTORS = ("hp", "xp", "minimap")
+
+
+def _build_detectors(names: tuple, rois: dict) -> dict:
+    """Cria os detectores de um dispositivo dentro do worker (cada um guarda sua região)"""
+    from hp_bar import HPBarReader
+    from minimap import MinimapAnalyzer
+    from xp_tracker import XPBarReader
+
+    detectors = {}
+    if "hp" in names:
+        detectors["hp"] = HPBarReader().read
+    if "xp" in names:
+        detectors["xp"] = XPBarReader().read
+    if "minimap" in names:
+        analyzer = MinimapAnalyzer(roi=(rois or {}).get("minimap"))
+
+        def minimap(frame):
+            return [(blip.dx, blip.dy, blip.count) for blip in analyzer.analyze_frame(frame)]
+        detectors["minimap"] = minimap
+    return detectors
+
+
+def _worker(shm_name: str, shape: tuple, slots: int, tasks, results, names: tuple, rois: dict):
+    """Processo de visão: lê índices de slot, analisa o quadro compartilhado e devolve resultados"""
+    import cv2
+    # Um thread do OpenCV por processo: o paralelismo vem dos processos
+    cv2.setNumThreads(1)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = np.ndarray((slots, *shape), dtype=np.uint8, buffer=shm.buf)
+    per_device = {}
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            job_id, device, slot, changed = task
+            detectors = per_device.get(device)
+            if detectors is None:
+                detectors = per_device[device] = _build_detectors(names, rois)
+            output = {"errors": {}}
+            start = time.perf_counter()
+            for name, detect in detectors.items():
+                if name not in changed:
+                    continue
+                try:
+                    output[name] = detect(ring[slot])
+                except Exception as e:
+                    output[name] = None
+                    output["errors"][name] = str(e)
+            output["elapsed"] = time.perf_counter() - start
+            results.put((job_id, device, slot, output))
+    finally:
+        del ring
+        shm.close()
+
+
+class VisionPool:
+    """Distribui a análise de quadros de vários dispositivos entre processos"""
+
+    def __init__(self, frame_shape: tuple = (1080, 1920, 4), slots: int = None, workers: int = None,
+                 detectors: tuple = DETECTORS, rois: dict = None, gate: bool = True):
+        """
+        Args:
+            frame_shape: Formato dos quadros (altura, largura, canais), igual ao do ScreenCapture
+            slots: Quadros no ring compartilhado (padrão: 2 por worker)
+            workers: Processos de visão (padrão: número de núcleos)
+            detectors: Detectores executados em cada quadro ("hp", "xp", "minimap")
+            rois: Regiões do bot_config.json -> vision.rois
+            gate: Roda só os detectores cuja região mudou (FrameGate por dispositivo)
+        """
+        self.frame_shape = tuple(frame_shape)
+        self.workers = workers or os.cpu_count() or 1
+        self.slots = slots or self.workers * 2
+        self.detectors = tuple(detectors)
+        self.rois = rois
+        self.gate = gate
+        self.frame_bytes = int(np.prod(self.frame_shape))
+        self.processed = 0
+        self.dropped = 0
+        self.skipped = 0
+        self._gates = {}
+        self._shm = None
+        self._ring = None
+        self._free = queue.Queue()
+        self._callbacks = {}
+        self._latest = {}
+        self._processes = []
+        self._tasks = None
+        self._results = None
+        self._collector = None
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Cria a memória compartilhada e sobe os workers"""
+        self._shm = shared_memory.SharedMemory(create=True, size=self.frame_bytes * self.slots)
+        self._ring = np.ndarray((self.slots, *self.frame_shape), dtype=np.uint8, buffer=self._shm.buf)
+        for slot in range(self.slots):
+            self._free.put(slot)
+
+        context = multiprocessing.get_context("spawn")
+        self._tasks = context.Queue()
+        self._results = context.Queue()
+        for _ in range(self.workers):
+            process = context.Process(
+                target=_worker,
+                args=(self._shm.name, self.frame_shape, self.slots, self._tasks, self._results,
+                      self.detectors, self.rois),
+                daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+        print(f"✓ Pool de visão: {self.workers} processos, {self.slots} slots compartilhados")
+        return self
+
+    def stop(self):
+        """Encerra os workers e libera a memória compartilhada"""
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        if self._collector is not None:
+            self._results.put(None)
+            self._collector.join(timeout=5)
+            self._collector = None
+        if self._shm is not None:
+            self._ring = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def register(self, device: str, callback):
+        """Define a função chamada com (device, resultados) a cada quadro analisado do dispositivo"""
+        self._callbacks[device] = callback
+
+    def frame_gate(self, device: str) -> FrameGate:
+        """FrameGate do dispositivo com as regiões dos detectores do pool"""
+        gate = self._gates.get(device)
+        if gate is None:
+            rois = {**DEFAULT_ROIS, **(self.rois or {})}
+            gate = self._gates[device] = FrameGate(rois={name: rois[name] for name in self.detectors})
+        return gate
+
+    def submit(self, device: str, frame: np.ndarray, timeout: float = 0.0) -> bool:
+        """
+        Copia o quadro para um slot livre e envia o índice para os workers
+
+        Com o gate ativo, só os detectores das regiões que mudaram rodam; um quadro sem
+        nenhuma mudança não é enviado (latest/callback continuam com o resultado anterior)
+
+        Args:
+            device: Dispositivo de origem do quadro (um submit por vez por dispositivo)
+            frame: Quadro no formato frame_shape
+            timeout: Espera por um slot livre (0 = descarta se todos estiverem ocupados)
+
+        Returns:
+            True se o quadro foi enviado, False se foi descartado ou não mudou
+        """
+        try:
+            slot = self._free.get(timeout=timeout) if timeout else self._free.get_nowait()
+        except queue.Empty:
+            # O gate não é consultado: a mudança continua pendente para o próximo quadro
+            with self._lock:
+                self.dropped += 1
+            return False
+
+        changed = self.detectors
+        if self.gate:
+            gate = self.frame_gate(device)
+            changed = tuple(name for name in self.detectors if gate.changed(name, frame))
+            if not changed:
+                self._free.put(slot)
+                with self._lock:
+                    self.skipped += 1
+                return False
+
+        self._ring[slot] = frame
+        with self._lock:
+            self._next_id += 1
+            job_id = self._next_id
+        self._tasks.put((job_id, device, slot, changed))
+        return True
+
+    def _collect(self):
+        """Recebe os resultados, libera os slots e repassa para o dispositivo"""
+        while True:
+            item = self._results.get()
+            if item is None:
+                return
+            _, device, slot, output = item
+            self._free.put(slot)
+            with self._lock:
+                self.processed += 1
+                # Detectores que não rodaram (região sem mudança) mantêm o resultado anterior
+                output = self._latest[device] = {**self._latest.get(device, {}), **output}
+            callback = self._callbacks.get(device)
+            if callback is not None:
+                try:
+                    callback(device, output)
+                except Exception as e:
+                    print(f"✗ Erro no retorno de visão de {device}: {e}")
+
+    def latest(self, device: str) -> dict:
+        """Últimos resultados do dispositivo ({"hp", "xp", "minimap", "elapsed"}) ou None"""
+        with self._lock:
+            return self._latest.get(device)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"processed": self.processed, "dropped": self.dropped, "skipped": self.skipped,
+                    "in_flight": self.slots - self._free.qsize()}
+
+
+def _synthetic_frame(shape: tuple) -> np.ndarray:
+    """Quadro de teste com as barras e o minimapa do repositório nas regiões padrão"""
+    from minimap import BASE_DIR, load_rgb
+
+    frame = np.full(shape, 30, dtype=np.uint8)
+    hp = load_rgb(os.path.join(BASE_DIR, "vida.png"))
+    xp = load_rgb(os.path.join(BASE_DIR, "xp.png"))
+    minimap = load_rgb(os.path.join(BASE_DIR, "mini_map.png"))
+    frame[20:20 + hp.shape[0], 20:20 + hp.shape[1], :3] = hp
+    frame[shape[0] - xp.shape[0]:, 200:200 + xp.shape[1], :3] = xp
+    frame[20:220, 1700:1900, :3] = minimap
+    return frame
+
+
+if __name__ == "__main__":
+    import sys
+
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    frame = _synthetic_frame((1080, 1920, 4))
+    for workers in sorted({1, os.cpu_count() or 1}):
+        # Sem gate: o mesmo quadro repetido mede a vazão dos detectores
+        pool = VisionPool(workers=workers, gate=False).start()
+        start = time.perf_counter()
+        for i in range(total):
+            pool.submit(f"device{i % 8}", frame, timeout=5)
+        while pool.stats()["processed"] < total:
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - start
+        pool.stop()
+        print(f"  {workers} processos: {total / elapsed:.0f} quadros/s")
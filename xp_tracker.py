@@ -0,0 +1,185 @@
+"""
+Acompanhamento de XP
+Lê o preenchimento da barra de XP (localizada uma vez pelo xp.png) a cada quadro, suaviza a
+leitura, detecta a virada de nível e mantém a taxa de XP/hora em uma janela móvel com custo O(1)
+por atualização, gerando um resumo por sessão para comparar configurações de lure
+"""
+import collections
+import json
+import os
+import time
+
+import numpy as np
+
+from hp_bar import HPBarReader
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "xp.png")
+
+
+def green_mask(pixels: np.ndarray, min_green: int = 120, min_delta: int = 50) -> np.ndarray:
+    """Máscara booleana dos pixels verdes (preenchimento da barra de XP) em uma imagem RGB(A)"""
+    r = pixels[..., 0].astype(np.int16)
+    g = pixels[..., 1].astype(np.int16)
+    b = pixels[..., 2].astype(np.int16)
+    return (g > min_green) & (g - r > min_delta) & (g - b > min_delta)
+
+
+class XPBarReader(HPBarReader):
+    """Leitor da barra de XP: mesma localização por template, cor verde e largura total da tela"""
+
+    name = "XP"
+    mask = staticmethod(green_mask)
+    full_width = True
+
+    def __init__(self, template_path: str = TEMPLATE_PATH, **kwargs):
+        super().__init__(template_path, **kwargs)
+
+
+class XPTracker:
+    """Converte leituras da barra (0-100%) em progresso acumulado e taxa de XP/hora"""
+
+    def __init__(self, window: float = 600.0, smoothing: float = 0.3, level_drop: float = 50.0,
+                 noise: float = 0.5):
+        """
+        Args:
+            window: Janela em segundos da taxa móvel de XP/hora
+            smoothing: Peso da leitura nova na média exponencial (1.0 = sem suavização)
+            level_drop: Queda mínima (em pontos percentuais) interpretada como subida de nível
+            noise: Quedas menores que isso são ruído de leitura e não reduzem o progresso
+        """
+        self.window = window
+        self.smoothing = smoothing
+        self.level_drop = level_drop
+        self.noise = noise
+        self.level_ups = 0
+        self.current = None
+        self.start_percent = None
+        self.start_time = None
+        self.last_time = None
+        self.updates = 0
+        self._samples = collections.deque()
+
+    @property
+    def progress(self) -> float:
+        """Progresso acumulado na sessão em porcentagem de nível (100 = um nível inteiro)"""
+        if self.current is None:
+            return 0.0
+        return self.level_ups * 100.0 + self.current - self.start_percent
+
+    def update(self, percent: float, now: float = None) -> float:
+        """
+        Registra uma leitura da barra
+
+        Args:
+            percent: Preenchimento da barra de 0 a 100 (None = leitura falhou, ignorada)
+            now: Instante da leitura (padrão: time.monotonic())
+
+        Returns:
+            Taxa atual em % de nível por hora
+        """
+        if percent is None:
+            return self.rate
+        now = time.monotonic() if now is None else now
+        self.updates += 1
+
+        if self.current is None:
+            self.current = self.start_percent = percent
+            self.start_time = now
+        elif self.current - percent >= self.level_drop:
+            # Barra voltou para o começo: subiu de nível, sem suavizar através da virada
+            self.level_ups += 1
+            self.current = percent
+        elif percent > self.current or self.current - percent > self.noise:
+            self.current += (percent - self.current) * self.smoothing
+
+        self.last_time = now
+        samples = self._samples
+        samples.append((now, self.progress))
+        # Cada amostra entra e sai da janela uma vez: O(1) amortizado por atualização
+        while now - samples[0][0] > self.window:
+            samples.popleft()
+        return self.rate
+
+    @property
+    def rate(self) -> float:
+        """XP/hora (em % de nível) na janela móvel"""
+        samples = self._samples
+        if len(samples) < 2:
+            return 0.0
+        (t0, p0), (t1, p1) = samples[0], samples[-1]
+        return (p1 - p0) * 3600.0 / max(t1 - t0, 1e-9)
+
+    def time_to_level(self) -> float:
+        """Segundos estimados até o próximo nível na taxa atual (None = sem progresso)"""
+        rate = self.rate
+        if rate <= 0 or self.current is None:
+            return None
+        return (100.0 - self.current) * 3600.0 / rate
+
+    def summary(self, label: dict = None) -> dict:
+        """
+        Resumo da sessão
+
+        Args:
+            label: Dados para identificar a sessão (ex.: parâmetros de lure do bot_config.json)
+        """
+        elapsed = (self.last_time - self.start_time) if self.start_time is not None else 0.0
+        return {
+            "label": label or {},
+            "duration_s": round(elapsed, 1),
+            "updates": self.updates,
+            "start_percent": self.start_percent,
+            "end_percent": self.current,
+            "level_ups": self.level_ups,
+            "progress_percent": round(self.progress, 3),
+            "average_per_hour": round(self.progress * 3600.0 / elapsed, 3) if elapsed > 0 else 0.0,
+            "rolling_per_hour": round(self.rate, 3)
+        }
+
+    def print_summary(self, label: dict = None):
+        """Mostra o resumo da sessão"""
+        summary = self.summary(label)
+        print("\n📈 RESUMO DE XP:")
+        print(f"  Duração: {summary['duration_s'] / 60:.1f} min | Níveis: {summary['level_ups']}")
+        print(f"  Progresso: {summary['progress_percent']:.2f}% de nível")
+        print(f"  Média: {summary['average_per_hour']:.2f}%/h | Janela recente: {summary['rolling_per_hour']:.2f}%/h")
+
+    def save_summary(self, path: str = "xp_sessions.jsonl", label: dict = None):
+        """Acrescenta o resumo da sessão em um arquivo JSON Lines"""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.summary(label), ensure_ascii=False) + "\n")
+        print(f"✓ Resumo salvo em {path}")
+
+
+def lure_label(config: dict) -> dict:
+    """Parâmetros de farm que identificam a sessão no resumo"""
+    joystick = config.get("joystick", {})
+    lure = config.get("lure", {})
+    return {
+        "device": config.get("device"),
+        "lure_interval": lure.get("interval"),
+        "cycle_interval": joystick.get("cycle_interval"),
+        "steps_per_direction": joystick.get("steps_per_direction"),
+        "step_duration": joystick.get("step_duration"),
+        "step_interval": joystick.get("step_interval")
+    }
+
+
+if __name__ == "__main__":
+    from screen_capture import ScreenCapture
+    from simple_bot import load_config
+
+    config = load_config()
+    capture = ScreenCapture(config.get("device"))
+    reader = XPBarReader(source=capture.capture)
+    tracker = XPTracker()
+    print("📈 Acompanhando XP (Ctrl+C para encerrar)...")
+    try:
+        while True:
+            rate = tracker.update(reader.poll())
+            if tracker.updates % 20 == 0 and tracker.current is not None:
+                print(f"  XP {tracker.current:.2f}% | {rate:.2f}%/h | níveis {tracker.level_ups}")
+            time.sleep(1)
+    except KeyboardInterrupt:
+        tracker.print_summary()
+        tracker.save_summary(label=lure_label(config))